@@ -0,0 +1,58 @@
+"""busca de convidados com trigram
+
+Revision ID: 9b3e51c7a2d4
+Revises: 7d1f8fff40b4
+Create Date: 2026-10-19 09:12:31.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3e51c7a2d4'
+down_revision: Union[str, None] = '7d1f8fff40b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() não é IMMUTABLE, então não pode ser usado direto em colunas geradas/índices.
+    # O wrapper fixa o dicionário e pode ser marcado como IMMUTABLE com segurança.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS
+        $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    op.add_column('guests', sa.Column(
+        'search_name', sa.String(),
+        sa.Computed("lower(f_unaccent(name))", persisted=True),
+        nullable=True
+    ))
+    op.add_column('guests', sa.Column(
+        'search_phone', sa.String(),
+        sa.Computed("regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')", persisted=True),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_guests_search_name_trgm', 'guests', ['search_name'],
+        unique=False, postgresql_using='gin', postgresql_ops={'search_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_guests_search_phone_trgm', 'guests', ['search_phone'],
+        unique=False, postgresql_using='gin', postgresql_ops={'search_phone': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_guests_search_phone_trgm', table_name='guests')
+    op.drop_index('ix_guests_search_name_trgm', table_name='guests')
+    op.drop_column('guests', 'search_phone')
+    op.drop_column('guests', 'search_name')
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
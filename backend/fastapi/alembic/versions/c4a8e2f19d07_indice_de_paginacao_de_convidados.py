@@ -0,0 +1,30 @@
+"""indice de paginacao de convidados
+
+Revision ID: c4a8e2f19d07
+Revises: 9b3e51c7a2d4
+Create Date: 2026-10-19 10:02:47.553810
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8e2f19d07'
+down_revision: Union[str, None] = '9b3e51c7a2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_guests_user_id_lower_name_id', 'guests',
+        ['user_id', sa.text('lower(name)'), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_guests_user_id_lower_name_id', table_name='guests')
@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Callable, NamedTuple, Optional, TypeVar
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -10,15 +12,38 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.user import User
+from app.auth.user_cache import cache_user, get_cached_user
+from app.auth.tokens import decode_access_token, new_token_claims
+from app.auth.revocation import revoked_tokens
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+T = TypeVar("T")
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# O bcrypt libera o GIL durante o cálculo, então threads bastam para tirá-lo do event loop.
+# O pool é pequeno de propósito: cada hash custa ~100-300 ms de CPU e não deve
+# disputar todos os núcleos com o tráfego dos convidados.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+# Excedentes aguardam no event loop em vez de enfileirar sem limite no executor
+_password_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+async def _run_in_password_pool(func: Callable[..., T], *args) -> T:
+    async with _password_semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_password_pool(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await _run_in_password_pool(pwd_context.hash, password)
+
+def shutdown_password_pool() -> None:
+    _password_executor.shutdown(wait=False, cancel_futures=True)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -28,62 +53,95 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, **new_token_claims()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def update_access_token(token: str, expires_delta: Optional[timedelta] = None) -> str:
-    try:
-        # Decodifica o token atual
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        # Remove o campo de expiração antigo
-        if "exp" in payload:
-            del payload["exp"]
-            
-        # Atualiza a data de expiração
-        if expires_delta:
-            expire = datetime.now(timezone.utc) + expires_delta
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-            
-        # Adiciona nova data de expiração
-        payload.update({"exp": expire})
-        
-        # Gera novo token
-        new_token = jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-        return new_token
-        
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido"
-        )
+class Principal(NamedTuple):
+    """
+    Identidade do usuário autenticado extraída das claims do access token, sem acesso ao banco.
+    Use get_current_user apenas quando a rota precisar do objeto User completo.
+    """
+    id: int
+    email: str
+    is_superuser: bool
+    is_active: bool
 
-async def get_current_user(
-    db: AsyncSession = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-) -> User:
-    credentials_exception = HTTPException(
+def create_user_access_token(user: User) -> str:
+    """Access token de sessão, com as claims necessárias para autorizar sem consultar users."""
+    return create_access_token(data={
+        "sub": user.email,
+        "uid": user.id,
+        "su": bool(user.is_superuser),
+        "act": bool(user.is_active),
+        "typ": "access",
+    })
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> Principal:
+    """
+    Autenticação puramente em CPU: valida o token e monta o Principal a partir das claims.
+    Tokens sem as claims de sessão (ex.: confirmação de email) não são aceitos.
+    """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
+    except JWTError:
+        raise _credentials_exception()
+    if payload.get("typ") != "access" or not isinstance(payload.get("uid"), int) or not payload.get("sub"):
+        raise _credentials_exception()
+    if revoked_tokens.is_revoked(payload):
+        raise _credentials_exception()
+    return Principal(
+        id=payload["uid"],
+        email=payload["sub"],
+        is_superuser=bool(payload.get("su")),
+        is_active=bool(payload.get("act", True)),
+    )
+
+async def get_user_from_token(db: AsyncSession, token: str, token_type: str) -> User:
+    """
+    Usuário dono do token, desde que a claim typ seja token_type ("access" para sessões,
+    "email_confirmation" ou "password_reset" para os links enviados por email).
+    """
+    credentials_exception = _credentials_exception()
+    try:
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
-        if email is None:
+        if email is None or payload.get("typ") != token_type:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-    user = await db.execute(select(User).where(User.email == email))
-    user = user.scalar_one_or_none()
+    # Revogação consultada em memória, sem ir ao banco
+    if revoked_tokens.is_revoked(payload):
+        raise credentials_exception
+
+    # Evita o SELECT em users a cada requisição autenticada
+    user = get_cached_user(db, email)
     if user is None:
+        user = await db.execute(select(User).where(User.email == email))
+        user = user.scalar_one_or_none()
+        if user is None:
+            raise credentials_exception
+        cache_user(user)
+
+    # Tokens emitidos antes de uma desativação ou troca de senha deixam de valer
+    if user.tokens_valid_after and payload.get("iat", 0) < user.tokens_valid_after.timestamp():
         raise credentials_exception
     return user
 
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+) -> User:
+    # Só tokens de sessão: links de confirmação e redefinição não autenticam a API
+    return await get_user_from_token(db, token, "access")
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -95,8 +153,8 @@ async def get_current_active_user(
     return current_user
 
 async def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.revoked_token import RevokedToken
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+class RevokedTokenSet:
+    """
+    Conjunto em memória dos jti revogados e ainda não expirados, consultado a cada requisição.
+    A tabela revoked_tokens é a fonte da verdade; o conjunto é carregado na inicialização
+    e sincronizado periodicamente com as revogações feitas por outros processos.
+
+    Também guarda, por usuário, o instante de corte (users.tokens_valid_after) dos usuários
+    desativados ou com senha trocada recentemente, para rejeitar seus tokens sem consultar a tabela users.
+    """
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._user_cutoffs: Dict[int, float] = {}
+        self._last_sync: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, jti: str) -> bool:
+        expires_at = self._entries.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            # Token já expirado é rejeitado pela validação do exp; não precisa mais ocupar memória
+            self._entries.pop(jti, None)
+            return False
+        return True
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self._entries[jti] = expires_at
+
+    def revoke_user(self, user_id: int, cutoff: float) -> None:
+        self._user_cutoffs[user_id] = max(cutoff, self._user_cutoffs.get(user_id, 0.0))
+
+    def is_revoked(self, payload: Dict[str, Any]) -> bool:
+        jti = payload.get("jti")
+        if jti and jti in self:
+            return True
+        cutoff = self._user_cutoffs.get(payload.get("uid"))
+        return cutoff is not None and payload.get("iat", 0) < cutoff
+
+    def purge(self) -> None:
+        now = time.time()
+        for jti, expires_at in list(self._entries.items()):
+            if expires_at <= now:
+                del self._entries[jti]
+        # Depois de um tempo de vida do access token, todos os emitidos antes do corte já expiraram
+        oldest_cutoff = now - settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for user_id, cutoff in list(self._user_cutoffs.items()):
+            if cutoff <= oldest_cutoff:
+                del self._user_cutoffs[user_id]
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Carrega revogações novas (ou todas, na primeira chamada) que ainda não expiraram."""
+        started_at = datetime.now(timezone.utc)
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > started_at
+        )
+        if self._last_sync is not None:
+            # Margem para revogações gravadas durante a sincronização anterior
+            query = query.where(RevokedToken.revoked_at >= self._last_sync - timedelta(seconds=5))
+        result = await db.execute(query)
+        for jti, expires_at in result.all():
+            self.add(jti, expires_at.timestamp())
+
+        result = await db.execute(
+            select(User.id, User.tokens_valid_after).where(
+                User.tokens_valid_after > started_at - timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+            )
+        )
+        for user_id, cutoff in result.all():
+            self.revoke_user(user_id, cutoff.timestamp())
+        self._last_sync = started_at
+        self.purge()
+
+revoked_tokens = RevokedTokenSet()
+
+async def revoke_token(db: AsyncSession, jti: str, expires_at: float) -> None:
+    """Revoga o token imediatamente neste processo e registra no banco para os demais."""
+    revoked_tokens.add(jti, expires_at)
+    await db.execute(
+        insert(RevokedToken)
+        .values(jti=jti, expires_at=datetime.fromtimestamp(expires_at, timezone.utc))
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    await db.commit()
+
+async def delete_expired_revocations(db: AsyncSession) -> None:
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+    await db.commit()
+
+async def run_revocation_sync(session_maker: async_sessionmaker) -> None:
+    """Tarefa de fundo: sincroniza as revogações e remove do banco as já expiradas (1x por hora)."""
+    interval = settings.REVOKED_TOKENS_SYNC_SECONDS
+    cleanup_every = max(1, 3600 // interval)
+    iteration = 0
+    while True:
+        await asyncio.sleep(interval)
+        iteration += 1
+        try:
+            async with session_maker() as db:
+                await revoked_tokens.sync(db)
+                if iteration % cleanup_every == 0:
+                    await delete_expired_revocations(db)
+        except Exception as e:
+            logger.warning(f"Falha ao sincronizar tokens revogados: {str(e)}")
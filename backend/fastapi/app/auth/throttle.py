@@ -0,0 +1,223 @@
+import logging
+import math
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, List, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.errors.base import create_rate_limit_error
+
+logger = logging.getLogger(__name__)
+
+class MemoryAttemptStore:
+    """
+    Tentativas de login recentes por chave, mantidas no processo.
+    Limitado a max_keys chaves (as menos recentes são descartadas).
+    """
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._attempts: "OrderedDict[str, Deque[Tuple[float, str]]]" = OrderedDict()
+
+    async def reserve(self, key: str, window: float, now: float, member: str) -> List[float]:
+        # Sem await entre a leitura e a gravação: atômico dentro do processo
+        entries = self._attempts.get(key)
+        if entries is None:
+            entries = self._attempts[key] = deque()
+        else:
+            self._attempts.move_to_end(key)
+        while entries and entries[0][0] <= now - window:
+            entries.popleft()
+        previous = [timestamp for timestamp, _ in entries]
+        entries.append((now, member))
+        while len(self._attempts) > self.max_keys:
+            self._attempts.popitem(last=False)
+        return previous
+
+    async def release(self, key: str, member: str) -> None:
+        entries = self._attempts.get(key)
+        if not entries:
+            return
+        for entry in entries:
+            if entry[1] == member:
+                entries.remove(entry)
+                break
+        if not entries:
+            del self._attempts[key]
+
+    async def reset(self, key: str) -> None:
+        self._attempts.pop(key, None)
+
+class RedisAttemptStore:
+    """
+    Mesma interface do MemoryAttemptStore, usando um sorted set por chave no Redis
+    para que o limite valha para todos os processos.
+    """
+    prefix = "login-throttle:"
+
+    def __init__(self, client):
+        self.client = client
+
+    async def reserve(self, key: str, window: float, now: float, member: str) -> List[float]:
+        # Pipeline transacional (MULTI/EXEC): a tentativa é gravada junto com a leitura
+        name = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.zremrangebyscore(name, 0, now - window)
+        pipe.zadd(name, {member: now})
+        pipe.expire(name, math.ceil(window))
+        pipe.zrange(name, 0, -1, withscores=True)
+        *_, entries = await pipe.execute()
+        return [
+            score for entry, score in entries
+            if (entry.decode() if isinstance(entry, bytes) else entry) != member
+        ]
+
+    async def release(self, key: str, member: str) -> None:
+        await self.client.zrem(self.prefix + key, member)
+
+    async def reset(self, key: str) -> None:
+        await self.client.delete(self.prefix + key)
+
+class LoginAttempt(NamedTuple):
+    """Tentativa reservada por LoginThrottle.check; conta como falha até register_success."""
+    member: str
+    account_key: str
+    reservations: List[Tuple[Any, str]]  # (store, chave) onde a tentativa foi gravada
+
+class LoginThrottle:
+    """
+    Limite de tentativas de login com janela deslizante por IP e por conta.
+
+    Depois de `free_failures` falhas, cada nova tentativa precisa esperar um atraso que dobra
+    a cada falha (até `max_delay`); ao atingir o máximo de falhas da janela, a chave fica
+    bloqueada até a falha mais antiga sair da janela. A checagem acontece antes do bcrypt,
+    então uma tentativa rejeitada não custa CPU.
+
+    Cada tentativa aceita é gravada já na checagem, como falha, e só é desfeita quando o login
+    dá certo: requisições simultâneas enxergam umas às outras e não passam todas pela mesma
+    janela livre enquanto o bcrypt ainda roda.
+    """
+    def __init__(
+        self,
+        window: float,
+        max_failures_per_account: int,
+        max_failures_per_ip: int,
+        free_failures: int,
+        delay_base: float,
+        max_delay: float,
+    ):
+        self.window = window
+        self.max_failures_per_account = max_failures_per_account
+        self.max_failures_per_ip = max_failures_per_ip
+        self.free_failures = free_failures
+        self.delay_base = delay_base
+        self.max_delay = max_delay
+        self.memory_store = MemoryAttemptStore()
+
+    def _store(self):
+        client = get_redis()
+        return RedisAttemptStore(client) if client is not None else self.memory_store
+
+    @staticmethod
+    def _account_key(email: str) -> str:
+        return "account:" + email.strip().lower()
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return "ip:" + ip
+
+    def _retry_after(self, failures: List[float], limit: int, now: float) -> float:
+        count = len(failures)
+        if count >= limit:
+            # Bloqueado até que falhas suficientes saiam da janela
+            return failures[count - limit] + self.window - now
+        if count > self.free_failures:
+            delay = min(self.delay_base * 2 ** (count - self.free_failures - 1), self.max_delay)
+            return failures[-1] + delay - now
+        return 0.0
+
+    async def _reserve(self, key: str, now: float, member: str) -> Tuple[Any, List[float]]:
+        store = self._store()
+        try:
+            return store, await store.reserve(key, self.window, now, member)
+        except Exception as e:
+            if store is self.memory_store:
+                raise
+            logger.warning(f"Falha ao gravar no Redis do limite de login, usando memória: {str(e)}")
+            return self.memory_store, await self.memory_store.reserve(key, self.window, now, member)
+
+    async def _release(self, attempt: LoginAttempt, keys: Optional[List[str]] = None) -> None:
+        for store, key in attempt.reservations:
+            if keys is not None and key not in keys:
+                continue
+            try:
+                await store.release(key, attempt.member)
+            except Exception as e:
+                logger.warning(f"Falha ao desfazer a tentativa no Redis do limite de login: {str(e)}")
+
+    async def check(self, ip: str, email: str) -> LoginAttempt:
+        """
+        Grava a tentativa no IP e na conta e levanta RateLimitError (429 com Retry-After) se algum
+        deles precisar esperar; nesse caso a tentativa rejeitada é desfeita e não conta como falha.
+        """
+        attempt = LoginAttempt(member=uuid.uuid4().hex, account_key=self._account_key(email), reservations=[])
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return attempt
+        now = time.time()
+        wait = 0.0
+        for key, limit in (
+            (self._ip_key(ip), self.max_failures_per_ip),
+            (attempt.account_key, self.max_failures_per_account),
+        ):
+            store, previous = await self._reserve(key, now, attempt.member)
+            attempt.reservations.append((store, key))
+            wait = max(wait, self._retry_after(previous, limit, now))
+        if wait > 0:
+            await self._release(attempt)
+            raise create_rate_limit_error(retry_after=math.ceil(wait))
+        return attempt
+
+    async def register_success(self, attempt: LoginAttempt) -> None:
+        # Desfaz a tentativa no IP (que pode estar tentando várias contas) e zera a conta
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return
+        await self._release(attempt, keys=[key for _, key in attempt.reservations if key != attempt.account_key])
+        await self.memory_store.reset(attempt.account_key)
+        store = self._store()
+        if store is not self.memory_store:
+            try:
+                await store.reset(attempt.account_key)
+            except Exception as e:
+                logger.warning(f"Falha ao limpar o Redis do limite de login: {str(e)}")
+
+def client_ip(request: Request) -> str:
+    """
+    IP do cliente para o limite de login. Sem proxies configurados (TRUSTED_PROXY_COUNT=0), é o
+    IP da conexão. Atrás de TRUSTED_PROXY_COUNT proxies, é a entrada do X-Forwarded-For
+    adicionada pelo proxy mais externo; as entradas à esquerda dela vêm do próprio cliente e
+    podem ser forjadas.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if settings.TRUSTED_PROXY_COUNT <= 0:
+        return peer
+    forwarded = [
+        address.strip()
+        for header in request.headers.getlist("x-forwarded-for")
+        for address in header.split(",")
+        if address.strip()
+    ]
+    if not forwarded:
+        return peer
+    return forwarded[max(0, len(forwarded) - settings.TRUSTED_PROXY_COUNT)]
+
+login_throttle = LoginThrottle(
+    window=settings.LOGIN_THROTTLE_WINDOW_SECONDS,
+    max_failures_per_account=settings.LOGIN_MAX_FAILURES_PER_ACCOUNT,
+    max_failures_per_ip=settings.LOGIN_MAX_FAILURES_PER_IP,
+    free_failures=settings.LOGIN_FREE_FAILURES,
+    delay_base=settings.LOGIN_DELAY_BASE_SECONDS,
+    max_delay=settings.LOGIN_DELAY_MAX_SECONDS,
+)
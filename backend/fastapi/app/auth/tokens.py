@@ -0,0 +1,81 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from typing import Any, Dict
+
+from jose import JWTError, jwt
+from jose.exceptions import ExpiredSignatureError
+
+from app.core.config import settings
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+class TokenVerifier:
+    """
+    Verificação de JWT assinados com HMAC sem passar pelo python-jose.
+
+    A chave é processada uma única vez (o objeto HMAC é criado na inicialização e apenas
+    copiado a cada verificação), e o token é validado com split, base64 e compare_digest.
+    Algoritmos que não são HMAC continuam usando o python-jose.
+    """
+    def __init__(self, secret: str, algorithm: str):
+        self.secret = secret
+        self.algorithm = algorithm
+        digest = _HMAC_DIGESTS.get(algorithm)
+        self._mac = hmac.new(secret.encode(), digestmod=digest) if digest else None
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        if self._mac is None:
+            return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            header = json.loads(_b64decode(header_segment))
+            valid_algorithm = isinstance(header, dict) and header.get("alg") == self.algorithm
+
+            mac = self._mac.copy()
+            mac.update(signing_input.encode("ascii"))
+            valid_signature = hmac.compare_digest(mac.digest(), _b64decode(signature))
+
+            payload = json.loads(_b64decode(payload_segment)) if valid_signature else None
+        except (ValueError, TypeError, binascii.Error, UnicodeError):
+            raise JWTError("Token malformado")
+
+        if not valid_algorithm or not valid_signature:
+            raise JWTError("Assinatura inválida")
+        if not isinstance(payload, dict):
+            raise JWTError("Payload inválido")
+
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                raise JWTError("Expiração inválida")
+            if exp <= now:
+                raise ExpiredSignatureError("Token expirado")
+        nbf = payload.get("nbf")
+        if isinstance(nbf, (int, float)) and nbf > now:
+            raise JWTError("Token ainda não é válido")
+        return payload
+
+token_verifier = TokenVerifier(settings.SECRET_KEY, settings.ALGORITHM)
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """Valida assinatura e expiração do token e retorna o payload. Levanta JWTError."""
+    return token_verifier.decode(token)
+
+def new_token_claims() -> Dict[str, Any]:
+    """Claims de identificação do token: jti (para revogação) e iat."""
+    return {"jti": uuid.uuid4().hex, "iat": int(time.time())}
@@ -0,0 +1,53 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+# email (sub do token) -> valores das colunas do usuário
+user_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE
+)
+
+_user_columns: Optional[List[str]] = None
+
+def _columns() -> List[str]:
+    # Calculado no primeiro uso: inspect(User) configura os mappers, o que exige todos os
+    # modelos (Guest, ...) já importados; na importação deste módulo isso ainda não vale
+    global _user_columns
+    if _user_columns is None:
+        _user_columns = [attr.key for attr in inspect(User).column_attrs]
+    return _user_columns
+
+def cache_user(user: User) -> None:
+    # Guarda apenas os valores (nunca o objeto ORM, que pertence à sessão da requisição)
+    user_cache.set(user.email, {key: getattr(user, key) for key in _columns()})
+
+def invalidate_user(email: Optional[str]) -> None:
+    if email:
+        user_cache.delete(email)
+
+def get_cached_user(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    Reconstrói o usuário a partir do cache e o anexa à sessão sem ir ao banco,
+    de forma que as rotas possam alterá-lo e dar commit normalmente.
+    """
+    values = user_cache.get(email)
+    if values is None:
+        return None
+
+    existing = db.identity_map.get(identity_key(User, values["id"]))
+    if existing is not None:
+        return existing
+
+    user = User(**values)
+    # Marca como persistente "limpo" (sem alterações pendentes) antes de adicionar à sessão
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
@@ -13,7 +13,8 @@ class Settings(BaseSettings):
     # Configurações de Segurança
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 dias
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # curto: a autorização vem das claims do token
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     
     # Configurações do Banco de Dados
     POSTGRES_SERVER: str
@@ -22,6 +23,103 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     SQLALCHEMY_DATABASE_URI: Optional[PostgresDsn] = None
 
+    # Réplica de leitura usada pelas rotas públicas somente leitura (opcional)
+    SQLALCHEMY_READ_REPLICA_URI: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 10  # leituras do convidado vão ao primário após uma alteração
+    READ_REPLICA_RETRY_SECONDS: int = 30  # tempo sem tentar a réplica após uma falha
+
+    # Pool de conexões do banco
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # segundos esperando uma conexão livre antes de erro
+    DB_POOL_RECYCLE: int = 1800  # segundos até reciclar a conexão (-1 desativa)
+    DB_POOL_PRE_PING: bool = False  # ping a cada checkout; o recycle já cobre conexões antigas
+
+    # Intervalo de sincronização dos tokens revogados (logout) entre processos
+    REVOKED_TOKENS_SYNC_SECONDS: int = 30
+
+    # Limite de tentativas de login (janela deslizante por IP e por conta)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 900
+    LOGIN_MAX_FAILURES_PER_ACCOUNT: int = 10
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    LOGIN_FREE_FAILURES: int = 3  # falhas permitidas antes do atraso progressivo
+    LOGIN_DELAY_BASE_SECONDS: float = 1.0  # atraso dobra a cada falha além das gratuitas
+    LOGIN_DELAY_MAX_SECONDS: int = 60
+    # Proxies reversos à frente da API: o IP do cliente é a entrada do X-Forwarded-For adicionada
+    # pelo proxy mais externo (contando da direita). Com 0 (padrão, uvicorn exposto direto),
+    # usa o IP da conexão e ignora o header, que o cliente pode forjar.
+    TRUSTED_PROXY_COUNT: int = 0
+
+    # Redis opcional, compartilhado entre processos (ex.: limite de login). Requer o pacote redis.
+    REDIS_URL: Optional[str] = None
+
+    # Threads dedicadas ao bcrypt (hash e verificação de senha)
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Cache do usuário autenticado (get_current_user), por email do token
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 5000
+
+    # Cache hash_link -> convidado usado pelas rotas públicas
+    GUEST_HASH_CACHE_TTL_SECONDS: int = 300
+    GUEST_HASH_CACHE_MAX_SIZE: int = 10000
+
+    # Página do convidado (/wedding/guest/{hash_link}): seções buscadas em paralelo por requisição,
+    # cada uma com a sua conexão do pool
+    WEDDING_BUNDLE_MAX_PARALLEL: int = 3
+
+    # Cache por (recurso, user_id) das leituras dos noivos (timeline, cronograma, cardápios, loja,
+    # convite, configuração). Com REDIS_URL também usa o Redis como camada compartilhada.
+    RESOURCE_CACHE_ENABLED: bool = True
+    RESOURCE_CACHE_LOCAL_TTL_SECONDS: int = 30  # limite de desatualização da memória em outros processos
+    RESOURCE_CACHE_SHARED_TTL_SECONDS: int = 600
+    RESOURCE_CACHE_MAX_SIZE: int = 2000
+
+    # Snapshot do conteúdo público de cada casamento, reconstruído após as edições dos noivos
+    SNAPSHOT_REBUILD_DELAY_SECONDS: float = 2.0  # debounce: um rebuild por rajada de edições
+    SNAPSHOT_CACHE_TTL_SECONDS: int = 60  # bytes prontos em memória; outros processos veem a nova versão após o TTL
+
+    # Compressão das respostas (gzip, e brotli se o pacote estiver instalado)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; respostas menores vão sem compressão
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    COMPRESSION_CACHE_BROTLI_QUALITY: int = 9  # respostas "Cache-Control: public" em cache são comprimidas uma vez só
+    COMPRESSION_CACHE_MAX_ENTRIES: int = 512
+    COMPRESSION_CACHE_TTL_SECONDS: int = 600
+
+    # Log de SQL: "off" (desligado), "slow" (apenas consultas lentas) ou "sampled" (1 a cada N)
+    SQL_LOG_MODE: str = "off"
+    SQL_SLOW_QUERY_MS: int = 200
+    SQL_LOG_SAMPLE_RATE: int = 100
+
+    # Contagem de consultas por requisição (header Server-Timing e alerta de N+1)
+    QUERY_INSTRUMENTATION_ENABLED: bool = True
+    QUERY_REPEAT_THRESHOLD: int = 5  # mesma consulta repetida a partir de N vezes gera alerta
+
+    # Métricas Prometheus em /metrics (requer o pacote prometheus-client)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None  # se definido, /metrics exige "Authorization: Bearer <token>"
+
+    # Tracing OpenTelemetry (requer opentelemetry-sdk; o exportador OTLP requer opentelemetry-exporter-otlp)
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"  # "otlp" (coletor) ou "console" (stdout, útil em testes)
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4317"
+    TRACING_SERVICE_NAME: str = "casei-api"
+    TRACING_SAMPLE_RATIO: float = 1.0  # fração das requisições sem traceparent que são amostradas
+
+    # Profiler de amostragem para superusuários (requer o pacote pyinstrument)
+    PROFILING_ENABLED: bool = True
+    PROFILING_MAX_SECONDS: int = 60
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+
+    # Monitor do event loop: lag em percentis e pilha de quem bloqueia o loop além do limite
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_MONITOR_WINDOW_SECONDS: float = 60.0  # janela usada nos percentis
+    LOOP_BLOCK_THRESHOLD_SECONDS: float = 0.2
+
     # Configurações do Primeiro Usuário Admin
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
@@ -34,6 +132,10 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "us-east-1"
     S3_BUCKET_NAME: str = ""
+    AWS_ENDPOINT_URL: Optional[str] = None  # S3 compatível (ex.: servidor falso do loadtest); vazio usa a AWS
+
+    # API WAHA (WhatsApp)
+    WAHA_BASE_URL: str = "http://waha:3000"
 
     # Email settings
     MAIL_USERNAME: str = "filipe.coelho.dc@gmail.com"
@@ -50,6 +152,13 @@ class Settings(BaseSettings):
             return json.loads(v)
         return v
 
+    @validator("SQL_LOG_MODE")
+    def validate_sql_log_mode(cls, v: str) -> str:
+        v = v.lower()
+        if v not in ("off", "slow", "sampled"):
+            raise ValueError("SQL_LOG_MODE deve ser 'off', 'slow' ou 'sampled'")
+        return v
+
     @validator("SQLALCHEMY_DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
         if isinstance(v, str):
@@ -64,7 +173,6 @@ class Settings(BaseSettings):
 
     @property
     def get_database_url(self) -> str:
-        print(f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}")
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
 
     class Config:
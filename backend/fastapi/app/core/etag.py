@@ -0,0 +1,44 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+# Sufixos adicionados ao ETag pelo CompressionMiddleware (cada codificação é uma representação)
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+def make_etag(*version: Any) -> str:
+    """
+    ETag forte a partir da versão dos dados (ids, contagens e updated_at das linhas envolvidas).
+    Não depende do corpo serializado, então pode ser calculado antes de carregar o agregado.
+    """
+    digest = hashlib.blake2b(repr(version).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+def _normalize(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    expected = _normalize(etag)
+    return any(_normalize(tag) == expected for tag in if_none_match.split(","))
+
+def not_modified_response(request: Request, etag: str, cache_control: str = "no-cache") -> Optional[Response]:
+    """Retorna a resposta 304 se o If-None-Match da requisição já corresponde ao ETag, senão None."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    return None
+
+def set_etag(response: Response, etag: str, cache_control: str = "no-cache") -> None:
+    # no-cache: o navegador guarda a resposta, mas revalida com If-None-Match a cada uso
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import suppress
+from typing import Any, Deque, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class EventLoopMonitor:
+    """
+    Mede o atraso (lag) do event loop e denuncia quem o bloqueia.
+
+    - Uma task dorme `interval` segundos em loop; o quanto ela acorda atrasada é o lag,
+      guardado em uma janela para os percentis (p50/p90/p99) exportados nas métricas.
+    - Um thread watchdog confere o último batimento da task: se o loop ficar parado por mais
+      de `block_threshold`, registra no log a pilha atual do thread do loop (o código que
+      está bloqueando: time.sleep, boto3, bcrypt fora do pool...), uma vez por bloqueio.
+    """
+    def __init__(self, interval: float, block_threshold: float, window_seconds: float):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.samples: Deque[float] = deque(maxlen=max(1, int(window_seconds / interval)))
+        self.blocked = 0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Inicia a medição; deve ser chamado de dentro do event loop (lifespan)."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._measure())
+        threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True).start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _measure(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.samples.append(max(0.0, now - start - self.interval))
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported: Optional[float] = None
+        while not self._stop.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or reported == heartbeat:
+                continue
+            reported = heartbeat
+            self.blocked += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "(pilha indisponível)\n"
+            logger.warning(
+                f"Event loop bloqueado há {stalled * 1000:.0f} ms "
+                f"(limite {self.block_threshold * 1000:.0f} ms). Pilha do thread do loop:\n{stack}"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+
+        def percentile(fraction: float) -> float:
+            if not samples:
+                return 0.0
+            return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+        return {
+            "running": self._task is not None,
+            "samples": len(samples),
+            "p50_ms": round(percentile(0.5) * 1000, 3),
+            "p90_ms": round(percentile(0.9) * 1000, 3),
+            "p99_ms": round(percentile(0.99) * 1000, 3),
+            "max_ms": round(samples[-1] * 1000, 3) if samples else 0.0,
+            "blocked": self.blocked,
+            "block_threshold_ms": self.block_threshold * 1000,
+        }
+
+loop_monitor = EventLoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD_SECONDS,
+    window_seconds=settings.LOOP_MONITOR_WINDOW_SECONDS
+)
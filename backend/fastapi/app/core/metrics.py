@@ -0,0 +1,165 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+# Dependência opcional: sem o pacote prometheus-client as métricas ficam desligadas
+try:
+    import prometheus_client
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+except ImportError:  # pragma: no cover - depende do ambiente
+    prometheus_client = None
+
+metrics_enabled = prometheus_client is not None and settings.METRICS_ENABLED
+
+# Buckets de latência em segundos (rotas JSON típicas ficam entre 5 ms e 1 s)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+if metrics_enabled:
+    registry = prometheus_client.CollectorRegistry()
+
+    HTTP_REQUESTS = prometheus_client.Counter(
+        "http_requests_total", "Requisições por rota (caminho com parâmetros) e status",
+        ["method", "route", "status"], registry=registry
+    )
+    HTTP_LATENCY = prometheus_client.Histogram(
+        "http_request_duration_seconds", "Tempo total da requisição por rota",
+        ["method", "route"], buckets=LATENCY_BUCKETS, registry=registry
+    )
+    HTTP_IN_PROGRESS = prometheus_client.Gauge(
+        "http_requests_in_progress", "Requisições em andamento",
+        ["method"], registry=registry
+    )
+    HTTP_RESPONSE_SIZE = prometheus_client.Histogram(
+        "http_response_size_bytes", "Tamanho do corpo enviado (após a compressão) por rota",
+        ["method", "route"], buckets=SIZE_BUCKETS, registry=registry
+    )
+    HTTP_DB_TIME = prometheus_client.Histogram(
+        "http_request_db_seconds", "Tempo gasto no banco durante a requisição, por rota",
+        ["method", "route"], buckets=LATENCY_BUCKETS, registry=registry
+    )
+    HTTP_DB_QUERIES = prometheus_client.Histogram(
+        "http_request_db_queries", "Consultas executadas por requisição, por rota",
+        ["method", "route"], buckets=(1, 2, 3, 5, 10, 20, 50, 100), registry=registry
+    )
+    EXTERNAL_CALL_TIME = prometheus_client.Histogram(
+        "external_call_duration_seconds", "Tempo das chamadas a serviços externos (S3, WhatsApp)",
+        ["service", "operation", "outcome"], buckets=LATENCY_BUCKETS, registry=registry
+    )
+
+@contextmanager
+def observe_external(service: str, operation: str) -> Iterator[None]:
+    """Mede uma chamada a serviço externo: `with observe_external("s3", "upload_file"): ...`"""
+    if not metrics_enabled:
+        yield
+        return
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALL_TIME.labels(service, operation, outcome).observe(time.perf_counter() - start)
+
+class PoolCollector:
+    """Estado do pool de conexões (InstrumentedQueuePool) lido no momento da coleta."""
+    def __init__(self, pool: Any, name: str):
+        self.pool = pool
+        self.name = name
+
+    def collect(self):
+        stats = self.pool.stats()
+        labels = [self.name]
+        for key, description in (
+            ("checked_out", "Conexões em uso"),
+            ("idle", "Conexões ociosas no pool"),
+            ("overflow", "Conexões acima do pool_size"),
+        ):
+            gauge = GaugeMetricFamily(f"db_pool_{key}", description, labels=["pool"])
+            gauge.add_metric(labels, stats[key])
+            yield gauge
+
+        timeouts = CounterMetricFamily("db_pool_checkout_timeouts", "Checkouts que estouraram o timeout", labels=["pool"])
+        timeouts.add_metric(labels, stats["checkout_timeouts"])
+        yield timeouts
+
+        wait = stats["checkout_wait"]
+        histogram = HistogramMetricFamily(
+            "db_pool_checkout_wait_seconds", "Espera por uma conexão livre no checkout", labels=["pool"]
+        )
+        histogram.add_metric(
+            labels,
+            [("+Inf" if bucket["le"] == "+Inf" else str(bucket["le"] / 1000), bucket["count"]) for bucket in wait["buckets"]],
+            sum_value=wait["sum_ms"] / 1000
+        )
+        yield histogram
+
+class CacheCollector:
+    """
+    Acertos, falhas e tamanho dos caches do processo.
+    `caches` mapeia o nome do cache para uma função que retorna o stats() de um TTLCache;
+    `resources` retorna o stats() do ResourceCache (acertos por recurso e camada).
+    """
+    def __init__(self, caches: Dict[str, Callable[[], Dict[str, Any]]], resources: Callable[[], Dict[str, Any]]):
+        self.caches = caches
+        self.resources = resources
+
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Acertos do cache", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Falhas do cache", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "Entradas no cache", labels=["cache"])
+        for name, stats_fn in self.caches.items():
+            stats = stats_fn()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+
+        resource_hits = CounterMetricFamily(
+            "resource_cache_hits", "Acertos do cache de recursos por camada", labels=["resource", "tier"]
+        )
+        resource_misses = CounterMetricFamily("resource_cache_misses", "Falhas do cache de recursos", labels=["resource"])
+        invalidations = CounterMetricFamily(
+            "resource_cache_invalidations", "Invalidações feitas pelas escritas do crud", labels=["resource"]
+        )
+        for resource, stats in self.resources()["resources"].items():
+            resource_hits.add_metric([resource, "local"], stats["hits_local"])
+            resource_hits.add_metric([resource, "shared"], stats["hits_shared"])
+            resource_misses.add_metric([resource], stats["misses"])
+            invalidations.add_metric([resource], stats["invalidations"])
+
+        yield from (hits, misses, size, resource_hits, resource_misses, invalidations)
+
+class EventLoopCollector:
+    """Percentis do lag do event loop na janela recente e total de bloqueios (EventLoopMonitor)."""
+    def __init__(self, stats: Callable[[], Dict[str, Any]]):
+        self.stats = stats
+
+    def collect(self):
+        stats = self.stats()
+        lag = GaugeMetricFamily(
+            "event_loop_lag_seconds", "Atraso do event loop na janela recente, por percentil", labels=["quantile"]
+        )
+        for quantile, key in (("0.5", "p50_ms"), ("0.9", "p90_ms"), ("0.99", "p99_ms"), ("1", "max_ms")):
+            lag.add_metric([quantile], stats[key] / 1000)
+        yield lag
+
+        blocked = CounterMetricFamily("event_loop_blocked", "Bloqueios do event loop acima do limite configurado")
+        blocked.add_metric([], stats["blocked"])
+        yield blocked
+
+def register_collector(collector: Any) -> None:
+    if metrics_enabled:
+        registry.register(collector)
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Métricas no formato texto do Prometheus (rota /metrics, fora do prefixo da API)."""
+    if not metrics_enabled:
+        return Response(status_code=404)
+    if settings.METRICS_TOKEN and request.headers.get("authorization") != f"Bearer {settings.METRICS_TOKEN}":
+        return Response(status_code=401)
+    return Response(prometheus_client.generate_latest(registry), media_type=prometheus_client.CONTENT_TYPE_LATEST)
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from fastapi import HTTPException, status
+from starlette.responses import Response
+
+from app.core.config import settings
+
+# Dependência opcional: sem o pacote pyinstrument o profiler fica indisponível
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - depende do ambiente
+    Profiler = None
+
+PROFILE_HEADER = "x-profile"
+# Formato -> (media type, extensão do arquivo). speedscope abre em https://www.speedscope.app
+PROFILE_FORMATS = {
+    "speedscope": ("application/json", "speedscope.json"),
+    "html": ("text/html; charset=utf-8", "html"),
+}
+
+_busy = False
+
+def profiling_available() -> bool:
+    return Profiler is not None and settings.PROFILING_ENABLED
+
+def profiler_busy() -> bool:
+    return _busy
+
+@contextmanager
+def profile(async_mode: str) -> Iterator[Any]:
+    """
+    Amostra a pilha do thread do event loop enquanto o bloco executa.
+
+    async_mode="disabled" registra tudo que roda no loop (todas as requisições do worker);
+    "enabled" atribui as amostras apenas à task atual (uma requisição). O pyinstrument não
+    aceita dois profilers no mesmo thread, então há um profiling por worker de cada vez.
+    """
+    global _busy
+    if _busy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Já existe um profiling em andamento neste worker"
+        )
+    _busy = True
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode=async_mode)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        if profiler.is_running:
+            profiler.stop()
+        _busy = False
+
+def render_profile(profiler: Any, output_format: str) -> Response:
+    """Devolve o último profiling como arquivo para download (speedscope ou HTML do pyinstrument)."""
+    media_type, extension = PROFILE_FORMATS[output_format]
+    if output_format == "html":
+        content = profiler.output_html()
+    else:
+        content = profiler.output(renderer=SpeedscopeRenderer())
+    filename = f"profile-{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return Response(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,39 @@
+import logging
+from typing import Any, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Dependência opcional: sem o pacote redis (ou sem REDIS_URL) os recursos usam apenas memória
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - depende do ambiente
+    redis_asyncio = None
+
+_client: Optional[Any] = None
+_missing_package_logged = False
+
+def get_redis() -> Optional[Any]:
+    """
+    Retorna o cliente Redis compartilhado, ou None quando não configurado/disponível.
+    A conexão é aberta sob demanda no primeiro comando.
+    """
+    global _client, _missing_package_logged
+
+    if not settings.REDIS_URL:
+        return None
+    if redis_asyncio is None:
+        if not _missing_package_logged:
+            logger.warning("REDIS_URL definido, mas o pacote redis não está instalado; usando memória")
+            _missing_package_logged = True
+        return None
+    if _client is None:
+        _client = redis_asyncio.from_url(settings.REDIS_URL, socket_timeout=0.5)
+    return _client
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
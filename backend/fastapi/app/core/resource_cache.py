@@ -0,0 +1,151 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Type, TypeVar
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.db.session import is_replica_session
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+class CachedResource(Generic[V]):
+    """
+    Um recurso "uma linha + filhos por usuário" (timeline, cronograma, cardápios...) em cache
+    por user_id, já validado no schema de resposta.
+
+    Duas camadas: LRU em memória do processo e, com REDIS_URL, o Redis compartilhado
+    (JSON do schema). As funções de escrita do app/crud chamam invalidate depois do commit;
+    em outros processos a cópia em memória pode durar até RESOURCE_CACHE_LOCAL_TTL_SECONDS.
+    Por isso o cache serve apenas as leituras dos convidados; as rotas dos noivos (que
+    precisam ver a própria edição) leem direto do banco.
+
+    O cache só é preenchido com leituras do primário: uma sessão na réplica pode carregar a
+    versão anterior a uma escrita já invalidada e a devolveria até o TTL.
+    """
+    def __init__(self, name: str, schema: Any, local: TTLCache):
+        self.name = name
+        self.adapter: TypeAdapter = TypeAdapter(schema)
+        self.local = local
+        self.hits_local = 0
+        self.hits_shared = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _shared_key(self, user_id: int) -> str:
+        return f"resource-cache:{self.name}:{user_id}"
+
+    async def get_or_load(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Optional[V]:
+        """
+        Retorna o recurso do cache ou chama loader() (objeto ORM ou None, carregado na sessão db)
+        e guarda o resultado, exceto quando db é da réplica ou houve invalidação durante a carga.
+        """
+        if not settings.RESOURCE_CACHE_ENABLED:
+            obj = await loader()
+            return self.adapter.validate_python(obj, from_attributes=True) if obj is not None else None
+
+        key = (self.name, user_id)
+        value = self.local.get(key)
+        if value is not None:
+            self.hits_local += 1
+            return value
+
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = await client.get(self._shared_key(user_id))
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Falha ao ler o cache compartilhado ({self.name}): {str(e)}")
+                raw = None
+            if raw is not None:
+                value = self.adapter.validate_json(raw)
+                self.local.set(key, value)
+                self.hits_shared += 1
+                return value
+
+        self.misses += 1
+        generation = self.invalidations
+        obj = await loader()
+        if obj is None:
+            return None
+        value = self.adapter.validate_python(obj, from_attributes=True)
+        # Uma escrita invalidada enquanto loader() rodava pode não estar no que foi lido
+        if is_replica_session(db) or self.invalidations != generation:
+            return value
+        self.local.set(key, value)
+        if client is not None:
+            try:
+                await client.set(
+                    self._shared_key(user_id),
+                    self.adapter.dump_json(value),
+                    ex=settings.RESOURCE_CACHE_SHARED_TTL_SECONDS
+                )
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Falha ao gravar o cache compartilhado ({self.name}): {str(e)}")
+        return value
+
+    async def invalidate(self, user_id: int) -> None:
+        self.invalidations += 1
+        self.local.delete((self.name, user_id))
+        client = get_redis()
+        if client is not None:
+            try:
+                await client.delete(self._shared_key(user_id))
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Falha ao invalidar o cache compartilhado ({self.name}): {str(e)}")
+
+    async def invalidate_owner(self, db: AsyncSession, model: Type[Any], row_id: int) -> None:
+        """Invalida a partir da linha pai (ex.: Timeline de um item), buscando apenas o user_id dela."""
+        result = await db.execute(select(model.user_id).where(model.id == row_id))
+        user_id = result.scalar_one_or_none()
+        if user_id is not None:
+            await self.invalidate(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.hits_local + self.hits_shared
+        total = hits + self.misses
+        return {
+            "hits_local": self.hits_local,
+            "hits_shared": self.hits_shared,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+class ResourceCache:
+    """Registro dos recursos em cache; todos compartilham o mesmo LRU em memória."""
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self.local: TTLCache[Any] = TTLCache(ttl_seconds=ttl_seconds, max_size=max_size)
+        self.resources: Dict[str, CachedResource] = {}
+
+    def register(self, name: str, schema: Any) -> CachedResource:
+        resource = CachedResource(name, schema, self.local)
+        self.resources[name] = resource
+        return resource
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "local": self.local.stats(),
+            "shared_enabled": get_redis() is not None,
+            "resources": {name: resource.stats() for name, resource in self.resources.items()},
+        }
+
+resource_cache = ResourceCache(
+    ttl_seconds=settings.RESOURCE_CACHE_LOCAL_TTL_SECONDS,
+    max_size=settings.RESOURCE_CACHE_MAX_SIZE
+)
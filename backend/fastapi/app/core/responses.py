@@ -0,0 +1,37 @@
+from decimal import Decimal
+from typing import Any, Type
+
+import orjson
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+def _orjson_default(value: Any) -> Any:
+    # Mesmo formato do Pydantic em modo JSON: Decimal vira string
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Tipo não serializável em JSON: {type(value).__name__}")
+
+class FastJSONResponse(JSONResponse):
+    """
+    Resposta JSON padrão da aplicação.
+    Modelos Pydantic são serializados direto para bytes pelo pydantic-core (model_dump_json);
+    o restante (dicts/listas já convertidos pelo FastAPI) é serializado com orjson.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+def model_response(schema: Type[BaseModel], obj: Any, status_code: int = 200) -> FastJSONResponse:
+    """
+    Valida obj (objeto ORM, dict ou modelo) no schema e responde com model_dump_json,
+    evitando a conversão intermediária para dict que o FastAPI faz com response_model.
+    Mantenha o response_model na rota para a documentação do OpenAPI.
+    """
+    # from_attributes=True como o FastAPI faz, para aceitar ORM também nos campos aninhados
+    model = obj if isinstance(obj, schema) else schema.model_validate(obj, from_attributes=True)
+    return FastJSONResponse(model, status_code=status_code)
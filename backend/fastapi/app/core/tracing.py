@@ -0,0 +1,181 @@
+import functools
+import importlib
+import inspect
+import logging
+import pkgutil
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Dependência opcional: sem o opentelemetry-sdk o tracing fica desligado e os spans viram no-op
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # pragma: no cover - depende do ambiente
+    trace = None
+
+_SPAN_KEY = "tracing_spans"
+_STATEMENT_MAX_LENGTH = 2000
+
+_provider: Optional[Any] = None
+_tracer: Optional[Any] = None
+
+def setup_tracing() -> None:
+    """
+    Configura o provedor de traces e o exportador (OTLP para um coletor, ou stdout com
+    TRACING_EXPORTER=console) e instrumenta as funções do app.crud. Chamado uma vez no main.
+    """
+    global _provider, _tracer
+    if trace is None or not settings.TRACING_ENABLED or _tracer is not None:
+        return
+
+    if settings.TRACING_EXPORTER == "console":
+        processor = SimpleSpanProcessor(ConsoleSpanExporter())
+    else:
+        try:
+            from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        except ImportError:
+            logger.warning("Tracing desligado: instale opentelemetry-exporter-otlp ou use TRACING_EXPORTER=console")
+            return
+        processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT, insecure=True))
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}),
+        # Respeita a decisão de quem chamou (traceparent); sem ela, amostra pela razão configurada
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO))
+    )
+    _provider.add_span_processor(processor)
+    trace.set_tracer_provider(_provider)
+    _tracer = trace.get_tracer("casei-app")
+    instrument_crud()
+
+def shutdown_tracing() -> None:
+    """Envia os spans pendentes do BatchSpanProcessor antes de encerrar."""
+    if _provider is not None:
+        _provider.shutdown()
+
+def get_tracer() -> Optional[Any]:
+    return _tracer
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Any]]:
+    """
+    Span filho do span atual: `with span("s3 upload_file", {"s3.key": key}): ...`
+    Exceções são registradas no span e propagadas. Sem tracing configurado, não faz nada.
+    """
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=_clean(attributes)) as current:
+        yield current
+
+@contextmanager
+def request_span(method: str, headers: Mapping[str, str]) -> Iterator[Optional[Any]]:
+    """Span raiz da requisição, continuando o trace do header traceparent quando presente."""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(
+        method,
+        context=propagate.extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.method": method}
+    ) as current:
+        yield current
+
+def trace_id(current: Optional[Any]) -> Optional[str]:
+    """Trace ID em hexadecimal (formato do traceparent), ou None se o span não for válido."""
+    if current is None:
+        return None
+    context = current.get_span_context()
+    return format(context.trace_id, "032x") if context.is_valid else None
+
+def set_error(current: Optional[Any], description: str) -> None:
+    """Marca o span como erro (ex.: resposta 5xx já convertida pelo ErrorHandlerMiddleware)."""
+    if current is not None:
+        current.set_status(Status(StatusCode.ERROR, description))
+
+def _clean(attributes: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # O OpenTelemetry rejeita atributos None
+    if not attributes:
+        return None
+    return {key: value for key, value in attributes.items() if value is not None}
+
+def _traced(func: Any, name: str) -> Any:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return await func(*args, **kwargs)
+        with _tracer.start_as_current_span(name):
+            return await func(*args, **kwargs)
+    wrapper.__traced__ = True
+    return wrapper
+
+def instrument_crud() -> None:
+    """
+    Envolve em um span cada função assíncrona pública dos módulos de app.crud ("crud.guest.get_guest_by_hash").
+
+    As rotas usam os módulos (`guest_crud.get_guest_by_hash(...)`), então trocar o atributo do
+    módulo basta; funções importadas pelo nome antes desta chamada continuam sem span.
+    """
+    import app.crud
+
+    for module_info in pkgutil.iter_modules(app.crud.__path__):
+        module = importlib.import_module(f"app.crud.{module_info.name}")
+        for name, value in list(vars(module).items()):
+            if (
+                name.startswith("_")
+                or not inspect.iscoroutinefunction(value)
+                or value.__module__ != module.__name__
+                or getattr(value, "__traced__", False)
+            ):
+                continue
+            setattr(module, name, _traced(value, f"crud.{module_info.name}.{name}"))
+
+def setup_sql_tracing(engine: Engine) -> None:
+    """
+    Um span por comando SQL, filho do span atual (normalmente a função do crud).
+    Comandos fora de um trace amostrado (inicialização, tarefas de fundo) não geram spans.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _tracer is None or not trace.get_current_span().is_recording():
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+        current = _tracer.start_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation": operation,
+                "db.statement": statement[:_STATEMENT_MAX_LENGTH],
+            }
+        )
+        conn.info.setdefault(_SPAN_KEY, []).append(current)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get(_SPAN_KEY)
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        spans = conn.info.get(_SPAN_KEY) if conn is not None else None
+        if spans:
+            current = spans.pop()
+            current.record_exception(exception_context.original_exception)
+            current.set_status(Status(StatusCode.ERROR))
+            current.end()
@@ -2,7 +2,10 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.configuration import Configuration
-from app.schemas.configuration import ConfigurationCreate, ConfigurationUpdate
+from app.schemas.configuration import Configuration as ConfigurationSchema, ConfigurationCreate, ConfigurationUpdate
+from app.core.resource_cache import resource_cache
+
+configuration_cache = resource_cache.register("configuration", ConfigurationSchema)
 
 async def create_configuration(db: AsyncSession, config_in: ConfigurationCreate, user_id: int) -> Configuration:
     """
@@ -25,7 +28,7 @@ async def create_configuration(db: AsyncSession, config_in: ConfigurationCreate,
     )
     db.add(db_config)
     await db.commit()
-    await db.refresh(db_config)
+    await configuration_cache.invalidate(user_id)
     return db_config
 
 async def get_configuration(db: AsyncSession, config_id: int) -> Optional[Configuration]:
@@ -42,6 +45,10 @@ async def get_user_configuration(db: AsyncSession, user_id: int) -> Optional[Con
     result = await db.execute(select(Configuration).where(Configuration.user_id == user_id))
     return result.scalar_one_or_none()
 
+async def get_user_configuration_cached(db: AsyncSession, user_id: int) -> Optional[ConfigurationSchema]:
+    """Configuração já validada no schema de resposta, via cache (somente leitura)."""
+    return await configuration_cache.get_or_load(db, user_id, lambda: get_user_configuration(db=db, user_id=user_id))
+
 async def update_configuration(
     db: AsyncSession, 
     config_id: int, 
@@ -60,7 +67,7 @@ async def update_configuration(
         setattr(db_config, field, value)
     
     await db.commit()
-    await db.refresh(db_config)
+    await configuration_cache.invalidate(db_config.user_id)
     return db_config
 
 async def delete_configuration(db: AsyncSession, config_id: int) -> Optional[Configuration]:
@@ -73,6 +80,7 @@ async def delete_configuration(db: AsyncSession, config_id: int) -> Optional[Con
     
     await db.delete(db_config)
     await db.commit()
+    await configuration_cache.invalidate(db_config.user_id)
     return db_config
 
 async def update_or_create_user_configuration(
@@ -97,5 +105,5 @@ async def update_or_create_user_configuration(
         db.add(db_config)
     
     await db.commit()
-    await db.refresh(db_config)
+    await configuration_cache.invalidate(user_id)
     return db_config 
\ No newline at end of file
@@ -1,15 +1,21 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 
 from app.models.gift_shop import GiftShop, GiftProduct, GiftShopPurchase
-from app.schemas.gift_shop import GiftShopPurchase as GiftShopPurchaseSchema, GiftShopCreate, GiftShopUpdate, GiftProductCreate, GiftProductUpdate, GiftShopPurchaseUpdate
+from app.models.guest import Guest
+from app.models.photo import Photo
+from app.schemas.gift_shop import GiftShop as GiftShopSchema, GiftShopPurchase as GiftShopPurchaseSchema, GiftShopCreate, GiftShopUpdate, GiftProductCreate, GiftProductUpdate, GiftShopPurchaseUpdate
 from app.crud import guest as guest_crud, user as user_crud
 from app.errors.base import create_not_found_error
 from app.services.pix import PayloadPixGen
 from app.services.whatsapp import get_whatsapp_service
+from app.core.resource_cache import resource_cache
+
+# Loja com produtos, sem as compras (que mudam a todo momento no dia do casamento)
+gift_shop_cache = resource_cache.register("gift_shop", GiftShopSchema)
 
 # Shop Operations
 
@@ -36,6 +42,10 @@ async def get_user_gift_shop(db: AsyncSession, user_id: int) -> Optional[GiftSho
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
+async def get_user_gift_shop_cached(db: AsyncSession, user_id: int) -> Optional[GiftShopSchema]:
+    """Loja já validada no schema de resposta, via cache (somente leitura)."""
+    return await gift_shop_cache.get_or_load(db, user_id, lambda: get_user_gift_shop(db=db, user_id=user_id))
+
 async def create_gift_shop(
     db: AsyncSession,
     shop_in: GiftShopCreate,
@@ -47,7 +57,7 @@ async def create_gift_shop(
     )
     db.add(db_shop)
     await db.commit()
-    await db.refresh(db_shop)
+    await gift_shop_cache.invalidate(user_id)
     return db_shop
 
 async def update_gift_shop(
@@ -61,7 +71,7 @@ async def update_gift_shop(
     
     db.add(shop)
     await db.commit()
-    await db.refresh(shop)
+    await gift_shop_cache.invalidate(shop.user_id)
     return shop
 
 async def delete_gift_shop(
@@ -78,6 +88,7 @@ async def delete_gift_shop(
     if shop:
         await db.delete(shop)
         await db.commit()
+        await gift_shop_cache.invalidate(user_id)
     
     return shop
 
@@ -115,10 +126,11 @@ async def create_gift_product(
         **product_in.model_dump(),
         shop_id=shop_id
     )
+    db_item.photo = await db.get(Photo, product_in.photo_id) if product_in.photo_id else None
     db.add(db_item)
     await db.commit()
-    await db.refresh(db_item)
-    return await get_gift_product(db=db, product_id=db_item.id)
+    await gift_shop_cache.invalidate_owner(db, GiftShop, shop_id)
+    return db_item
 
 async def update_gift_product(
     db: AsyncSession,
@@ -132,11 +144,15 @@ async def update_gift_product(
         elif field == "image" and product.photo_id:
             product.photo_id = None
         setattr(product, field, value)
+
+    # Mantém a relação carregada coerente com o photo_id, sem recarregar o produto
+    if "photo_id" in update_data or "image" in update_data:
+        product.photo = await db.get(Photo, product.photo_id) if product.photo_id else None
     
     db.add(product)
     await db.commit()
-    await db.refresh(product)
-    return await get_gift_product(db=db, product_id=product.id)
+    await gift_shop_cache.invalidate_owner(db, GiftShop, product.shop_id)
+    return product
 
 async def delete_gift_product(
     db: AsyncSession,
@@ -152,6 +168,7 @@ async def delete_gift_product(
     if product:
         await db.delete(product)
         await db.commit()
+        await gift_shop_cache.invalidate_owner(db, GiftShop, product.shop_id)
     
     return product
 
@@ -167,7 +184,6 @@ async def create_gift_shop_purchase(db: AsyncSession, product_id: int, guest_id:
     )
     db.add(db_item)
     await db.commit()
-    await db.refresh(db_item)
     return db_item
 
 async def get_gift_shop_purchase(db: AsyncSession, product_id: int, guest_id: int) -> Optional[GiftShopPurchase]:
@@ -200,17 +216,9 @@ async def update_gift_shop_purchase(db: AsyncSession, product_id: int, guest_has
     
     db.add(purchase)
     await db.commit()
-    await db.refresh(purchase)
     return purchase
 
-async def get_gift_shop_by_guest_hash(db: AsyncSession, guest_hash: str) -> Optional[GiftShop]:
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
-    if not guest:
-        raise create_not_found_error(
-            resource_type="Invitation",
-            resource_id=guest_hash
-        )
-    
+async def get_gift_shop_with_purchases(db: AsyncSession, user_id: int) -> Optional[GiftShop]:
     stmt = (
         select(GiftShop)
         .options(
@@ -220,11 +228,58 @@ async def get_gift_shop_by_guest_hash(db: AsyncSession, guest_hash: str) -> Opti
             .selectinload(GiftProduct.purchases)
             .selectinload(GiftShopPurchase.guest)
         )
-        .where(GiftShop.user_id == guest.user_id)
+        .where(GiftShop.user_id == user_id)
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
 
+async def get_gift_shop_version(db: AsyncSession, user_id: int) -> Optional[Tuple]:
+    """
+    Versão da loja com produtos, fotos, compras e os convidados que compraram (serializados em
+    purchases[].guest): contagens e maior updated_at de cada tabela, calculada em uma única agregação para o ETag, sem carregar o agregado.
+    """
+    product_ts = func.coalesce(GiftProduct.updated_at, GiftProduct.created_at)
+    purchase_ts = func.coalesce(GiftShopPurchase.updated_at, GiftShopPurchase.created_at)
+    result = await db.execute(
+        select(
+            GiftShop.id,
+            func.coalesce(GiftShop.updated_at, GiftShop.created_at),
+            func.count(GiftProduct.id.distinct()),
+            func.max(product_ts),
+            func.count(GiftShopPurchase.id.distinct()),
+            func.max(purchase_ts),
+            func.max(func.coalesce(Photo.updated_at, Photo.created_at)),
+            func.max(func.coalesce(Guest.updated_at, Guest.created_at)),
+        )
+        .select_from(GiftShop)
+        .outerjoin(GiftProduct, GiftProduct.shop_id == GiftShop.id)
+        .outerjoin(GiftShopPurchase, GiftShopPurchase.product_id == GiftProduct.id)
+        .outerjoin(Photo, Photo.id == GiftProduct.photo_id)
+        .outerjoin(Guest, Guest.id == GiftShopPurchase.guest_id)
+        .where(GiftShop.user_id == user_id)
+        .group_by(GiftShop.id)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row else None
+
+async def get_gift_shop_version_by_guest_hash(db: AsyncSession, guest_hash: str) -> Optional[Tuple]:
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
+    if not guest:
+        raise create_not_found_error(
+            resource_type="Invitation",
+            resource_id=guest_hash
+        )
+    return await get_gift_shop_version(db=db, user_id=guest.user_id)
+
+async def get_gift_shop_by_guest_hash(db: AsyncSession, guest_hash: str) -> Optional[GiftShop]:
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
+    if not guest:
+        raise create_not_found_error(
+            resource_type="Invitation",
+            resource_id=guest_hash
+        )
+    return await get_gift_shop_with_purchases(db=db, user_id=guest.user_id)
+
 async def purchase_gift_product(db: AsyncSession, product_id: int, guest_hash: str) -> Optional[GiftShopPurchaseSchema]:
     
     product = await get_gift_product(db=db, product_id=product_id)
@@ -234,19 +289,20 @@ async def purchase_gift_product(db: AsyncSession, product_id: int, guest_hash: s
             resource_id=product_id
         )
     
-    shop = await get_gift_shop_by_guest_hash(db=db, guest_hash=guest_hash)
-    if not shop:
-        raise create_not_found_error(
-            resource_type="Gift Shop",
-            resource_id=guest_hash
-        )
-    
+    # O convidado completo é usado na resposta; a loja é buscada direto pelo user_id dele
     guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
     if not guest:
         raise create_not_found_error(
             resource_type="Invitation",
             resource_id=guest_hash
         )
+
+    shop = await get_gift_shop_with_purchases(db=db, user_id=guest.user_id)
+    if not shop:
+        raise create_not_found_error(
+            resource_type="Gift Shop",
+            resource_id=guest_hash
+        )
     
     user = await user_crud.get_user_with_configuration_by_id(db=db, user_id=shop.user_id)
     if not user:
@@ -1,16 +1,51 @@
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, or_, case, literal, tuple_
+import base64
+import binascii
 import hashlib
+import json
+import re
 import uuid
-import time
 
 from app.models.guest import Guest
 from app.schemas.guest import GuestCreate, GuestStatistics, GuestUpdate
 from app.services.whatsapp import get_whatsapp_service
 from app.models.user import User
+from app.errors.base import ErrorCode, create_validation_error
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+class GuestRef(NamedTuple):
+    """Dados mínimos do convidado usados pelas rotas públicas para validar o hash_link."""
+    id: int
+    user_id: int
+    name: str
+
+# hash_link -> GuestRef, compartilhado entre as requisições do processo
+guest_ref_cache: TTLCache[GuestRef] = TTLCache(
+    ttl_seconds=settings.GUEST_HASH_CACHE_TTL_SECONDS,
+    max_size=settings.GUEST_HASH_CACHE_MAX_SIZE
+)
+
+_REQUEST_CACHE_KEY = "guest_refs"
+
+def _request_guest_refs(db: AsyncSession) -> Dict[str, GuestRef]:
+    # session.info vive apenas durante a sessão, que é aberta por requisição
+    return db.info.setdefault(_REQUEST_CACHE_KEY, {})
+
+def _remember_guest(db: AsyncSession, guest: Guest) -> GuestRef:
+    ref = GuestRef(id=guest.id, user_id=guest.user_id, name=guest.name)
+    _request_guest_refs(db)[guest.hash_link] = ref
+    guest_ref_cache.set(guest.hash_link, ref)
+    return ref
+
+def invalidate_guest_hash(db: AsyncSession, hash_link: str) -> None:
+    _request_guest_refs(db).pop(hash_link, None)
+    guest_ref_cache.delete(hash_link)
 
 async def get_guest(db: AsyncSession, guest_id: int) -> Optional[Guest]:
     result = await db.execute(select(Guest).where(Guest.id == guest_id))
@@ -18,20 +53,155 @@ async def get_guest(db: AsyncSession, guest_id: int) -> Optional[Guest]:
 
 async def get_guest_by_hash(db: AsyncSession, hash_link: str) -> Optional[Guest]:
     result = await db.execute(select(Guest).where(Guest.hash_link == hash_link))
-    return result.scalar_one_or_none()
+    guest = result.scalar_one_or_none()
+    if guest:
+        _remember_guest(db, guest)
+    return guest
+
+async def resolve_guest_hash(db: AsyncSession, hash_link: str) -> Optional[GuestRef]:
+    """
+    Resolve o hash_link em (id, user_id, name) sem carregar o convidado inteiro.
+    Consulta primeiro o cache da requisição, depois o cache do processo e só então o banco.
+    Use get_guest_by_hash quando a rota precisar do objeto Guest completo.
+    """
+    refs = _request_guest_refs(db)
+    ref = refs.get(hash_link)
+    if ref:
+        return ref
+
+    ref = guest_ref_cache.get(hash_link)
+    if ref is None:
+        result = await db.execute(
+            select(Guest.id, Guest.user_id, Guest.name).where(Guest.hash_link == hash_link)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        ref = GuestRef(id=row.id, user_id=row.user_id, name=row.name)
+        guest_ref_cache.set(hash_link, ref)
+
+    refs[hash_link] = ref
+    return ref
+
+def encode_guest_cursor(sort_name: str, guest_id: int) -> str:
+    """
+    Gera o cursor opaco da paginação a partir da chave de ordenação (lower(name), id).
+    sort_name deve vir do próprio banco (lower() do Postgres), não de str.lower() do Python,
+    que difere em alguns caracteres e faria a próxima página pular ou repetir convidados.
+    """
+    payload = json.dumps([sort_name, guest_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_guest_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        name, guest_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(name, str) or not isinstance(guest_id, int):
+            raise ValueError("cursor malformado")
+        return name, guest_id
+    except (ValueError, TypeError, binascii.Error):
+        raise create_validation_error(
+            ErrorCode.INVALID_CONTENT,
+            "Cursor de paginação inválido",
+            {"cursor": cursor}
+        )
+
+async def get_guests_page(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Tuple[List[Guest], Optional[str]]:
+    """
+    Lista os convidados do usuário ordenados por (lower(name), id) e retorna também o cursor
+    da próxima página (None quando a página veio incompleta).
+    Com cursor, usa paginação por chave (keyset) sobre o índice ix_guests_user_id_lower_name_id,
+    evitando ordenar e descartar as linhas anteriores como acontece com OFFSET.
+    """
+    sort_name = func.lower(Guest.name)
+    query = select(Guest, sort_name.label("sort_name")).where(Guest.user_id == user_id)
+    if cursor:
+        last_name, last_id = decode_guest_cursor(cursor)
+        query = query.where(tuple_(sort_name, Guest.id) > tuple_(last_name, last_id))
+    else:
+        query = query.offset(skip)
+
+    result = await db.execute(
+        query
+        .order_by(sort_name.asc(), Guest.id.asc())
+        .limit(limit)
+    )
+    rows = result.all()
+    next_cursor = None
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_guest_cursor(last.sort_name, last.Guest.id)
+    return [row.Guest for row in rows], next_cursor
 
 async def get_guests_by_user(
     db: AsyncSession,
     user_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> List[Guest]:
+    """
+    Lista os convidados do usuário ordenados por (lower(name), id); veja get_guests_page.
+    """
+    guests, _ = await get_guests_page(db=db, user_id=user_id, skip=skip, limit=limit, cursor=cursor)
+    return guests
+
+async def count_guests_by_user(db: AsyncSession, user_id: int) -> int:
+    # Contagem resolvida por index-only scan no índice (user_id, lower(name), id)
+    result = await db.execute(
+        select(func.count()).select_from(Guest).where(Guest.user_id == user_id)
+    )
+    return result.scalar_one()
+
+async def search_guests(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    skip: int = 0,
+    limit: int = 20
 ) -> List[Guest]:
+    """
+    Busca convidados do usuário por nome (sem acento/caixa, prefixo ou aproximada) e telefone.
+    Usa as colunas normalizadas search_name/search_phone e os índices trigram.
+    """
+    text = query.strip()
+    if not text:
+        # Só espaços: o prefixo vazio casaria com todos os convidados
+        return []
+
+    # Escapa os curingas do LIKE para que o termo digitado seja tratado literalmente
+    escaped = re.sub(r"([\\%_])", r"\\\1", text)
+    term = func.lower(func.f_unaccent(text))
+    like_term = func.lower(func.f_unaccent(escaped))
+    prefix_match = Guest.search_name.like(like_term.concat("%"), escape="\\")
+
+    conditions = [prefix_match]
+    if len(text) >= 3:
+        # Trigram só é seletivo a partir de 3 caracteres
+        conditions.append(Guest.search_name.like(literal("%").concat(like_term).concat("%"), escape="\\"))
+        conditions.append(term.op("<%")(Guest.search_name))
+
+    digits = re.sub(r"\D", "", query)
+    if len(digits) >= 3:
+        conditions.append(Guest.search_phone.like(f"%{digits}%"))
+
     result = await db.execute(
         select(Guest)
         .where(Guest.user_id == user_id)
+        .where(or_(*conditions))
+        .order_by(
+            case((prefix_match, 0), else_=1),
+            func.word_similarity(term, Guest.search_name).desc(),
+            func.lower(Guest.name).asc(),
+            Guest.id.asc()
+        )
         .offset(skip)
         .limit(limit)
-        .order_by(func.lower(Guest.name).asc())
     )
     return result.scalars().all()
 
@@ -91,7 +261,6 @@ async def create_guest(
     )
     db.add(db_guest)
     await db.commit()
-    await db.refresh(db_guest)
     return db_guest
 
 async def update_guest(
@@ -109,7 +278,7 @@ async def update_guest(
     
     db.add(guest)
     await db.commit()
-    await db.refresh(guest)
+    invalidate_guest_hash(db, guest.hash_link)
     return guest
 
 async def delete_guest(
@@ -128,6 +297,7 @@ async def delete_guest(
     if guest:
         await db.delete(guest)
         await db.commit()
+        invalidate_guest_hash(db, guest.hash_link)
     
     return guest
 
@@ -135,8 +305,7 @@ async def confirm_guest_presence(db: AsyncSession, hash_link: str) -> Optional[G
     guest = await get_guest_by_hash(db, hash_link)
     if guest:
         guest.confirmed = True
-        db.commit()
-        db.refresh(guest)
+        await db.commit()
         return guest
     return None 
 
@@ -177,6 +346,7 @@ async def send_reaction_to_all_guests_not_confirmed(db: AsyncSession, user: User
         except Exception as e:
             logging.error(f"Erro ao enviar mensagem: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Erro ao enviar mensagem: {str(e)}")
-        time.sleep(1)
+        # Intervalo entre as reações, sem bloquear o event loop
+        await asyncio.sleep(1)
     logging.info(f"Reação enviada para todos os convidados não confirmados")
 
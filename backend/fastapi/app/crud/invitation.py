@@ -1,17 +1,19 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import joinedload
 from app.models.invitation import Invitation
+from app.models.guest import Guest as GuestModel
 from app.models.user import User
-from app.schemas.invitation import GuestInvitationResponse, InvitationCreate, InvitationUpdate
+from app.schemas.invitation import GuestInvitationResponse, Invitation as InvitationSchema, InvitationCreate, InvitationUpdate
 from app.schemas.guest import Guest, GuestUpdate
 from app.services.whatsapp import get_whatsapp_service
 from app.crud import guest as guest_crud
+from app.core.resource_cache import resource_cache
 import logging
 
-
+invitation_cache = resource_cache.register("invitation", InvitationSchema)
 
 async def get_invitation(db: AsyncSession, user_id: int) -> Optional[Invitation]:
     """
@@ -27,6 +29,10 @@ async def get_invitation(db: AsyncSession, user_id: int) -> Optional[Invitation]
     )
     return result.unique().scalar_one_or_none()
 
+async def get_invitation_cached(db: AsyncSession, user_id: int) -> Optional[InvitationSchema]:
+    """Convite já validado no schema de resposta, via cache (somente leitura)."""
+    return await invitation_cache.get_or_load(db, user_id, lambda: get_invitation(db=db, user_id=user_id))
+
 async def get_user_invitations(
     db: AsyncSession,
     user_id: int,
@@ -62,10 +68,8 @@ async def create_invitation(
     )
     db.add(db_invitation)
     await db.commit()
-    await db.refresh(db_invitation)
-    
-    # Recarrega o convite com suas relações
-    return await get_invitation(db=db, user_id=user_id)
+    await invitation_cache.invalidate(user_id)
+    return db_invitation
 
 async def update_invitation(
     db: AsyncSession,
@@ -81,10 +85,8 @@ async def update_invitation(
     
     db.add(invitation)
     await db.commit()
-    await db.refresh(invitation)
-    
-    # Recarrega o convite com suas relações
-    return await get_invitation(db=db, user_id=invitation.user_id)
+    await invitation_cache.invalidate(invitation.user_id)
+    return invitation
 
 async def delete_invitation(
     db: AsyncSession,
@@ -103,9 +105,28 @@ async def delete_invitation(
     if invitation:
         await db.delete(invitation)
         await db.commit()
+        await invitation_cache.invalidate(user_id)
     
     return invitation 
 
+async def get_guest_invitation_version(db: AsyncSession, hash_link: str) -> Optional[Tuple]:
+    """
+    Versão do convite do convidado (ids e updated_at do convidado e do convite) em uma única
+    consulta leve, usada para o ETag antes de carregar o convite completo.
+    """
+    result = await db.execute(
+        select(
+            GuestModel.id,
+            func.coalesce(GuestModel.updated_at, GuestModel.created_at),
+            Invitation.id,
+            func.coalesce(Invitation.updated_at, Invitation.created_at),
+        )
+        .join(Invitation, Invitation.user_id == GuestModel.user_id)
+        .where(GuestModel.hash_link == hash_link)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row else None
+
 async def get_guest_invitation(
     db: AsyncSession,
     hash_link: str  
@@ -4,17 +4,21 @@ from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 from app.models.menu import Menu, MenuItem
-from app.schemas.menu import MenuCreate, MenuUpdate, MenuItemCreate, MenuItemUpdate
+from app.schemas.menu import MenuCreate, MenuUpdate, MenuItemCreate, MenuItemUpdate, MenuResponse
+from app.core.resource_cache import resource_cache
+
+menus_cache = resource_cache.register("menus", List[MenuResponse])
 
 async def create_menu(db: AsyncSession, *, menu_in: MenuCreate, user_id: int) -> Menu:
     """Cria um novo cardápio."""
     db_menu = Menu(
         title=menu_in.title,
-        user_id=user_id
+        user_id=user_id,
+        items=[]
     )
     db.add(db_menu)
     await db.commit()
-    await db.refresh(db_menu)
+    await menus_cache.invalidate(user_id)
     return db_menu
 
 async def get_menu(db: AsyncSession, menu_id: int) -> Optional[Menu]:
@@ -30,7 +34,7 @@ async def get_user_menus(
     db: AsyncSession, 
     user_id: int, 
     skip: int = 0, 
-    limit: int = 100
+    limit: Optional[int] = 100
 ) -> List[Menu]:
     """Recupera todos os cardápios de um usuário."""
     result = await db.execute(
@@ -40,7 +44,12 @@ async def get_user_menus(
         .offset(skip)
         .limit(limit)
     )
-    return result.scalars().all()
+    return result.unique().scalars().all()
+
+async def get_user_menus_cached(db: AsyncSession, user_id: int) -> List[MenuResponse]:
+    """Todos os cardápios do usuário já validados no schema de resposta, via cache (somente leitura)."""
+    menus = await menus_cache.get_or_load(db, user_id, lambda: get_user_menus(db=db, user_id=user_id, limit=None))
+    return menus or []
 
 async def update_menu(
     db: AsyncSession,
@@ -55,7 +64,7 @@ async def update_menu(
         setattr(menu, field, value)
     
     await db.commit()
-    await db.refresh(menu)
+    await menus_cache.invalidate(menu.user_id)
     return menu
 
 async def delete_menu(db: AsyncSession, *, menu_id: int, user_id: int) -> Optional[Menu]:
@@ -64,6 +73,7 @@ async def delete_menu(db: AsyncSession, *, menu_id: int, user_id: int) -> Option
     if menu and menu.user_id == user_id:
         await db.delete(menu)
         await db.commit()
+        await menus_cache.invalidate(user_id)
         return menu
     return None
 
@@ -85,7 +95,7 @@ async def create_menu_item(
     )
     db.add(db_item)
     await db.commit()
-    await db.refresh(db_item)
+    await menus_cache.invalidate_owner(db, Menu, menu_id)
     return db_item
 
 async def get_menu_item(db: AsyncSession, item_id: int) -> Optional[MenuItem]:
@@ -110,7 +120,7 @@ async def update_menu_item(
             setattr(item, field, value)
     
     await db.commit()
-    await db.refresh(item)
+    await menus_cache.invalidate_owner(db, Menu, item.menu_id)
     return item
 
 async def delete_menu_item(db: AsyncSession, *, item_id: int) -> Optional[MenuItem]:
@@ -119,5 +129,6 @@ async def delete_menu_item(db: AsyncSession, *, item_id: int) -> Optional[MenuIt
     if item:
         await db.delete(item)
         await db.commit()
+        await menus_cache.invalidate_owner(db, Menu, item.menu_id)
         return item
     return None 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -21,7 +22,8 @@ async def create_photo(db: AsyncSession, photo_in: PhotoCreate) -> Photo:
     presigned_post = s3_service.generate_presigned_post(s3_key)
 
     #realiza o upload do arquivo para o S3
-    is_uploaded = s3_service.upload_file(s3_key, photo_in.file)
+    # boto3 é síncrono: o upload roda no threadpool para não bloquear o event loop
+    is_uploaded = await run_in_threadpool(s3_service.upload_file, s3_key, photo_in.file)
     if not is_uploaded and False: #TODO: Remover o False para ativar o upload do arquivo para o S3
         raise HTTPException(status_code=500, detail="Erro ao fazer upload do arquivo para o S3")
     
@@ -32,7 +34,6 @@ async def create_photo(db: AsyncSession, photo_in: PhotoCreate) -> Photo:
     )
     db.add(db_photo)
     await db.commit()
-    await db.refresh(db_photo)
     return db_photo
 
 async def get_photo(db: AsyncSession, photo_id: int) -> Optional[Photo]:
@@ -57,7 +58,6 @@ async def update_photo(db: AsyncSession, photo_id: int, photo_in: PhotoUpdate) -
         setattr(db_photo, field, value)
     
     await db.commit()
-    await db.refresh(db_photo)
     return db_photo
 
 async def delete_photo(db: AsyncSession, photo_id: int) -> Optional[Photo]:
@@ -67,7 +67,7 @@ async def delete_photo(db: AsyncSession, photo_id: int) -> Optional[Photo]:
     
     # Remove a foto do S3 antes de deletar do banco
     if db_photo.s3_key:
-        s3_service.delete_file(db_photo.s3_key)
+        await run_in_threadpool(s3_service.delete_file, db_photo.s3_key)
     
     await db.delete(db_photo)
     await db.commit()
@@ -78,11 +78,12 @@ async def create_photo_album(db: AsyncSession, album_in: PhotoAlbumCreate) -> Ph
     db_album = PhotoAlbum(
         name=album_in.name,
         description=album_in.description,
-        user_id=album_in.user_id
+        user_id=album_in.user_id,
+        guest_id=album_in.guest_id,
+        photos=[]
     )
     db.add(db_album)
     await db.commit()
-    await db.refresh(db_album)
     return db_album
 
 async def get_photo_album(db: AsyncSession, album_id: int) -> Optional[PhotoAlbum]:
@@ -131,7 +132,6 @@ async def update_photo_album(db: AsyncSession, album_id: int, album_in: PhotoAlb
         setattr(db_album, field, value)
     
     await db.commit()
-    await db.refresh(db_album)
     return db_album
 
 async def delete_photo_album(db: AsyncSession, album_id: int) -> Optional[PhotoAlbum]:
@@ -160,9 +160,9 @@ async def add_photo_to_album(db: AsyncSession, album_id: int, photo_id: int) ->
     if not db_photo:
         return None
     
-    db_photo.photo_album_id = album_id
+    # Atribui pela relação para que db_album.photos (já carregado) reflita a mudança sem refresh
+    db_photo.photo_album = db_album
     await db.commit()
-    await db.refresh(db_album)
     return db_album
 
 async def remove_photo_from_album(db: AsyncSession, album_id: int, photo_id: int) -> Optional[PhotoAlbum]:
@@ -177,9 +177,8 @@ async def remove_photo_from_album(db: AsyncSession, album_id: int, photo_id: int
     if not db_photo or db_photo.photo_album_id != album_id:
         return None
     
-    db_photo.photo_album_id = None
+    db_photo.photo_album = None
     await db.commit()
-    await db.refresh(db_album)
     return db_album
 
 async def get_album_by_photo_id(db: AsyncSession, photo_id: int) -> Optional[PhotoAlbum]:
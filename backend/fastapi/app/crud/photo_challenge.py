@@ -5,6 +5,7 @@ from sqlalchemy.orm import joinedload, selectinload
 from collections import defaultdict
 
 from app.models.photo_challenge import PhotoChallenge, ChallengeTask, CompletedChallengeTask
+from app.models.guest import Guest
 from app.schemas.photo_challenge import ChallengeSummaryGuestResponse, ChallengeTaskResponse, ChallengeTaskResponseGuest, CompletedTaskInfo, GuestInfo, PhotoChallengeCreate, ChallengeTaskCreate, CompletedChallengeTaskCreate, PhotoChallengeUpdate
 from app.errors.base import create_not_found_error, ErrorCode
 
@@ -16,12 +17,12 @@ async def create_photo_challenge(
 ) -> PhotoChallenge:
     db_challenge = PhotoChallenge(
         title=challenge_in.title,
-        user_id=user_id
+        user_id=user_id,
+        tasks=[]
     )
     db.add(db_challenge)
     await db.commit()
-    await db.refresh(db_challenge)
-    return await get_photo_challenge_by_user(db=db, user_id=user_id)
+    return db_challenge
 
 async def get_photo_challenge_by_user(
     db: AsyncSession,
@@ -39,13 +40,17 @@ async def get_photo_challenge_by_user(
     result = await db.execute(stmt)
     return result.unique().scalar_one_or_none()
 
+async def get_photo_challenge_id_by_user(db: AsyncSession, user_id: int) -> Optional[int]:
+    """Só o id do desafio, para as rotas do convidado que não precisam das tarefas carregadas."""
+    result = await db.execute(select(PhotoChallenge.id).where(PhotoChallenge.user_id == user_id))
+    return result.scalar_one_or_none()
+
 async def update_photo_challenge_by_user(
     db: AsyncSession,
     user_id: int,
     challenge_in: PhotoChallengeUpdate
 ) -> PhotoChallenge:
     challenge = await get_photo_challenge_by_user(db=db, user_id=user_id)
-    print(challenge)
     if not challenge:
         raise create_not_found_error(
             error_code=ErrorCode.NOT_FOUND,
@@ -56,7 +61,6 @@ async def update_photo_challenge_by_user(
     challenge.title = challenge_in.title
     db.add(challenge)
     await db.commit()
-    await db.refresh(challenge)
     return challenge
 
 async def delete_photo_challenge_by_user(
@@ -91,11 +95,11 @@ async def create_challenge_task(
     db_task = ChallengeTask(
         title=task_in.title,
         description=task_in.description,
-        challenge_id=challenge.id
+        challenge_id=challenge.id,
+        completed_tasks=[]
     )
     db.add(db_task)
     await db.commit()
-    await db.refresh(db_task)
     return db_task
 
 async def update_challenge_task(
@@ -124,7 +128,6 @@ async def update_challenge_task(
     task.description = task_in.description
     db.add(task)
     await db.commit()
-    await db.refresh(task)
     return task
 
 async def delete_challenge_task(
@@ -171,16 +174,19 @@ async def complete_challenge_task(
     db: AsyncSession,
     complete_in: CompletedChallengeTaskCreate
 ) -> CompletedChallengeTask:
-    # Criar a nova tarefa completada
+    # Criar a nova tarefa completada. A tarefa normalmente já está no identity map (carregada
+    # pela rota), então db.get não vai ao banco; atribuir pela relação também adiciona o registro
+    # em task.completed_tasks sem precisar recarregar a tarefa. O convidado custa uma consulta
+    # por chave primária (a rota só tem o GuestRef), necessária porque a resposta serializa
+    # completed_tasks[].guest e um lazy load nesse ponto falharia na sessão assíncrona.
     db_completed = CompletedChallengeTask(
-        task_id=complete_in.task_id,
         photo_id=complete_in.photo_id,
-        guest_id=complete_in.guest_id
+        task=await db.get(ChallengeTask, complete_in.task_id),
+        guest=await db.get(Guest, complete_in.guest_id)
     )
 
     db.add(db_completed)
     await db.commit()
-    await db.refresh(db_completed)
     
     return db_completed
 
@@ -203,7 +209,8 @@ async def get_challenge_summary_by_guest(
     stmt = (
         select(ChallengeTask)
         .options(
-            selectinload(ChallengeTask.completed_tasks),
+            selectinload(ChallengeTask.completed_tasks)
+            .selectinload(CompletedChallengeTask.guest),
         )
         .where(ChallengeTask.challenge_id == challenge_id)
         .order_by(ChallengeTask.created_at)
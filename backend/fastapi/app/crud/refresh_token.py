@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+def _hash_token(raw_token: str) -> str:
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+async def issue_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    family_id: Optional[str] = None
+) -> str:
+    """
+    Cria um refresh token e retorna o valor original, que só é enviado ao cliente.
+    Sem family_id inicia uma nova família (novo login).
+    """
+    raw_token = secrets.token_urlsafe(48)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=_hash_token(raw_token),
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    await db.commit()
+    return raw_token
+
+async def _revoke_family(db: AsyncSession, family_id: str) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+
+async def rotate_refresh_token(db: AsyncSession, raw_token: str) -> Optional[Tuple[User, str]]:
+    """
+    Troca um refresh token válido por um novo da mesma família e retorna (usuário, novo token).
+
+    Apresentar um token já rotacionado indica que ele vazou: a família inteira é revogada,
+    derrubando tanto o atacante quanto o cliente legítimo. Retorna None se o token não puder
+    ser usado.
+    """
+    result = await db.execute(
+        select(RefreshToken)
+        .where(RefreshToken.token_hash == _hash_token(raw_token))
+        .with_for_update()
+    )
+    token = result.scalar_one_or_none()
+    if token is None:
+        return None
+
+    now = datetime.now(timezone.utc)
+    if token.revoked_at is not None:
+        logger.warning(f"Reuso de refresh token detectado (usuário {token.user_id}); revogando a família")
+        await _revoke_family(db, token.family_id)
+        return None
+    if token.expires_at <= now:
+        await db.rollback()
+        return None
+
+    user = await db.get(User, token.user_id)
+    if user is None or not user.is_active:
+        await _revoke_family(db, token.family_id)
+        return None
+
+    token.revoked_at = now
+    new_token = await issue_refresh_token(db, user.id, family_id=token.family_id)
+    return user, new_token
+
+async def revoke_refresh_token(db: AsyncSession, raw_token: str) -> None:
+    """Revoga a família do token (logout da sessão que o apresentou)."""
+    result = await db.execute(
+        select(RefreshToken.family_id).where(RefreshToken.token_hash == _hash_token(raw_token))
+    )
+    family_id = result.scalar_one_or_none()
+    if family_id:
+        await _revoke_family(db, family_id)
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: int) -> None:
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
@@ -3,7 +3,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from app.models.schedule import Schedule, ScheduleItem
-from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleItemCreate, ScheduleItemUpdate
+from app.schemas.schedule import Schedule as ScheduleSchema, ScheduleCreate, ScheduleUpdate, ScheduleItemCreate, ScheduleItemUpdate
+from app.core.resource_cache import resource_cache
+
+schedule_cache = resource_cache.register("schedule", ScheduleSchema)
 
 async def create_schedule(db: AsyncSession, *, obj_in: ScheduleCreate, user_id: int) -> Schedule:
     """
@@ -32,12 +35,11 @@ async def create_schedule(db: AsyncSession, *, obj_in: ScheduleCreate, user_id:
         ]
     )
     
-    # Adiciona e comita
+    # Adiciona e comita; os itens já estão na coleção, não é preciso recarregar
     db.add(db_obj)
     await db.commit()
-    
-    # Recarrega o objeto com os itens
-    return await get_schedule(db=db, user_id=user_id)
+    await schedule_cache.invalidate(user_id)
+    return db_obj
 
 async def get_schedule(db: AsyncSession, user_id: int) -> Optional[Schedule]:
     """Obtém o cronograma de um usuário"""
@@ -48,19 +50,24 @@ async def get_schedule(db: AsyncSession, user_id: int) -> Optional[Schedule]:
     )
     return result.scalar_one_or_none()
 
+async def get_schedule_cached(db: AsyncSession, user_id: int) -> Optional[ScheduleSchema]:
+    """Cronograma já validado no schema de resposta, via cache (somente leitura)."""
+    return await schedule_cache.get_or_load(db, user_id, lambda: get_schedule(db=db, user_id=user_id))
+
 async def update_schedule(
     db: AsyncSession, *, db_obj: Schedule, obj_in: ScheduleUpdate
 ) -> Schedule:
     """Atualiza o título do cronograma"""
     db_obj.title = obj_in.title
     await db.commit()
-    await db.refresh(db_obj)
+    await schedule_cache.invalidate(db_obj.user_id)
     return db_obj
 
 async def delete_schedule(db: AsyncSession, *, db_obj: Schedule) -> None:
     """Deleta um cronograma e todos seus itens"""
     await db.delete(db_obj)
     await db.commit()
+    await schedule_cache.invalidate(db_obj.user_id)
 
 async def create_schedule_item(
     db: AsyncSession, *, schedule_id: int, obj_in: ScheduleItemCreate
@@ -74,7 +81,7 @@ async def create_schedule_item(
     )
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
+    await schedule_cache.invalidate_owner(db, Schedule, schedule_id)
     return db_obj
 
 async def update_schedule_item(
@@ -85,13 +92,14 @@ async def update_schedule_item(
     db_obj.description = obj_in.description
     db_obj.time = obj_in.time
     await db.commit()
-    await db.refresh(db_obj)
+    await schedule_cache.invalidate_owner(db, Schedule, db_obj.schedule_id)
     return db_obj
 
 async def delete_schedule_item(db: AsyncSession, *, db_obj: ScheduleItem) -> None:
     """Remove um item do cronograma"""
     await db.delete(db_obj)
     await db.commit()
+    await schedule_cache.invalidate_owner(db, Schedule, db_obj.schedule_id)
 
 async def get_schedule_item(db: AsyncSession, item_id: int) -> Optional[ScheduleItem]:
     """Obtém um item específico do cronograma"""
@@ -1,12 +1,15 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy import desc
 from sqlalchemy.orm import selectinload
 
 from app.models.timeline import Timeline, TimelineItem
-from app.schemas.timeline import TimelineCreate, TimelineUpdate, TimelineItemCreate, TimelineItemUpdate
-from app.crud import photo as photo_crud
+from app.models.photo import Photo
+from app.schemas.timeline import Timeline as TimelineSchema, TimelineCreate, TimelineUpdate, TimelineItemCreate, TimelineItemUpdate
+from app.core.resource_cache import resource_cache
+
+timeline_cache = resource_cache.register("timeline", TimelineSchema)
 
 async def get_timeline(db: AsyncSession, timeline_id: int) -> Optional[Timeline]:
     result = await db.execute(select(Timeline).where(Timeline.id == timeline_id))
@@ -20,21 +23,49 @@ async def get_user_timeline(db: AsyncSession, user_id: int) -> Optional[Timeline
     )
     result = await db.execute(stmt)
     return result.scalar_one_or_none()
-    
+
+async def get_user_timeline_cached(db: AsyncSession, user_id: int) -> Optional[TimelineSchema]:
+    """Timeline já validada no schema de resposta, via cache (somente leitura; para editar use get_user_timeline)."""
+    return await timeline_cache.get_or_load(db, user_id, lambda: get_user_timeline(db=db, user_id=user_id))
+
+
+async def get_timeline_version(db: AsyncSession, user_id: int) -> Optional[Tuple]:
+    """
+    Versão da timeline (contagem e maior updated_at dos itens e das fotos) para o ETag,
+    sem carregar os itens.
+    """
+    result = await db.execute(
+        select(
+            Timeline.id,
+            func.coalesce(Timeline.updated_at, Timeline.created_at),
+            func.count(TimelineItem.id),
+            func.max(func.coalesce(TimelineItem.updated_at, TimelineItem.created_at)),
+            func.max(func.coalesce(Photo.updated_at, Photo.created_at)),
+        )
+        .select_from(Timeline)
+        .outerjoin(TimelineItem, TimelineItem.timeline_id == Timeline.id)
+        .outerjoin(Photo, Photo.id == TimelineItem.photo_id)
+        .where(Timeline.user_id == user_id)
+        .group_by(Timeline.id)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row else None
 
 async def create_timeline(
     db: AsyncSession,
     timeline_in: TimelineCreate,
     user_id: int
 ) -> Timeline:
+    # Timeline nova não tem itens: inicializa a coleção para não precisar recarregar
     db_timeline = Timeline(
         title=timeline_in.title,
-        user_id=user_id
+        user_id=user_id,
+        items=[]
     )
     db.add(db_timeline)
     await db.commit()
-    await db.refresh(db_timeline)
-    return await get_user_timeline(db=db, user_id=user_id)
+    await timeline_cache.invalidate(user_id)
+    return db_timeline
 
 async def update_timeline(
     db: AsyncSession,
@@ -47,7 +78,7 @@ async def update_timeline(
     
     db.add(timeline)
     await db.commit()
-    await db.refresh(timeline)
+    await timeline_cache.invalidate(timeline.user_id)
     return timeline
 
 async def delete_timeline(
@@ -64,6 +95,7 @@ async def delete_timeline(
     if timeline:
         await db.delete(timeline)
         await db.commit()
+        await timeline_cache.invalidate(user_id)
     
     return timeline
 
@@ -87,14 +119,11 @@ async def create_timeline_item(
         **item_in.model_dump(),
         timeline_id=timeline_id
     )
+    # Resolve a foto antes do INSERT (usa o identity map quando já carregada)
+    db_item.photo = await db.get(Photo, item_in.photo_id) if item_in.photo_id else None
     db.add(db_item)
     await db.commit()
-    await db.refresh(db_item)
-
-    if item_in.photo_id:
-        photo = await photo_crud.get_photo(db=db, photo_id=item_in.photo_id)
-        db_item.photo = photo
-
+    await timeline_cache.invalidate_owner(db, Timeline, timeline_id)
     return db_item
 
 async def update_timeline_item(
@@ -116,21 +145,20 @@ async def update_timeline_item(
     for field, value in update_data.items():
         setattr(item, field, value)
 
+    if 'photo_id' in update_data:
+        item.photo = await db.get(Photo, item.photo_id) if item.photo_id else None
+
     db.add(item)
     await db.commit()
-    await db.refresh(item)
-
-    if item_in.photo_id:
-        photo = await photo_crud.get_photo(db=db, photo_id=item_in.photo_id)
-        item.photo = photo
+    await timeline_cache.invalidate_owner(db, Timeline, item.timeline_id)
     return item
 
 async def delete_timeline_item(db: AsyncSession, item_id: int) -> Optional[TimelineItem]:
     item = await get_timeline_item(db=db, item_id=item_id)
     if item:
+        # A foto já vem carregada por get_timeline_item
         await db.delete(item)
         await db.commit()
-        if item.photo_id:
-           item.photo = await photo_crud.get_photo(db=db, photo_id=item.photo_id)
+        await timeline_cache.invalidate_owner(db, Timeline, item.timeline_id)
         return item
     return None 
\ No newline at end of file
@@ -2,8 +2,11 @@ from typing import List, Optional
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.auth.auth import get_password_hash, verify_password, create_access_token
+from app.auth.user_cache import invalidate_user
+from app.auth.revocation import revoked_tokens
+from app.crud.refresh_token import revoke_user_refresh_tokens
 from app.services.email import send_verification_email
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
@@ -29,29 +32,40 @@ async def get_user_with_configuration_by_id(db: AsyncSession, user_id: int) -> O
 async def create_user(db: AsyncSession, user_in: UserCreate) -> User:
     db_user = User(
         email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await get_password_hash(user_in.password),
         full_name=user_in.full_name,
         is_superuser=user_in.is_superuser,
     )
     db.add(db_user)
     await db.commit()
-    await db.refresh(db_user)
     return db_user
 
 async def send_new_account_email(email_to: str, name: str):
     # O token de confirmação pode ter uma vida útil curta
     expires_delta = timedelta(hours=1)
-    token = create_access_token(data={"sub": email_to}, expires_delta=expires_delta)
+    token = create_access_token(data={"sub": email_to, "typ": "email_confirmation"}, expires_delta=expires_delta)
     await send_verification_email(email_to=email_to, token=token, name=name)
 
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     user = await get_user_by_email(db=db, email=email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
     return user
 
+async def _revoke_user_sessions(db: AsyncSession, user: User) -> None:
+    """
+    Invalida imediatamente os tokens já emitidos para o usuário (access, refresh, confirmação e
+    redefinição de senha) e grava as demais alterações pendentes no usuário.
+    O corte é truncado ao segundo, a resolução do iat: um login feito logo em seguida continua válido.
+    """
+    user.tokens_valid_after = datetime.now(timezone.utc).replace(microsecond=0)
+    await db.commit()
+    invalidate_user(user.email)
+    revoked_tokens.revoke_user(user.id, user.tokens_valid_after.timestamp())
+    await revoke_user_refresh_tokens(db, user.id)
+
 async def deactivate_user(db: AsyncSession, username: str) -> Optional[User]:
     user = await get_user_by_email(db=db, email=username)
     if not user:
@@ -62,29 +76,42 @@ async def deactivate_user(db: AsyncSession, username: str) -> Optional[User]:
         return None
     
     user.is_active = False
-    await db.commit()
-    db.refresh(user)
+    await _revoke_user_sessions(db, user)
     return user 
 
 async def confirm_email(db: AsyncSession, user: User) -> User:
     user.email_confirmed = True
     await db.commit()
-    await db.refresh(user)
+    invalidate_user(user.email)
+    return user
+
+async def update_user_password(db: AsyncSession, user: User, new_password: str) -> User:
+    user.hashed_password = await get_password_hash(new_password)
+    # Sessões abertas com a senha antiga (e o próprio token de redefinição) deixam de valer
+    await _revoke_user_sessions(db, user)
     return user
 
 async def update_user_by_id(db: AsyncSession, user_id: int, user_in: UserUpdate) -> Optional[User]:
     user = await get_user_by_id(db, user_id)
     if not user:
         return None
+    previous_email = user.email
+    password_changed = False
     
     for field, value in user_in.model_dump(exclude_unset=True).items():
         if field == "password" and value:
-            setattr(user, "hashed_password", get_password_hash(value))
+            setattr(user, "hashed_password", await get_password_hash(value))
+            password_changed = True
         elif value is not None:
             setattr(user, field, value)
 
-    await db.commit()
-    await db.refresh(user)
+    if password_changed:
+        # Mesma regra de update_user_password: sessões abertas com a senha antiga deixam de valer
+        await _revoke_user_sessions(db, user)
+    else:
+        await db.commit()
+        invalidate_user(user.email)
+    invalidate_user(previous_email)
     return user
 
 
@@ -97,5 +124,6 @@ async def delete_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     
     await db.delete(user)
     await db.commit()
+    invalidate_user(user.email)
     return user
 
@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import guest as guest_crud
+from app.crud import invitation as invitation_crud
+from app.crud import gift_shop as gift_shop_crud
+from app.crud import photo_challenge as challenge_crud
+from app.crud import timeline as timeline_crud
+from app.crud import schedule as schedule_crud
+from app.crud import menu as menu_crud
+from app.db.session import sibling_session_maker
+from app.models.guest import Guest
+from app.models.gift_shop import GiftShop, GiftProduct, GiftShopPurchase
+from app.schemas.invitation import GuestInvitationResponse
+from app.schemas.gift_shop import GiftShopWithProducts
+from app.schemas.timeline import Timeline
+from app.schemas.schedule import Schedule
+from app.schemas.menu import MenuResponse
+from app.schemas.wedding import WeddingBundle, WeddingGuestOverlay, GuestOverlayGuest, GuestOverlayPurchase
+
+async def _invitation_section(db: AsyncSession, guest: Guest) -> Optional[GuestInvitationResponse]:
+    invitation = await invitation_crud.get_invitation_cached(db=db, user_id=guest.user_id)
+    if not invitation:
+        return None
+    return GuestInvitationResponse(guest=guest, invitation=invitation)
+
+async def _gift_shop_section(db: AsyncSession, guest: Guest) -> Optional[GiftShopWithProducts]:
+    shop = await gift_shop_crud.get_gift_shop_with_purchases(db=db, user_id=guest.user_id)
+    return GiftShopWithProducts.model_validate(shop, from_attributes=True) if shop else None
+
+async def _challenge_section(db: AsyncSession, guest: Guest):
+    challenge_id = await challenge_crud.get_photo_challenge_id_by_user(db=db, user_id=guest.user_id)
+    if not challenge_id:
+        return None
+    return await challenge_crud.get_challenge_summary_by_guest(db=db, guest_id=guest.id, challenge_id=challenge_id)
+
+async def _timeline_section(db: AsyncSession, guest: Guest) -> Optional[Timeline]:
+    return await timeline_crud.get_user_timeline_cached(db=db, user_id=guest.user_id)
+
+async def _schedule_section(db: AsyncSession, guest: Guest) -> Optional[Schedule]:
+    return await schedule_crud.get_schedule_cached(db=db, user_id=guest.user_id)
+
+async def _menus_section(db: AsyncSession, guest: Guest) -> List[MenuResponse]:
+    return await menu_crud.get_user_menus_cached(db=db, user_id=guest.user_id)
+
+# Nome da seção (campo de WeddingBundle) -> função que a monta a partir do convidado
+WEDDING_SECTIONS: Dict[str, Callable[[AsyncSession, Guest], Awaitable[Any]]] = {
+    "invitation": _invitation_section,
+    "gift_shop": _gift_shop_section,
+    "challenge": _challenge_section,
+    "timeline": _timeline_section,
+    "schedule": _schedule_section,
+    "menus": _menus_section,
+}
+
+async def get_wedding_bundle(
+    db: AsyncSession,
+    hash_link: str,
+    sections: Iterable[str]
+) -> Optional[WeddingBundle]:
+    """
+    Monta a página do convidado: resolve o hash_link uma única vez e busca as seções pedidas
+    em paralelo, cada uma na sua sessão (no mesmo banco de `db`), limitado a
+    WEDDING_BUNDLE_MAX_PARALLEL conexões por requisição. Retorna None se o convidado não existir.
+    """
+    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=hash_link)
+    if not guest:
+        return None
+
+    session_maker = sibling_session_maker(db)
+    semaphore = asyncio.Semaphore(max(1, settings.WEDDING_BUNDLE_MAX_PARALLEL))
+
+    async def load(name: str) -> Any:
+        async with semaphore:
+            async with session_maker() as session:
+                return await WEDDING_SECTIONS[name](session, guest)
+
+    names = list(dict.fromkeys(sections))
+    results = await asyncio.gather(*(load(name) for name in names))
+    return WeddingBundle(**dict(zip(names, results)))
+
+async def get_guest_overlay(db: AsyncSession, hash_link: str) -> Optional[WeddingGuestOverlay]:
+    """
+    Dados do convidado que não entram no snapshot do casamento: nome, confirmação e as compras
+    da loja (marcando as dele). Duas consultas leves, sem carregar o agregado da loja.
+    """
+    result = await db.execute(
+        select(Guest.id, Guest.name, Guest.confirmed, Guest.user_id).where(Guest.hash_link == hash_link)
+    )
+    guest = result.one_or_none()
+    if guest is None:
+        return None
+
+    purchases = await db.execute(
+        select(
+            GiftShopPurchase.id,
+            GiftShopPurchase.product_id,
+            GiftShopPurchase.created_at,
+            GiftShopPurchase.paid,
+            GiftShopPurchase.paid_at,
+            (GiftShopPurchase.guest_id == guest.id).label("mine"),
+        )
+        .join(GiftProduct, GiftProduct.id == GiftShopPurchase.product_id)
+        .join(GiftShop, GiftShop.id == GiftProduct.shop_id)
+        .where(GiftShop.user_id == guest.user_id)
+        .order_by(GiftShopPurchase.id)
+    )
+    return WeddingGuestOverlay(
+        guest=GuestOverlayGuest.model_validate(guest, from_attributes=True),
+        purchases=[GuestOverlayPurchase.model_validate(row, from_attributes=True) for row in purchases]
+    )
@@ -12,6 +12,9 @@ from app.models.photo_challenge import PhotoChallenge, ChallengeTask, CompletedC
 from app.models.schedule import Schedule, ScheduleItem  # noqa
 from app.models.configuration import Configuration  # noqa
 from app.models.menu import Menu, MenuItem  # noqa
+from app.models.revoked_token import RevokedToken  # noqa
+from app.models.refresh_token import RefreshToken  # noqa
+from app.models.wedding_snapshot import WeddingSnapshot  # noqa
 
 # Todos os modelos devem ser importados aqui para que o Alembic possa detectá-los
 # O comentário noqa é usado para evitar warnings do linter sobre importações não utilizadas 
\ No newline at end of file
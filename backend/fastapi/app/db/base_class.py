@@ -1,3 +1,8 @@
 from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base() 
\ No newline at end of file
+class _Base:
+    # Busca os valores gerados pelo banco (server_default, onupdate, colunas computadas)
+    # no próprio INSERT/UPDATE via RETURNING, dispensando o refresh() depois do commit
+    __mapper_args__ = {"eager_defaults": True}
+
+Base = declarative_base(cls=_Base) # Import base class for SQLAlchemy
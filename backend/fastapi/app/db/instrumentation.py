@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_START_KEY = "instrumentation_start"
+
+# Chave em scope["state"] das estatísticas abertas pelo MetricsMiddleware para a requisição
+REQUEST_STATS_STATE_KEY = "query_stats"
+
+
+class QueryStats:
+    """
+    Estatísticas das consultas executadas dentro de um escopo (normalmente uma requisição).
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0  # segundos
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Consultas idênticas (mesmo SQL, parâmetros diferentes) executadas threshold vezes ou mais:
+        sinal típico de N+1.
+        """
+        return [(statement, total) for statement, total in self.statements.most_common() if total >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+# Observadores chamados ao fim de cada requisição instrumentada (usados pelo orçamento de consultas nos testes)
+_request_observers: List[Callable[[str, str, QueryStats], None]] = []
+
+
+def start_query_tracking() -> Tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_tracking(token: Token) -> None:
+    _current_stats.reset(token)
+
+
+def get_current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def add_request_observer(observer: Callable[[str, str, QueryStats], None]) -> None:
+    _request_observers.append(observer)
+
+
+def remove_request_observer(observer: Callable[[str, str, QueryStats], None]) -> None:
+    if observer in _request_observers:
+        _request_observers.remove(observer)
+
+
+def notify_request_observers(method: str, path: str, stats: QueryStats) -> None:
+    for observer in list(_request_observers):
+        observer(method, path, stats)
+
+
+def setup_query_instrumentation(engine: Engine) -> None:
+    """
+    Registra no engine (síncrono) a contagem de consultas e do tempo gasto no banco.
+    Só acumula quando há um QueryStats ativo no contexto (ver QueryInstrumentationMiddleware).
+    O SQLAlchemy propaga o contexto da task para o greenlet do driver, então o ContextVar é visível aqui.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        starts = conn.info.get(_START_KEY)
+        if stats is None or not starts:
+            return
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_KEY):
+            conn.info[_START_KEY].pop()
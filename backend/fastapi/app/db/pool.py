@@ -0,0 +1,73 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Limites (em ms) dos buckets do histograma de espera no checkout; o último bucket é +inf
+CHECKOUT_WAIT_BUCKETS_MS: List[float] = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool de conexões que mede quanto tempo cada checkout esperou por uma conexão livre.
+    Os contadores são acumulados em memória e expostos pelo endpoint interno de métricas.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self._wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS_MS) + 1)
+        self._wait_count = 0
+        self._wait_sum_ms = 0.0
+        self._timeouts = 0
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._wait_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            self._record_wait((time.perf_counter() - start) * 1000)
+
+    def _record_wait(self, elapsed_ms: float) -> None:
+        index = bisect_left(CHECKOUT_WAIT_BUCKETS_MS, elapsed_ms)
+        with self._wait_lock:
+            self._wait_buckets[index] += 1
+            self._wait_count += 1
+            self._wait_sum_ms += elapsed_ms
+
+    def stats(self) -> Dict[str, Any]:
+        with self._wait_lock:
+            buckets = list(self._wait_buckets)
+            count = self._wait_count
+            total_ms = self._wait_sum_ms
+            timeouts = self._timeouts
+
+        # Histograma cumulativo, no mesmo formato "le" usado pelo Prometheus
+        histogram = []
+        cumulative = 0
+        for bound, bucket_count in zip(CHECKOUT_WAIT_BUCKETS_MS + [float("inf")], buckets):
+            cumulative += bucket_count
+            histogram.append({"le": "+Inf" if bound == float("inf") else bound, "count": cumulative})
+
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeout_seconds": self._timeout,
+            "checkout_timeouts": timeouts,
+            "checkout_wait": {
+                "count": count,
+                "sum_ms": round(total_ms, 3),
+                "avg_ms": round(total_ms / count, 3) if count else 0.0,
+                "buckets": histogram,
+            },
+        }
@@ -0,0 +1,69 @@
+import logging
+import random
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_START_KEY = "query_logging_start"
+
+
+def _redact(parameters: Any) -> str:
+    """
+    Nunca escreve os valores dos parâmetros no log (podem conter senhas, telefones, tokens).
+    Registra apenas a quantidade para ajudar no diagnóstico.
+    """
+    if not parameters:
+        return "[]"
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return f"[{len(parameters)} conjuntos de parâmetros omitidos]"
+    return f"[{len(parameters)} parâmetros omitidos]"
+
+
+def setup_query_logging(engine: Engine) -> None:
+    """
+    Registra os eventos de log de SQL no engine (síncrono) de acordo com settings.SQL_LOG_MODE.
+    - off: nenhum evento é registrado, custo zero por consulta
+    - slow: registra consultas acima de SQL_SLOW_QUERY_MS
+    - sampled: registra 1 a cada SQL_LOG_SAMPLE_RATE consultas
+    """
+    mode = settings.SQL_LOG_MODE
+    if mode == "off":
+        return
+
+    slow_threshold = settings.SQL_SLOW_QUERY_MS / 1000
+    sample_rate = max(settings.SQL_LOG_SAMPLE_RATE, 1)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if mode == "sampled" and random.randrange(sample_rate) != 0:
+            return
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get(_START_KEY)
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if mode == "slow" and elapsed < slow_threshold:
+            return
+        logger.info(
+            "SQL %s (%.1f ms): %s %s",
+            "lenta" if mode == "slow" else "amostrada",
+            elapsed * 1000,
+            statement,
+            _redact(parameters),
+        )
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # Descarta o início pendente para não desalinhar a pilha em caso de erro
+        conn = exception_context.connection
+        if conn is not None and conn.info.get(_START_KEY):
+            conn.info[_START_KEY].pop()
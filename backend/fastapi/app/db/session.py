@@ -1,24 +1,158 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import logging
+import time
+from typing import AsyncGenerator, Dict, Optional
+from fastapi import Request
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker, AsyncEngine
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.instrumentation import setup_query_instrumentation
+from app.db.query_logging import setup_query_logging
+from app.core.tracing import setup_sql_tracing
 
-engine = create_async_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    pool_pre_ping=True,
-    echo=True
-)
+logger = logging.getLogger(__name__)
+
+def _create_engine(url: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        echo=False
+    )
+    setup_query_logging(new_engine.sync_engine)
+    # As métricas Prometheus também usam o tempo de banco por requisição
+    if settings.QUERY_INSTRUMENTATION_ENABLED or settings.METRICS_ENABLED:
+        setup_query_instrumentation(new_engine.sync_engine)
+    if settings.TRACING_ENABLED:
+        setup_sql_tracing(new_engine.sync_engine)
+    return new_engine
+
+def _create_session_maker(bind: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+async_session_maker = _create_session_maker(engine)
 
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+# Réplica de leitura (opcional). Sem DSN configurado, as leituras usam o primário.
+read_engine: Optional[AsyncEngine] = (
+    _create_engine(settings.SQLALCHEMY_READ_REPLICA_URI)
+    if settings.SQLALCHEMY_READ_REPLICA_URI else None
 )
+read_session_maker = _create_session_maker(read_engine) if read_engine else None
+
+# Parâmetros de rota que identificam o convidado nas rotas públicas
+GUEST_HASH_PARAMS = ("hash_link", "guest_hash", "guest_hash_link")
+
+# hash do convidado -> instante (monotonic) até quando suas leituras devem ir para o primário
+_recent_guest_writes: Dict[str, float] = {}
+_replica_down_until = 0.0
+
+def is_replica_session(db: AsyncSession) -> bool:
+    """Se a sessão lê da réplica (que pode estar atrasada em relação ao primário)."""
+    return read_engine is not None and db.bind is read_engine
+
+def sibling_session_maker(db: AsyncSession) -> async_sessionmaker:
+    """
+    Fábrica de sessões no mesmo banco (primário ou réplica) da sessão dada.
+    Uma AsyncSession não executa consultas em paralelo; cada consulta concorrente usa a sua.
+    """
+    if is_replica_session(db):
+        return read_session_maker
+    return async_session_maker
+
+def _guest_hash_from_request(request: Request) -> Optional[str]:
+    for param in GUEST_HASH_PARAMS:
+        value = request.path_params.get(param)
+        if value:
+            return value
+    return None
+
+def mark_guest_write(guest_hash: str) -> None:
+    """
+    Registra que o convidado acabou de alterar dados, para que as próximas leituras dele
+    não caiam na réplica antes dela receber a alteração (read-your-writes).
+    """
+    now = time.monotonic()
+    _recent_guest_writes[guest_hash] = now + settings.READ_YOUR_WRITES_SECONDS
+    # Limpeza preguiçosa para o mapa não crescer sem limite
+    if len(_recent_guest_writes) > 10000:
+        for key, until in list(_recent_guest_writes.items()):
+            if until <= now:
+                del _recent_guest_writes[key]
+
+def has_recent_guest_write(guest_hash: str) -> bool:
+    until = _recent_guest_writes.get(guest_hash)
+    if until is None:
+        return False
+    if until <= time.monotonic():
+        _recent_guest_writes.pop(guest_hash, None)
+        return False
+    return True
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close()
+
+async def get_guest_write_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sessão no primário para as rotas públicas em que o convidado altera dados.
+    Marca o convidado para que as leituras seguintes também usem o primário.
+    """
+    guest_hash = _guest_hash_from_request(request)
+    # Marca antes de executar: a limpeza das dependências só roda depois da resposta ser enviada
+    if guest_hash:
+        mark_guest_write(guest_hash)
+    async with async_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Sessão para rotas somente leitura. Usa a réplica quando configurada e disponível;
+    volta para o primário se a réplica falhar ou se o convidado alterou dados recentemente.
+    """
+    global _replica_down_until
+
+    guest_hash = _guest_hash_from_request(request)
+    use_replica = (
+        read_session_maker is not None
+        and time.monotonic() >= _replica_down_until
+        and not (guest_hash and has_recent_guest_write(guest_hash))
+    )
+
+    if use_replica:
+        session = read_session_maker()
+        try:
+            # Abre a conexão já aqui para detectar a réplica fora do ar antes da rota executar
+            await session.connection()
+        except (DBAPIError, PoolTimeoutError, OSError) as e:
+            logger.warning(f"Réplica de leitura indisponível, usando o primário: {str(e)}")
+            _replica_down_until = time.monotonic() + settings.READ_REPLICA_RETRY_SECONDS
+            await session.close()
+        else:
+            try:
+                yield session
+            finally:
+                await session.close()
+            return
+
+    async with async_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
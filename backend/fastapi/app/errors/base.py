@@ -10,6 +10,9 @@ class ErrorCode(str, Enum):
     ALREADY_EXISTS = "ALREADY_EXISTS"
     ACCESS_DENIED = "ACCESS_DENIED"
     INVALID_CONTENT = "INVALID_CONTENT"
+
+    # Códigos de erro 429 - Too Many Requests
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
     
     # Códigos de erro 500 - System Error
     DATABASE_ERROR = "DATABASE_ERROR"
@@ -78,6 +81,26 @@ class BusinessError(AppError):
             details=details
         )
 
+class RateLimitError(AppError):
+    """
+    Erro 429 - Muitas requisições
+    Use quando o cliente excede um limite de tentativas; informa o Retry-After em segundos
+    """
+    def __init__(
+        self,
+        error_code: ErrorCode,
+        message: str,
+        retry_after: int,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            error_code=error_code,
+            message=message,
+            details=details,
+            headers={"Retry-After": str(retry_after)}
+        )
+
 class SystemError(AppError):
     """
     Erro 500 - Erro do sistema
@@ -143,4 +166,13 @@ def create_access_denied_error(
         error_code=ErrorCode.ACCESS_DENIED,
         message=f"Acesso negado ao(à) {resource_type}",
         details=details
-    ) 
\ No newline at end of file
+    )
+
+def create_rate_limit_error(retry_after: int) -> RateLimitError:
+    """Cria um erro padronizado para excesso de tentativas"""
+    return RateLimitError(
+        error_code=ErrorCode.TOO_MANY_REQUESTS,
+        message="Muitas tentativas. Tente novamente mais tarde.",
+        retry_after=retry_after,
+        details={"retry_after": retry_after}
+    )
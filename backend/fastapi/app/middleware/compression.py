@@ -0,0 +1,205 @@
+import gzip
+import hashlib
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Dependência opcional: sem o pacote brotli, apenas gzip é oferecido
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende do ambiente
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/",
+    "application/javascript",
+    "image/svg+xml",
+)
+
+# (encoding, digest do corpo) -> corpo comprimido. Como a chave é o próprio conteúdo,
+# uma entrada nunca fica desatualizada: corpos diferentes geram chaves diferentes.
+compressed_body_cache: TTLCache[bytes] = TTLCache(
+    ttl_seconds=settings.COMPRESSION_CACHE_TTL_SECONDS,
+    max_size=settings.COMPRESSION_CACHE_MAX_ENTRIES
+)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Escolhe br ou gzip conforme o Accept-Encoding (respeitando q=0), preferindo br."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token.strip().lower()] = quality
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+    if brotli is not None and allowed("br"):
+        return "br"
+    if allowed("gzip"):
+        return "gzip"
+    return None
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level if level is not None else settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=level if level is not None else settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+class _StreamCompressor:
+    """Compressão incremental para respostas em streaming."""
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress = self._compressor.compress
+            self._flush = self._compressor.flush
+
+    def process(self, chunk: bytes, last: bool) -> bytes:
+        data = self._compress(chunk)
+        if last:
+            data += self._flush()
+        return data
+
+class CompressionMiddleware:
+    """
+    Comprime as respostas com brotli ou gzip, negociado pelo Accept-Encoding de cada requisição.
+
+    - Só comprime tipos textuais (JSON, texto, JS, SVG) acima de COMPRESSION_MIN_SIZE bytes.
+    - Sempre adiciona "Vary: Accept-Encoding" a esses tipos, para caches intermediários.
+    - Respostas marcadas como compartilháveis ("Cache-Control: public", em GET sem Authorization
+      e status 200, como o snapshot do casamento) têm os bytes comprimidos guardados em cache pelo
+      digest do corpo: o mesmo conteúdo servido a centenas de convidados é comprimido uma única
+      vez, com nível de compressão mais alto. As demais usam o nível normal e não ocupam o cache.
+    - Respostas em streaming são comprimidas de forma incremental.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        cacheable_request = scope["method"] == "GET" and "authorization" not in request_headers
+
+        start_message: Optional[Message] = None
+        compressor: Optional[_StreamCompressor] = None
+        bypass = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, bypass
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if not content_type.startswith(COMPRESSIBLE_TYPES):
+                    bypass = True
+                    await send(message)
+                    return
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if encoding is None or "content-encoding" in headers or "content-range" in headers:
+                    bypass = True
+                    await send(message)
+                    return
+                # Segura os headers até saber o tamanho do corpo
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or bypass:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is not None:
+                await send({
+                    "type": "http.response.body",
+                    "body": compressor.process(body, last=not more_body),
+                    "more_body": more_body,
+                })
+                return
+
+            if not more_body:
+                # Resposta completa em uma única mensagem (caso comum das rotas JSON)
+                await self._send_complete(start_message, body, encoding, cacheable_request, send)
+                return
+
+            # Streaming: comprime em partes, sem Content-Length
+            compressor = _StreamCompressor(encoding)
+            headers = MutableHeaders(scope=start_message)
+            headers["Content-Encoding"] = encoding
+            del headers["content-length"]
+            _tag_etag(headers, encoding)
+            await send(start_message)
+            await send({
+                "type": "http.response.body",
+                "body": compressor.process(body, last=False),
+                "more_body": True,
+            })
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_complete(
+        self,
+        start_message: Message,
+        body: bytes,
+        encoding: str,
+        cacheable_request: bool,
+        send: Send
+    ) -> None:
+        headers = MutableHeaders(scope=start_message)
+        if len(body) < settings.COMPRESSION_MIN_SIZE:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+            return
+
+        if cacheable_request and start_message["status"] == 200 and _is_shareable(headers):
+            key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+            compressed = compressed_body_cache.get(key)
+            if compressed is None:
+                # Comprimido uma vez e servido muitas: vale o nível mais alto
+                compressed = compress(body, encoding, level=_cache_level(encoding))
+                compressed_body_cache.set(key, compressed)
+        else:
+            compressed = compress(body, encoding)
+
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(compressed))
+        _tag_etag(headers, encoding)
+        await send(start_message)
+        await send({"type": "http.response.body", "body": compressed, "more_body": False})
+
+def _tag_etag(headers: MutableHeaders, encoding: str) -> None:
+    """
+    Um ETag forte identifica bytes exatos: a versão comprimida recebe um sufixo próprio
+    ("abc" -> "abc-br"), que app.core.etag ignora ao comparar o If-None-Match.
+    """
+    etag = headers.get("etag")
+    if etag and etag.startswith('"') and etag.endswith('"'):
+        headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+def _is_shareable(headers: MutableHeaders) -> bool:
+    """Só o que a rota marcou como público é igual para todos: o resto (ex.: dados de um convidado) não vai ao cache."""
+    directives = {part.strip().lower() for part in headers.get("cache-control", "").split(",")}
+    return "public" in directives
+
+def _cache_level(encoding: str) -> int:
+    return settings.COMPRESSION_CACHE_BROTLI_QUALITY if encoding == "br" else 9
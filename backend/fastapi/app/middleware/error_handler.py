@@ -1,82 +1,99 @@
-from typing import Callable, Dict, Any
-from fastapi import Request, Response, FastAPI
+from typing import Dict, Any
+from fastapi import Request, FastAPI
 from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import traceback
 import logging
 
 from app.errors.base import (
     AppError,
     ErrorCode,
-    BusinessError,
     SystemError,
     create_validation_error
 )
 
 logger = logging.getLogger(__name__)
 
-class ErrorHandlerMiddleware(BaseHTTPMiddleware):
+def build_error_response(exc: Exception) -> JSONResponse:
+    """
+    Converte uma exceção na resposta de erro padrão da aplicação.
+    Compartilhado entre o middleware e os exception handlers para manter o mesmo formato.
+    """
+    if isinstance(exc, AppError):
+        # Erros já formatados pela aplicação
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"detail": exc.detail},
+            headers=exc.headers
+        )
+    if isinstance(exc, ValidationError):
+        # Erros de validação do Pydantic
+        error = create_validation_error(
+            error_code=ErrorCode.INVALID_CONTENT,
+            message="Erro de validação dos dados",
+            validation_errors=format_validation_errors(exc.errors())
+        )
+    elif isinstance(exc, SQLAlchemyError):
+        # Erros de banco de dados
+        logger.error(f"Database error: {str(exc)}\n{traceback.format_exc()}")
+        error = SystemError(
+            error_code=ErrorCode.DATABASE_ERROR,
+            message="Erro interno do banco de dados",
+            details={"error": str(exc)} if not is_production() else None
+        )
+    elif isinstance(exc, ValueError):
+        # Erros de valor inválido
+        error = create_validation_error(
+            error_code=ErrorCode.INVALID_CONTENT,
+            message=str(exc),
+            validation_errors={"value": str(exc)}
+        )
+    else:
+        # Erros não tratados
+        logger.error(f"Unhandled error: {str(exc)}\n{traceback.format_exc()}")
+        error = SystemError(
+            error_code=ErrorCode.INTERNAL_SERVER_ERROR,
+            message="Erro interno do servidor",
+            details={"error": str(exc)} if not is_production() else None
+        )
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"detail": error.detail}
+    )
+
+class ErrorHandlerMiddleware:
     """
     Middleware para capturar e tratar todos os erros não tratados da aplicação.
+    Implementado como middleware ASGI puro: diferente do BaseHTTPMiddleware, não cria tarefas
+    nem streams intermediários por requisição e não interfere em respostas em streaming.
     """
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
-        except AppError as e:
-            # Erros já formatados pela aplicação
-            return JSONResponse(
-                status_code=e.status_code,
-                content={"detail": e.detail}
-            )
-        except ValidationError as e:
-            # Erros de validação do Pydantic
-            error = create_validation_error(
-                error_code=ErrorCode.INVALID_CONTENT,
-                message="Erro de validação dos dados",
-                validation_errors=format_validation_errors(e.errors())
-            )
-            return JSONResponse(
-                status_code=error.status_code,
-                content={"detail": error.detail}
-            )
-        except SQLAlchemyError as e:
-            # Erros de banco de dados
-            logger.error(f"Database error: {str(e)}\n{traceback.format_exc()}")
-            error = SystemError(
-                error_code=ErrorCode.DATABASE_ERROR,
-                message="Erro interno do banco de dados",
-                details={"error": str(e)} if not is_production() else None
-            )
-            return JSONResponse(
-                status_code=error.status_code,
-                content={"detail": error.detail}
-            )
-        except ValueError as e:
-            # Erros de valor inválido
-            error = create_validation_error(
-                error_code=ErrorCode.INVALID_CONTENT,
-                message=str(e),
-                validation_errors={"value": str(e)}
-            )
-            return JSONResponse(
-                status_code=error.status_code,
-                content={"detail": error.detail}
-            )
-        except Exception as e:
-            # Erros não tratados
-            logger.error(f"Unhandled error: {str(e)}\n{traceback.format_exc()}")
-            error = SystemError(
-                error_code=ErrorCode.INTERNAL_SERVER_ERROR,
-                message="Erro interno do servidor",
-                details={"error": str(e)} if not is_production() else None
-            )
-            return JSONResponse(
-                status_code=error.status_code,
-                content={"detail": error.detail}
-            )
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Depois que os headers foram enviados não é mais possível trocar a resposta
+            if response_started:
+                raise
+            response = build_error_response(exc)
+            await response(scope, receive, send)
 
 def register_error_handlers(app: FastAPI) -> None:
     """
@@ -106,63 +123,28 @@ def register_error_handlers(app: FastAPI) -> None:
         Handler para erros de validação do Pydantic.
         Converte os erros para nosso formato padrão.
         """
-        errors = format_validation_errors(exc.errors())
-        error = create_validation_error(
-            error_code=ErrorCode.INVALID_CONTENT,
-            message="Erro de validação dos dados",
-            validation_errors=errors
-        )
-        return JSONResponse(
-            status_code=error.status_code,
-            content={"detail": error.detail}
-        )
+        return build_error_response(exc)
 
     @app.exception_handler(ValueError)
     async def value_error_handler(request: Request, exc: ValueError):
         """
         Handler para erros de valor inválido.
         """
-        error = create_validation_error(
-            error_code=ErrorCode.INVALID_CONTENT,
-            message=str(exc),
-            validation_errors={"value": str(exc)}
-        )
-        return JSONResponse(
-            status_code=error.status_code,
-            content={"detail": error.detail}
-        )
+        return build_error_response(exc)
 
     @app.exception_handler(SQLAlchemyError)
     async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
         """
         Handler para erros do SQLAlchemy.
         """
-        logger.error(f"Database error: {str(exc)}\n{traceback.format_exc()}")
-        error = SystemError(
-            error_code=ErrorCode.DATABASE_ERROR,
-            message="Erro interno do banco de dados",
-            details={"error": str(exc)} if not is_production() else None
-        )
-        return JSONResponse(
-            status_code=error.status_code,
-            content={"detail": error.detail}
-        )
+        return build_error_response(exc)
 
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         """
         Handler para qualquer erro não tratado.
         """
-        logger.error(f"Unhandled error: {str(exc)}\n{traceback.format_exc()}")
-        error = SystemError(
-            error_code=ErrorCode.INTERNAL_SERVER_ERROR,
-            message="Erro interno do servidor",
-            details={"error": str(exc)} if not is_production() else None
-        )
-        return JSONResponse(
-            status_code=error.status_code,
-            content={"detail": error.detail}
-        )
+        return build_error_response(exc)
 
 def format_validation_errors(errors: list) -> Dict[str, Any]:
     """
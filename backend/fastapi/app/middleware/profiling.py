@@ -0,0 +1,58 @@
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth.auth import get_current_active_superuser, get_current_principal
+from app.core.profiling import PROFILE_FORMATS, PROFILE_HEADER, profile, profiler_busy, render_profile
+
+class ProfilingMiddleware:
+    """
+    Profiling de uma única requisição marcada com o header "X-Profile: speedscope" (ou "html").
+
+    Só vale para superusuários (mesma regra de get_current_active_superuser): para os demais,
+    ou se outro profiling estiver em andamento, o header é ignorado e a requisição segue normal.
+    A resposta da rota é descartada e substituída pelo arquivo do profiling; o status original
+    vai no header X-Profiled-Status.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        output_format = headers.get(PROFILE_HEADER, "").strip().lower()
+        if output_format not in PROFILE_FORMATS or profiler_busy() or not await _is_superuser(headers):
+            await self.app(scope, receive, send)
+            return
+        # Outro profiling pode ter começado durante a verificação do token; daqui até o profile()
+        # não há await, então esta checagem evita o 409 (que aqui, fora do ErrorHandlerMiddleware, viraria 500)
+        if profiler_busy():
+            await self.app(scope, receive, send)
+            return
+
+        profiled_status = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal profiled_status
+            if message["type"] == "http.response.start":
+                profiled_status = message["status"]
+
+        with profile(async_mode="enabled") as profiler:
+            await self.app(scope, receive, discard)
+
+        response = render_profile(profiler, output_format)
+        response.headers["X-Profiled-Status"] = str(profiled_status)
+        await response(scope, receive, send)
+
+async def _is_superuser(headers: Headers) -> bool:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        await get_current_active_superuser(await get_current_principal(token))
+    except HTTPException:
+        return False
+    return True
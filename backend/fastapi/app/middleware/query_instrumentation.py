@@ -0,0 +1,70 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.instrumentation import (
+    REQUEST_STATS_STATE_KEY,
+    start_query_tracking,
+    stop_query_tracking,
+    notify_request_observers
+)
+
+logger = logging.getLogger("app.queries")
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Conta as consultas e o tempo de banco de cada requisição.
+    Expõe os números no header Server-Timing (visível no DevTools do navegador),
+    registra em log e avisa quando a mesma consulta se repete muitas vezes (N+1).
+    Implementado como middleware ASGI puro para não interferir no streaming das respostas.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reaproveita só as estatísticas que o MetricsMiddleware abriu para esta requisição (marcadas
+        # no scope); qualquer outra no contexto pertence a outro escopo e não pode receber estas consultas
+        stats = scope.get("state", {}).get(REQUEST_STATS_STATE_KEY)
+        token = None
+        if stats is None:
+            stats, token = start_query_tracking()
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # O handler já terminou quando os headers são enviados
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", app;dur={elapsed_ms:.1f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                stop_query_tracking(token)
+            self._report(scope, stats, (time.perf_counter() - start) * 1000)
+
+    def _report(self, scope: Scope, stats, elapsed_ms: float) -> None:
+        method = scope.get("method", "")
+        path = scope.get("path", "")
+        logger.debug(
+            f"{method} {path}: {stats.count} consultas, {stats.duration * 1000:.1f} ms no banco, {elapsed_ms:.1f} ms no total"
+        )
+        for statement, total in stats.repeated(settings.QUERY_REPEAT_THRESHOLD):
+            logger.warning(
+                f"Possível N+1 em {method} {path}: consulta repetida {total}x na mesma requisição: {statement}"
+            )
+        notify_request_observers(method, path, stats)
@@ -0,0 +1,24 @@
+from typing import Any, Dict
+
+from starlette.types import Scope
+
+# Rótulo das requisições que não casaram com nenhuma rota (evita um rótulo por URL inválida)
+UNMATCHED_ROUTE = "unmatched"
+
+_templates: Dict[Any, str] = {}
+
+def route_template(scope: Scope) -> str:
+    """
+    Caminho com parâmetros da rota atendida ("/api/v1/guests/{guest_id}"), descoberto pelo
+    endpoint que o roteador grava no scope. Só é válido depois que a aplicação processou a requisição.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    if not _templates:
+        for route in scope["app"].routes:
+            path = getattr(route, "path", None)
+            route_endpoint = getattr(route, "endpoint", None)
+            if path and route_endpoint is not None:
+                _templates.setdefault(route_endpoint, path)
+    return _templates.get(endpoint, UNMATCHED_ROUTE)
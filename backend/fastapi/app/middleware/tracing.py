@@ -0,0 +1,41 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import tracing
+from app.middleware.routing import route_template
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+class TracingMiddleware:
+    """
+    Abre o span raiz de cada requisição (continuando um traceparent recebido) e devolve o
+    trace ID no header X-Trace-Id, para localizar no coletor o trace de uma reclamação
+    ("o upload trava"). Os spans do crud, do SQL, do S3 e do WhatsApp ficam abaixo dele.
+    """
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or tracing.get_tracer() is None:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracing.request_span(method, Headers(scope=scope)) as current:
+            trace_id = tracing.trace_id(current)
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    current.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        tracing.set_error(current, f"HTTP {message['status']}")
+                    if trace_id:
+                        MutableHeaders(scope=message)[TRACE_ID_HEADER] = trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = route_template(scope)
+                current.update_name(f"{method} {route}")
+                current.set_attribute("http.route", route)
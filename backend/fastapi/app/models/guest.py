@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Computed, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.sql import func
@@ -15,6 +15,10 @@ class Guest(Base):
     whatsapp_invite_id = Column(String, nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
+
+    # Colunas normalizadas para a busca (nome sem acento/caixa e telefone só com dígitos)
+    search_name = Column(String, Computed("lower(f_unaccent(name))", persisted=True))
+    search_phone = Column(String, Computed("regexp_replace(coalesce(phone, ''), '[^0-9]', '', 'g')", persisted=True))
     
     # Relacionamento com o usuário (dono do evento)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -27,4 +31,22 @@ class Guest(Base):
     completed_challenge_tasks = relationship("CompletedChallengeTask", back_populates="guest", cascade="all, delete-orphan") 
 
     # Relacionamento com as compras da loja de presentes
-    purchases = relationship("GiftShopPurchase", back_populates="guest", cascade="all, delete-orphan")
\ No newline at end of file
+    purchases = relationship("GiftShopPurchase", back_populates="guest", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Índice de ordenação da listagem paginada por cursor (lower(name), id) dentro do usuário
+        Index("ix_guests_user_id_lower_name_id", "user_id", func.lower(name), "id"),
+        # Índices trigram (pg_trgm) usados pela busca de convidados
+        Index(
+            "ix_guests_search_name_trgm",
+            "search_name",
+            postgresql_using="gin",
+            postgresql_ops={"search_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_guests_search_phone_trgm",
+            "search_phone",
+            postgresql_using="gin",
+            postgresql_ops={"search_phone": "gin_trgm_ops"},
+        ),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String
+from sqlalchemy.sql.sqltypes import TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    # jti do token revogado; a linha pode ser apagada depois de expires_at
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False, index=True)
+    revoked_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
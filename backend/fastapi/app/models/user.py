@@ -16,6 +16,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean(), default=True)
     is_superuser = Column(Boolean(), default=False)
+    # Tokens emitidos antes deste instante são rejeitados (ex.: após desativação)
+    tokens_valid_after = Column(TIMESTAMP(timezone=True), nullable=True)
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
 
@@ -49,4 +51,7 @@ class User(Base):
     # Relacionamentos
     menus = relationship("Menu", back_populates="user", cascade="all, delete-orphan")
 
+    # Refresh tokens emitidos no login
+    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+
 
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.sqltypes import TIMESTAMP
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+class WeddingSnapshot(Base):
+    __tablename__ = "wedding_snapshots"
+
+    # Um snapshot por casamento (usuário dono); reconstruído a cada edição do conteúdo público
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    content = Column(JSONB, nullable=False)
+    built_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
@@ -1,33 +1,44 @@
 from datetime import timedelta
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
 from app.auth.auth import (
+    Principal,
     create_access_token,
+    create_user_access_token,
     get_current_user,
+    get_current_principal,
     get_current_active_superuser,
-    update_access_token,
-    get_password_hash,
+    get_user_from_token,
+    oauth2_scheme,
     verify_password,
 )
-from app.core.config import settings
+from app.auth.throttle import client_ip, login_throttle
+from app.auth.revocation import revoke_token
+from app.auth.tokens import decode_access_token
 from app.crud import user as user_crud
+from app.crud import refresh_token as refresh_token_crud
 from app.db.session import get_db
 from app.schemas.user import User, UserCreate, ResetPassword, ResetPasswordLoggedUser
+from app.schemas.token import Token, RefreshTokenRequest
 from app.services.email import send_password_reset_email
 
 router = APIRouter()
 
-@router.post("/login/access-token", response_model=dict[str, str])
+@router.post("/login/access-token", response_model=Token)
 async def login_access_token(
+    request: Request,
     db: Session = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
+    # Reserva a tentativa (contada como falha) e rejeita antes de consultar o banco e rodar o bcrypt
+    attempt = await login_throttle.check(client_ip(request), form_data.username)
+
     user = await user_crud.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
@@ -35,18 +46,17 @@ async def login_access_token(
             detail="Email ou senha incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    elif not user.is_active:
+    await login_throttle.register_success(attempt)
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Usuário inativo"
         )
     
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     return {
-        "access_token": create_access_token(
-            data={"sub": user.email}, expires_delta=access_token_expires
-        ),
+        "access_token": create_user_access_token(user),
         "token_type": "bearer",
+        "refresh_token": await refresh_token_crud.issue_refresh_token(db, user.id),
     }
 
 @router.post("/register", response_model=User)
@@ -83,7 +93,8 @@ async def read_users_me(
 
 @router.post("/test-superuser", response_model=User)
 async def test_superuser(
-    current_user: User = Depends(get_current_active_superuser),
+    superuser: Principal = Depends(get_current_active_superuser),
+    current_user: User = Depends(get_current_user),
 ) -> Any:
     """
     Test superuser access
@@ -94,7 +105,7 @@ async def test_superuser(
 async def deactivate_user_route(
     username: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Desativa um usuário do sistema.
@@ -109,16 +120,43 @@ async def deactivate_user_route(
         )
     return user 
 
-@router.post("/refresh-token", response_model=dict[str, str])
+@router.post("/logout")
+async def logout(
+    data: Optional[RefreshTokenRequest] = None,
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+    current_user: Principal = Depends(get_current_principal),
+) -> Any:
+    """
+    Revoga o access token atual e, se informado, o refresh token da sessão.
+    """
+    payload = decode_access_token(token)
+    await revoke_token(db, payload["jti"], payload["exp"])
+    if data:
+        await refresh_token_crud.revoke_refresh_token(db, data.refresh_token)
+    return {"message": "Logout realizado com sucesso!"}
+
+@router.post("/refresh-token", response_model=Token)
 async def refresh_token(
-    new_token: str = Depends(update_access_token)
+    data: RefreshTokenRequest,
+    db: Session = Depends(get_db),
 ) -> Any:
     """
-    Refresh token.
+    Troca um refresh token por um novo access token e um novo refresh token (rotação).
+    Cada refresh token só pode ser usado uma vez.
     """
+    rotated = await refresh_token_crud.rotate_refresh_token(db, data.refresh_token)
+    if not rotated:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user, new_refresh_token = rotated
     return {
-        "access_token": new_token,
+        "access_token": create_user_access_token(user),
         "token_type": "bearer",
+        "refresh_token": new_refresh_token,
     }
 
 @router.get("/confirm-email/{token}")
@@ -129,7 +167,7 @@ async def confirm_email_route(
     """
     Confirm user email.
     """
-    user = await get_current_user(db, token)
+    user = await get_user_from_token(db, token, "email_confirmation")
 
     if not user:
         raise HTTPException(
@@ -153,7 +191,7 @@ async def recover_password(email: str, db: Session = Depends(get_db)):
     if user:
         # O token de redefinição pode ter uma vida útil curta, por exemplo, 1 hora
         password_reset_token = create_access_token(
-            data={"sub": user.email}, expires_delta=timedelta(hours=1)
+            data={"sub": user.email, "typ": "password_reset"}, expires_delta=timedelta(hours=1)
         )
         await send_password_reset_email(
             email_to=user.email, token=password_reset_token, name=user.full_name
@@ -169,7 +207,7 @@ async def reset_password(
     """
     Reset password
     """
-    user = await get_current_user(db, data.token)
+    user = await get_user_from_token(db, data.token, "password_reset")
 
     if not user:
         raise HTTPException(
@@ -177,9 +215,7 @@ async def reset_password(
             detail="Token de redefinição inválido ou expirado."
         )
 
-    hashed_password = get_password_hash(data.new_password)
-    user.hashed_password = hashed_password
-    await db.commit()
+    await user_crud.update_user_password(db, user, data.new_password)
 
     return {"message": "Senha atualizada com sucesso!"}
 
@@ -194,14 +230,12 @@ async def reset_password_logged_user(
     """
     user = current_user
 
-    if not verify_password(data.current_password, user.hashed_password):
+    if not await verify_password(data.current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Senha atual incorreta."
         )   
 
-    hashed_password = get_password_hash(data.new_password)
-    user.hashed_password = hashed_password
-    await db.commit()
+    await user_crud.update_user_password(db, user, data.new_password)
 
     return {"message": "Senha atualizada com sucesso!"}
\ No newline at end of file
@@ -8,8 +8,8 @@ from app.schemas.configuration import (
     ConfigurationUpdate,
     ConfigurationPublic
 )
-from app.models.user import User
-from app.auth.auth import get_db, get_current_user
+from app.auth.auth import get_db, get_current_principal, Principal
+from app.db.session import get_read_db
 
 router = APIRouter()
 
@@ -17,7 +17,7 @@ router = APIRouter()
 async def create_configuration(
     config_in: ConfigurationCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Cria uma nova configuração para o usuário.
@@ -36,7 +36,7 @@ async def create_configuration(
 @router.get("/configuration/me", response_model=Configuration)
 async def read_my_configuration(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recupera a configuração do usuário logado
@@ -52,12 +52,12 @@ async def read_my_configuration(
 @router.get("/configuration/{user_id}", response_model=ConfigurationPublic)
 async def read_user_configuration(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Recupera a configuração pública de um usuário específico
     """
-    config = await configuration_crud.get_user_configuration(db=db, user_id=user_id)
+    config = await configuration_crud.get_user_configuration_cached(db=db, user_id=user_id)
     if not config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -69,7 +69,7 @@ async def read_user_configuration(
 async def update_my_configuration(
     config_in: ConfigurationUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualiza a configuração do usuário logado.
@@ -84,7 +84,7 @@ async def update_my_configuration(
 @router.delete("/configuration/me", response_model=Configuration)
 async def delete_my_configuration(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Remove a configuração do usuário logado
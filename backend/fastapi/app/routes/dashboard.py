@@ -4,9 +4,9 @@ from sqlalchemy.orm import Session
 
 from app.crud.dashboard import get_guests_by_confirmation
 from app.schemas.dashboard import DashboardResponse, GuestMetrics
-from app.models.user import User
 from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_principal, Principal
+from app.core.responses import model_response
 
 router = APIRouter()
 
@@ -20,7 +20,7 @@ router = APIRouter()
 )
 async def read_dashboard(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Retorna os dados do dashboard para o usuário atual.
@@ -37,7 +37,7 @@ async def read_dashboard(
         user_id=current_user.id
     )
     
-    return DashboardResponse(
+    return model_response(DashboardResponse, DashboardResponse(
         metrics= GuestMetrics(
             total_guests=result["total"],
             confirmed_count=result["confirmed_count"],
@@ -46,4 +46,4 @@ async def read_dashboard(
         ),
         confirmed_guests=result["confirmed"],
         pending_guests=result["pending"]
-    ) 
\ No newline at end of file
+    )) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from typing import Any, List
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
 
@@ -16,9 +16,11 @@ from app.schemas.gift_shop import (
     GiftShopPurchase,
     GiftShopWithProducts
 )
-from app.models.user import User
-from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.db.session import get_db, get_read_db, get_guest_write_db
+from app.auth.auth import get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
+from app.core.responses import model_response
+from app.core.etag import make_etag, not_modified_response, set_etag
 from app.errors.base import (
     create_not_found_error,
     create_already_exists_error,
@@ -33,6 +35,7 @@ router = APIRouter()
 
 @router.post(
     "/",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftShopBase,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -45,7 +48,7 @@ router = APIRouter()
 async def create_gift_shop(
     shop_in: GiftShopCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Create new gift shop.
@@ -78,7 +81,7 @@ async def create_gift_shop(
 )
 async def read_gift_shop(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Get current user's gift shop.
@@ -93,6 +96,7 @@ async def read_gift_shop(
 
 @router.put(
     "/me",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftShop,
     responses={
         200: {"description": "Shop updated successfully"},
@@ -103,7 +107,7 @@ async def read_gift_shop(
 async def update_gift_shop(
     shop_in: GiftShopUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Update current user's gift shop.
@@ -124,6 +128,7 @@ async def update_gift_shop(
 
 @router.delete(
     "/me",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftShop,
     responses={
         200: {"description": "Shop deleted successfully"},
@@ -133,7 +138,7 @@ async def update_gift_shop(
 )
 async def delete_gift_shop(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Delete current user's gift shop.
@@ -152,6 +157,7 @@ async def delete_gift_shop(
 
 @router.post(
     "/me/products",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftProduct,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -164,7 +170,7 @@ async def delete_gift_shop(
 async def create_gift_product(
     product_in: GiftProductCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Create new product in current user's shop.
@@ -206,7 +212,7 @@ async def create_gift_product(
 )
 async def read_gift_products(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     List all products from current user's shop.
@@ -222,6 +228,7 @@ async def read_gift_products(
 
 @router.put(
     "/me/products/{product_id}",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftProduct,
     responses={
         200: {"description": "Product updated successfully"},
@@ -234,7 +241,7 @@ async def update_gift_product(
     product_id: int,
     product_in: GiftProductUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Update a specific product from current user's shop.
@@ -278,6 +285,7 @@ async def update_gift_product(
 
 @router.delete(
     "/me/products/{product_id}",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=GiftProduct,
     responses={
         200: {"description": "Product deleted successfully"},
@@ -288,7 +296,7 @@ async def update_gift_product(
 async def delete_gift_product(
     product_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Delete a specific product from current user's shop.
@@ -326,19 +334,36 @@ async def delete_gift_product(
     }
 )
 async def read_gift_shop_by_guest_hash(
+    request: Request,
     guest_hash: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Any:
     """
     Get gift shop by guest hash.
+
+    Answers 304 when If-None-Match matches the current version of the shop,
+    products and purchases, without loading them.
     """
+    version = await gift_shop_crud.get_gift_shop_version_by_guest_hash(db=db, guest_hash=guest_hash)
+    if not version:
+        raise create_not_found_error(
+            resource_type="Gift Shop",
+            resource_id=guest_hash
+        )
+    etag = make_etag("gift-shop", *version)
+    not_modified = not_modified_response(request, etag)
+    if not_modified:
+        return not_modified
+
     shop = await gift_shop_crud.get_gift_shop_by_guest_hash(db=db, guest_hash=guest_hash)
     if not shop:
         raise create_not_found_error(
             resource_type="Gift Shop",
             resource_id=guest_hash
         )
-    return shop
+    response = model_response(GiftShopWithProducts, shop)
+    set_etag(response, etag)
+    return response
 
 @router.get(
     "/purchase/{product_id}/guest/{guest_hash}",
@@ -352,7 +377,7 @@ async def read_gift_shop_by_guest_hash(
 async def purchase_gift_product(
     product_id: int,
     guest_hash: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_guest_write_db),
 ) -> Any:
     """
     Purchase a product from the gift shop.
@@ -372,7 +397,7 @@ async def update_gift_shop_purchase(
     product_id: int,
     guest_hash: str,
     is_paid: bool,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_guest_write_db),
 ) -> Any:
     """
     Update payment status of a gift shop purchase.
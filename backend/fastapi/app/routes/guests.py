@@ -1,21 +1,24 @@
 import logging
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.crud import guest as guest_crud
 from app.schemas.guest import Guest, GuestCreate, GuestStatistics, GuestUpdate
 from app.models.user import User
-from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.db.session import get_db, get_guest_write_db
+from app.auth.auth import get_current_user, get_current_principal, Principal
 
 router = APIRouter()
 
+# Tamanho máximo da página de GET /guests/me
+GUEST_PAGE_MAX_LIMIT = 500
+
 @router.post("/", response_model=Guest)
 async def create_guest(
     guest_in: GuestCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar novo convidado.
@@ -25,22 +28,49 @@ async def create_guest(
 
 @router.get("/me", response_model=List[Guest])
 async def read_user_guests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar convidados do usuário atual.
+    A próxima página é obtida enviando o valor do header X-Next-Cursor no parâmetro cursor;
+    o total (X-Total-Count) é calculado apenas na primeira página.
+    Valores de limit acima de GUEST_PAGE_MAX_LIMIT são reduzidos a ele.
+    """
+    limit = min(max(limit, 0), GUEST_PAGE_MAX_LIMIT)
+    guests, next_cursor = await guest_crud.get_guests_page(
+        db=db, user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if not cursor:
+        total = await guest_crud.count_guests_by_user(db=db, user_id=current_user.id)
+        response.headers["X-Total-Count"] = str(total)
+    return guests
+
+@router.get("/search", response_model=List[Guest])
+async def search_user_guests(
+    q: str = Query(..., min_length=1, max_length=100),
+    skip: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+) -> Any:
+    """
+    Buscar convidados do usuário atual por nome ou telefone.
     """
-    guests = await guest_crud.get_guests_by_user(db=db, user_id=current_user.id, skip=skip, limit=limit)
+    guests = await guest_crud.search_guests(db=db, user_id=current_user.id, query=q, skip=skip, limit=limit)
     return guests
 
 @router.get("/{guest_id}", response_model=Guest)
 async def read_guest(
     guest_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar um convidado específico.
@@ -57,7 +87,7 @@ async def update_guest(
     guest_id: int,
     guest_in: GuestUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um convidado.
@@ -75,7 +105,7 @@ async def update_guest(
 async def delete_guest(
     guest_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um convidado.
@@ -88,7 +118,7 @@ async def delete_guest(
 @router.post("/confirm/{hash_link}", response_model=Guest)
 async def confirm_guest(
     hash_link: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_guest_write_db)
 ) -> Any:
     """
     Confirmar presença do convidado usando o hash_link.
@@ -129,7 +159,7 @@ async def send_reaction_all_guests_not_confirmed(
 @router.get("/statistics/me", response_model=GuestStatistics)
 async def get_statistics(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Obter estatísticas dos convidados.
@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.auth.auth import get_current_active_superuser, Principal
+from app.core.config import settings
+from app.core.profiling import profile, profiling_available, render_profile
+from app.db.session import engine
+from app.schemas.internal import PoolStatus, CacheStatus, EventLoopStatus
+from app.core.loop_monitor import loop_monitor
+from app.core.resource_cache import resource_cache
+from app.auth.user_cache import user_cache
+from app.crud.guest import guest_ref_cache
+from app.middleware.compression import compressed_body_cache
+from app.services.snapshot import wedding_snapshots
+
+router = APIRouter()
+
+@router.get("/metrics/db-pool", response_model=PoolStatus)
+async def read_db_pool_status(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    Estado do pool de conexões do banco (conexões em uso, ociosas, overflow)
+    e histograma do tempo de espera no checkout.
+    Apenas superusuários podem acessar esta rota.
+    """
+    return engine.pool.stats()
+
+@router.get("/metrics/cache", response_model=CacheStatus)
+async def read_cache_status(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    Taxa de acerto dos caches do processo: recursos dos noivos por (recurso, user_id),
+    usuários autenticados, hash dos convidados, corpos comprimidos e snapshots.
+    Apenas superusuários podem acessar esta rota.
+    """
+    return {
+        "resources": resource_cache.stats(),
+        "users": user_cache.stats(),
+        "guest_hashes": guest_ref_cache.stats(),
+        "compressed_bodies": compressed_body_cache.stats(),
+        "wedding_snapshots": wedding_snapshots.rendered.stats(),
+    }
+
+@router.get("/metrics/event-loop", response_model=EventLoopStatus)
+async def read_event_loop_status(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    Lag do event loop deste worker (percentis da janela recente) e quantas vezes ele ficou
+    bloqueado além de LOOP_BLOCK_THRESHOLD_SECONDS; as pilhas dos bloqueios ficam no log.
+    Apenas superusuários podem acessar esta rota.
+    """
+    return loop_monitor.stats()
+
+@router.get("/profile")
+async def profile_worker(
+    seconds: float = Query(10, gt=0, le=settings.PROFILING_MAX_SECONDS),
+    format: str = Query("speedscope", pattern="^(speedscope|html)$"),
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    Amostra o event loop deste worker por `seconds` segundos, com o tráfego real, e devolve
+    um arquivo speedscope (JSON) ou o HTML do pyinstrument.
+    Rotas síncronas executam no threadpool e não aparecem; para uma requisição específica
+    use o header "X-Profile: speedscope" nela.
+    Apenas superusuários podem acessar esta rota.
+    """
+    if not profiling_available():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Profiler indisponível: instale o pacote pyinstrument e habilite PROFILING_ENABLED"
+        )
+    with profile(async_mode="disabled") as profiler:
+        await asyncio.sleep(seconds)
+    return render_profile(profiler, format)
@@ -1,6 +1,6 @@
 import logging
 from typing import Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
 from app.crud import invitation as invitation_crud
@@ -12,16 +12,18 @@ from app.schemas.invitation import (
     GuestInvitationResponse
 )
 from app.models.user import User
-from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.db.session import get_db, get_read_db
+from app.core.etag import make_etag, not_modified_response, set_etag
+from app.auth.auth import get_current_user, get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
 
 router = APIRouter()
 
-@router.post("/", response_model=Invitation)
+@router.post("/", response_model=Invitation, dependencies=[Depends(refresh_wedding_snapshot)])
 async def create_invitation(
     invitation_in: InvitationCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar novo convite.
@@ -43,7 +45,7 @@ async def create_invitation(
 @router.get("/me", response_model=Invitation)
 async def read_invitation(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar o convite do usuário atual.
@@ -56,11 +58,11 @@ async def read_invitation(
         )
     return invitation
 
-@router.put("/me", response_model=Invitation)
+@router.put("/me", response_model=Invitation, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_invitation(
     invitation_in: InvitationUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar o convite do usuário atual.
@@ -78,10 +80,10 @@ async def update_invitation(
     )
     return invitation
 
-@router.delete("/me", response_model=Invitation)
+@router.delete("/me", response_model=Invitation, dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_invitation(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar o convite do usuário atual.
@@ -96,15 +98,27 @@ async def delete_invitation(
 
 @router.get("/guest/{hash_link}", response_model=GuestInvitationResponse)
 async def get_guest_invitation(
+    request: Request,
+    response: Response,
     hash_link: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ) -> Any:
     """
     Recuperar o convite personalizado para um convidado específico.
     Esta é uma rota pública que não requer autenticação.
+
+    Responde 304 quando o If-None-Match corresponde à versão atual do convidado e do convite,
+    sem carregar o convite.
     """
+    version = await invitation_crud.get_guest_invitation_version(db=db, hash_link=hash_link)
+    if version:
+        etag = make_etag("guest-invitation", *version)
+        not_modified = not_modified_response(request, etag)
+        if not_modified:
+            return not_modified
+        set_etag(response, etag)
 
-    return await invitation_crud.get_guest_invitation(db=db, hash_link=hash_link) 
+    return await invitation_crud.get_guest_invitation(db=db, hash_link=hash_link)
 
 @router.post("/guest/{hash_link}/send_invitation")
 async def send_invitation(
@@ -7,18 +7,18 @@ from app.schemas.menu import (
     Menu, MenuCreate, MenuUpdate, MenuResponse,
     MenuItem, MenuItemCreate, MenuItemUpdate
 )
-from app.models.user import User
 from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
 
 router = APIRouter()
 
 # Rotas para Menu
-@router.post("/menus/", response_model=MenuResponse)
+@router.post("/menus/", response_model=MenuResponse, dependencies=[Depends(refresh_wedding_snapshot)])
 async def create_menu(
     menu_in: MenuCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar um novo cardápio.
@@ -31,7 +31,7 @@ async def read_user_menus(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar todos os cardápios do usuário atual.
@@ -48,7 +48,7 @@ async def read_user_menus(
 async def read_menu(
     menu_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar um cardápio específico.
@@ -60,12 +60,12 @@ async def read_menu(
         raise HTTPException(status_code=403, detail="Sem permissão para acessar este cardápio")
     return menu
 
-@router.put("/menus/{menu_id}", response_model=MenuResponse)
+@router.put("/menus/{menu_id}", response_model=MenuResponse, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_menu(
     menu_id: int,
     menu_in: MenuUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um cardápio.
@@ -79,11 +79,11 @@ async def update_menu(
     menu = await menu_crud.update_menu(db=db, menu=menu, menu_in=menu_in)
     return menu
 
-@router.delete("/menus/{menu_id}", response_model=Menu)
+@router.delete("/menus/{menu_id}", response_model=Menu, dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_menu(
     menu_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um cardápio.
@@ -94,12 +94,12 @@ async def delete_menu(
     return menu
 
 # Rotas para MenuItem
-@router.post("/menus/{menu_id}/items/", response_model=MenuItem)
+@router.post("/menus/{menu_id}/items/", response_model=MenuItem, dependencies=[Depends(refresh_wedding_snapshot)])
 async def create_menu_item(
     menu_id: int,
     item_in: MenuItemCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar um novo item no cardápio.
@@ -113,13 +113,13 @@ async def create_menu_item(
     item = await menu_crud.create_menu_item(db=db, menu_id=menu_id, item_in=item_in)
     return item
 
-@router.put("/menus/{menu_id}/items/{item_id}", response_model=MenuItem)
+@router.put("/menus/{menu_id}/items/{item_id}", response_model=MenuItem, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_menu_item(
     menu_id: int,
     item_id: int,
     item_in: MenuItemUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um item do cardápio.
@@ -137,12 +137,12 @@ async def update_menu_item(
     item = await menu_crud.update_menu_item(db=db, item=item, item_in=item_in)
     return item
 
-@router.delete("/menus/{menu_id}/items/{item_id}", response_model=MenuItem)
+@router.delete("/menus/{menu_id}/items/{item_id}", response_model=MenuItem, dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_menu_item(
     menu_id: int,
     item_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um item do cardápio.
@@ -15,10 +15,10 @@ from app.schemas.photo_challenge import (
     PhotoChallengeUpdate,
     ChallengeSummaryGuestResponse
 )
-from app.models.user import User
-from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.db.session import get_db, get_read_db, get_guest_write_db
+from app.auth.auth import get_current_principal, Principal
 from app.schemas.photo import PhotoCreate
+from app.core.responses import model_response
 
 router = APIRouter()
 
@@ -26,7 +26,7 @@ router = APIRouter()
 async def create_challenge(
     challenge_in: PhotoChallengeCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar um novo desafio fotográfico
@@ -45,7 +45,7 @@ async def create_challenge(
 @router.get("/", response_model=PhotoChallengeResponse)
 async def read_challenge(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Obter um desafio específico
@@ -61,7 +61,7 @@ async def read_challenge(
 async def update_challenge(
     challenge_in: PhotoChallengeUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um desafio específico
@@ -76,7 +76,7 @@ async def update_challenge(
 @router.delete("/", response_model=PhotoChallengeResponse)
 async def delete_challenge(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um desafio específico
@@ -92,14 +92,12 @@ async def delete_challenge(
 async def create_task(
     task_in: ChallengeTaskCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar uma nova tarefa para um desafio
     """
     challenge = await challenge_crud.get_photo_challenge_by_user(db=db, user_id=current_user.id)
-    print(f"Challenge: {challenge.__dict__}")
-    print(f"task_in: {task_in.__dict__}")
     if not challenge:
         raise HTTPException(status_code=404, detail="Desafio não encontrado")
     if challenge.user_id != current_user.id:
@@ -111,14 +109,14 @@ async def create_task(
         user_id=current_user.id
     )
 
-    return await challenge_crud.get_challenge_task(db=db, task_id=task.id)
+    return task
 
 @router.put("/task/{task_id}", response_model=ChallengeTaskResponse)
 async def update_task(
     task_id: int,
     task_in: ChallengeTaskCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar uma tarefa específica
@@ -136,7 +134,7 @@ async def update_task(
 async def get_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Obter uma tarefa específica
@@ -159,7 +157,7 @@ async def get_task(
 async def delete_task(
     task_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar uma tarefa específica
@@ -172,7 +170,7 @@ async def complete_task(
     guest_hash: str,
     task_id: int,
     photo_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_guest_write_db)
 ) -> Any:
     """
     Marcar uma tarefa como concluída
@@ -183,7 +181,7 @@ async def complete_task(
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     
     # Verificar se o convidado existe e pertence ao mesmo usuário do desafio
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -221,17 +219,15 @@ async def complete_task(
     if not completed_task:
         raise HTTPException(status_code=400, detail="Não foi possível completar a tarefa")
     
-    # Recarregar a tarefa para obter o status atualizado
-    updated_task = await challenge_crud.get_challenge_task(db=db, task_id=task_id)
-    updated_task.completed_tasks.append(completed_task)
-    return updated_task
+    # complete_challenge_task já adiciona o registro em task.completed_tasks
+    return task
 
 @router.post("/guest/{guest_hash}/task/{task_id}/with_photo/complete", response_model=ChallengeTaskResponse)
 async def complete_task(
     guest_hash: str,
     task_id: int,
     file: UploadFile,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_guest_write_db)
 ) -> Any:
     """
     Marcar uma tarefa como concluída
@@ -242,7 +238,7 @@ async def complete_task(
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     
     # Verificar se o convidado existe e pertence ao mesmo usuário do desafio
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -293,17 +289,15 @@ async def complete_task(
     if not completed_task:
         raise HTTPException(status_code=400, detail="Não foi possível completar a tarefa")
     
-    # Recarregar a tarefa para obter o status atualizado
-    updated_task = await challenge_crud.get_challenge_task(db=db, task_id=task_id)
-    updated_task.completed_tasks.append(completed_task)
-    return updated_task
+    # complete_challenge_task já adiciona o registro em task.completed_tasks
+    return task
 
 @router.put("/guest/{guest_hash}/task/{task_id}/photo_id/{photo_id}/complete", response_model=ChallengeTaskResponse)
 async def update_complete_task(
     guest_hash: str,
     task_id: int,
     photo_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_guest_write_db)
 ) -> Any:
     """
     Atualizar uma tarefa como concluída
@@ -314,7 +308,7 @@ async def update_complete_task(
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     
     # Verificar se o convidado existe e pertence ao mesmo usuário do desafio
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -341,43 +335,36 @@ async def update_complete_task(
     if not completed_task:
         raise HTTPException(status_code=400, detail="Tarefa não completada")
     
+    # completed_task é o mesmo objeto presente em task.completed_tasks (identity map)
     completed_task.photo_id = photo_id
     db.add(completed_task)
     await db.commit()
-    await db.refresh(completed_task)
-    
-    # Recarregar a tarefa para obter o status atualizado
-    updated_task = await challenge_crud.get_challenge_task(db=db, task_id=task_id)
-    return updated_task
+    return task
 
 @router.get("/guest/{guest_hash}/summary", response_model=ChallengeSummaryGuestResponse)
 async def get_guest_challenge_summary(
     guest_hash: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> Any:
     """
     Obter um resumo do desafio com tarefas concluídas e pendentes
     """
-    print(f"Guest hash: {guest_hash}")
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
-    print(f"Guest: {guest.__dict__}")
-    challenge = await challenge_crud.get_photo_challenge_by_user(db=db, user_id=guest.user_id)
-    if not challenge:
+    challenge_id = await challenge_crud.get_photo_challenge_id_by_user(db=db, user_id=guest.user_id)
+    if not challenge_id:
         raise HTTPException(status_code=404, detail="Desafio não encontrado")
-    print(f"Challenge: {challenge.__dict__}")
-    summary = await challenge_crud.get_challenge_summary_by_guest(db=db, guest_id=guest.id, challenge_id=challenge.id)
-    print(f"Summary: {summary.__dict__}")
+    summary = await challenge_crud.get_challenge_summary_by_guest(db=db, guest_id=guest.id, challenge_id=challenge_id)
     if not summary:
         raise HTTPException(status_code=404, detail="Não foi possível gerar o resumo do desafio")
     
-    return summary
+    return model_response(ChallengeSummaryGuestResponse, summary)
 
 @router.get("/summary", response_model=ChallengeSummaryResponse)
 async def get_challenge_summary(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Obter um resumo do desafio com tarefas concluídas e pendentes
@@ -392,4 +379,4 @@ async def get_challenge_summary(
     if not summary:
         raise HTTPException(status_code=404, detail="Não foi possível gerar o resumo do desafio")
     
-    return summary
+    return model_response(ChallengeSummaryResponse, summary)
@@ -6,10 +6,10 @@ from app.schemas.photo import (
     Photo, PhotoCreate, PhotoResponse, PhotoUpdate,
     PhotoAlbum, PhotoAlbumCreate, PhotoAlbumUpdate, PhotoAlbumResponse
 )
-from app.models.user import User
 from app.services.s3 import s3_service
-from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.db.session import get_db, get_read_db, get_guest_write_db
+from app.auth.auth import get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ router = APIRouter()
 async def create_photo(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Upload de foto pelo usuário
@@ -46,12 +46,12 @@ async def create_photo(
 async def create_guest_photo(
     guest_hash_link: str,
     file: UploadFile = File(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_guest_write_db),
 ) -> Any:
     """
     Upload de foto de um convidado
     """
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -83,7 +83,7 @@ async def read_user_photos(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar todas as fotos do usuário
@@ -107,7 +107,7 @@ async def read_user_photos(
 async def read_photo(
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar uma foto específica
@@ -132,12 +132,12 @@ async def read_guest_photo(
     guest_hash_link: str,
     album_id: int,
     photo_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Recuperar uma foto específica de um álbum de um convidado
     """
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -159,12 +159,12 @@ async def read_guest_photo(
         url=s3_service.generate_presigned_url(photo.s3_key)
     )
 
-@router.put("/photos/{photo_id}", response_model=Photo)
+@router.put("/photos/{photo_id}", response_model=Photo, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_photo(
     photo_id: int,
     photo_in: PhotoUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar uma foto
@@ -175,11 +175,11 @@ async def update_photo(
     
     return await photo_crud.update_photo(db=db, photo_id=photo_id, photo_in=photo_in)
 
-@router.delete("/photos/{photo_id}", response_model=Photo)
+@router.delete("/photos/{photo_id}", response_model=Photo, dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_photo(
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar uma foto
@@ -195,7 +195,7 @@ async def delete_photo(
 async def create_album(
     album_in: PhotoAlbumCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar um novo álbum
@@ -231,7 +231,7 @@ async def read_albums(
     skip: int = 0,
     limit: int = 100,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar todos os álbuns do usuário
@@ -269,7 +269,7 @@ async def read_albums(
 async def read_album(
     album_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar um álbum específico
@@ -295,7 +295,7 @@ async def update_album(
     album_id: int,
     album_in: PhotoAlbumUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um álbum
@@ -318,11 +318,11 @@ async def update_album(
         guest_name=guest_name
     )
 
-@router.delete("/albums/{album_id}", response_model=PhotoAlbum)
+@router.delete("/albums/{album_id}", response_model=PhotoAlbum, dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_album(
     album_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um álbum
@@ -337,7 +337,7 @@ async def add_photo_to_album(
     album_id: int,
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Adicionar uma foto a um álbum
@@ -358,12 +358,12 @@ async def add_photo_to_guest_album(
     guest_hash_link: str,
     album_id: int,
     photo_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_guest_write_db),
 ) -> Any:
     """
     Adicionar uma foto a um álbum de um convidado
     """
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -382,7 +382,7 @@ async def remove_photo_from_album(
     album_id: int,
     photo_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Remover uma foto de um álbum
@@ -403,12 +403,12 @@ async def remove_photo_from_guest_album(
     guest_hash_link: str,
     album_id: int,
     photo_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_guest_write_db),
 ) -> Any:
     """
     Remover uma foto de um álbum de um convidado
     """
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -426,13 +426,13 @@ async def remove_photo_from_guest_album(
 async def get_photo_album_info(
     photo_id: int,
     guest_hash_link: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Recuperar informações do álbum ao qual uma foto pertence
     """
     photo = await photo_crud.get_photo(db=db, photo_id=photo_id)
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not photo or not guest:
         raise HTTPException(status_code=404, detail="Foto ou convidado não encontrado")
     
@@ -459,12 +459,12 @@ async def get_photo_album_info(
 @router.get("/guests/{guest_hash_link}/albums/", response_model=List[PhotoAlbumResponse])
 async def read_guest_albums(
     guest_hash_link: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Recuperar todos os álbuns de fotos de um convidado específico pelo hash link
     """
-    guest = await guest_crud.get_guest_by_hash(db=db, hash_link=guest_hash_link)
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=guest_hash_link)
     if not guest:
         raise HTTPException(status_code=404, detail="Convidado não encontrado")
     
@@ -10,19 +10,19 @@ from app.schemas.schedule import (
     ScheduleItemInDB
 )
 from app.crud import schedule as schedule_crud
-from app.models.user import User
 from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
 
 
 router = APIRouter()
 
-@router.post("/", response_model=Schedule)
+@router.post("/", response_model=Schedule, dependencies=[Depends(refresh_wedding_snapshot)])
 async def create_schedule(
     *,
     db: AsyncSession = Depends(get_db),
     schedule_in: ScheduleCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Schedule:
     """
     Criar um novo cronograma.
@@ -38,7 +38,7 @@ async def create_schedule(
 @router.get("/", response_model=Schedule)
 async def read_schedule(
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Schedule:
     """
     Recuperar o cronograma do usuário.
@@ -48,12 +48,12 @@ async def read_schedule(
         raise HTTPException(status_code=404, detail="Cronograma não encontrado")
     return db_obj
 
-@router.put("/", response_model=Schedule)
+@router.put("/", response_model=Schedule, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_schedule(
     *,
     db: AsyncSession = Depends(get_db),
     schedule_in: ScheduleUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Schedule:
     """
     Atualizar o cronograma.
@@ -63,11 +63,11 @@ async def update_schedule(
         raise HTTPException(status_code=404, detail="Cronograma não encontrado")
     return await schedule_crud.update_schedule(db=db, db_obj=db_obj, obj_in=schedule_in)
 
-@router.delete("/")
+@router.delete("/", dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_schedule(
     *,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> dict:
     """
     Deletar o cronograma.
@@ -78,12 +78,12 @@ async def delete_schedule(
     await schedule_crud.delete_schedule(db=db, db_obj=db_obj)
     return {"message": "Cronograma deletado com sucesso"}
 
-@router.post("/items", response_model=ScheduleItemInDB)
+@router.post("/items", response_model=ScheduleItemInDB, dependencies=[Depends(refresh_wedding_snapshot)])
 async def create_schedule_item(
     *,
     db: AsyncSession = Depends(get_db),
     item_in: ScheduleItemCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> ScheduleItemInDB:
     """
     Adicionar um novo item ao cronograma.
@@ -93,13 +93,13 @@ async def create_schedule_item(
         raise HTTPException(status_code=404, detail="Cronograma não encontrado")
     return await schedule_crud.create_schedule_item(db=db, schedule_id=db_obj.id, obj_in=item_in)
 
-@router.put("/items/{item_id}", response_model=ScheduleItemInDB)
+@router.put("/items/{item_id}", response_model=ScheduleItemInDB, dependencies=[Depends(refresh_wedding_snapshot)])
 async def update_schedule_item(
     *,
     db: AsyncSession = Depends(get_db),
     item_id: int,
     item_in: ScheduleItemUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> ScheduleItemInDB:
     """
     Atualizar um item do cronograma.
@@ -114,12 +114,12 @@ async def update_schedule_item(
     
     return await schedule_crud.update_schedule_item(db=db, db_obj=item, obj_in=item_in)
 
-@router.delete("/items/{item_id}")
+@router.delete("/items/{item_id}", dependencies=[Depends(refresh_wedding_snapshot)])
 async def delete_schedule_item(
     *,
     db: AsyncSession = Depends(get_db),
     item_id: int,
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> dict:
     """
     Remover um item do cronograma.
@@ -1,5 +1,5 @@
 from typing import Any
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.orm import Session
 from pydantic import ValidationError
 
@@ -12,9 +12,10 @@ from app.schemas.timeline import (
     TimelineItemCreate,
     TimelineItemUpdate
 )
-from app.models.user import User
 from app.db.session import get_db
-from app.auth.auth import get_current_user
+from app.auth.auth import get_current_principal, Principal
+from app.services.snapshot import refresh_wedding_snapshot
+from app.core.etag import make_etag, not_modified_response, set_etag
 from app.errors.base import (
     ErrorCode,
     create_not_found_error,
@@ -28,6 +29,7 @@ router = APIRouter()
 
 @router.post(
     "/",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=Timeline,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -40,7 +42,7 @@ router = APIRouter()
 async def create_timeline(
     timeline_in: TimelineCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar nova timeline.
@@ -80,16 +82,27 @@ async def create_timeline(
     }
 )
 async def read_timeline(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Recuperar a timeline do usuário atual.
     
     Retorna:
     - Timeline com seus itens, ordenados conforme solicitado
+    - 304 se o If-None-Match corresponder à versão atual (sem carregar os itens)
     - 404 se a timeline não existir
     """
+    version = await timeline_crud.get_timeline_version(db=db, user_id=current_user.id)
+    if version:
+        etag = make_etag("timeline", *version)
+        not_modified = not_modified_response(request, etag, cache_control="private, no-cache")
+        if not_modified:
+            return not_modified
+        set_etag(response, etag, cache_control="private, no-cache")
+
     timeline = await timeline_crud.get_user_timeline(
         db=db, 
         user_id=current_user.id,
@@ -105,6 +118,7 @@ async def read_timeline(
 
 @router.put(
     "/me",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=Timeline,
     responses={
         200: {"description": "Timeline atualizada com sucesso"},
@@ -116,7 +130,7 @@ async def read_timeline(
 async def update_timeline(
     timeline_in: TimelineUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar a timeline do usuário atual.
@@ -146,6 +160,7 @@ async def update_timeline(
 
 @router.delete(
     "/me",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=Timeline,
     responses={
         200: {"description": "Timeline deletada com sucesso"},
@@ -155,7 +170,7 @@ async def update_timeline(
 )
 async def delete_timeline(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar a timeline do usuário atual.
@@ -174,6 +189,7 @@ async def delete_timeline(
 
 @router.post(
     "/me/items",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=TimelineItem,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -186,7 +202,7 @@ async def delete_timeline(
 async def create_timeline_item(
     item_in: TimelineItemCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Criar novo item na timeline do usuário atual.
@@ -221,6 +237,7 @@ async def create_timeline_item(
 
 @router.put(
     "/me/items/{item_id}",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=TimelineItem,
     responses={
         200: {"description": "Item atualizado com sucesso"},
@@ -233,7 +250,7 @@ async def update_timeline_item(
     item_id: int,
     item_in: TimelineItemUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Atualizar um item específico da timeline do usuário atual.
@@ -280,6 +297,7 @@ async def update_timeline_item(
 
 @router.delete(
     "/me/items/{item_id}",
+    dependencies=[Depends(refresh_wedding_snapshot)],
     response_model=TimelineItem,
     responses={
         200: {"description": "Item deletado com sucesso"},
@@ -291,7 +309,7 @@ async def update_timeline_item(
 async def delete_timeline_item(
     item_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ) -> Any:
     """
     Deletar um item específico da timeline do usuário atual.
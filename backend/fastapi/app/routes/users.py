@@ -5,7 +5,7 @@ from sqlalchemy.orm import Session
 from app.crud import user as user_crud
 from app.schemas.user import User, UserCreate, UserUpdate
 from app.models.user import User as UserModel
-from app.auth.auth import get_db, get_current_user, get_current_active_superuser
+from app.auth.auth import get_db, get_current_user, get_current_active_superuser, Principal
 from app.schemas.configuration import Configuration
 from app.crud import configuration as configuration_crud
 
@@ -16,7 +16,7 @@ async def read_users(
     db: Session = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ) -> Any:
     """
     Recupera todos os usuários.
@@ -30,7 +30,7 @@ async def create_new_user(
     *,
     db: Session = Depends(get_db),
     user_in: UserCreate,
-    current_user: UserModel = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ) -> Any:
     """
     Cria um novo usuário.
@@ -76,7 +76,7 @@ async def update_user_me(
 @router.get("/{user_id}", response_model=User)
 async def read_user_by_id(
     user_id: int,
-    current_user: UserModel = Depends(get_current_active_superuser),
+    current_user: Principal = Depends(get_current_active_superuser),
     db: Session = Depends(get_db)
 ) -> Any:
     """
@@ -97,7 +97,7 @@ async def update_user(
     db: Session = Depends(get_db),
     user_id: int,
     user_in: UserUpdate,
-    current_user: UserModel = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ) -> Any:
     """
     Atualiza um usuário específico.
@@ -116,7 +116,7 @@ async def delete_user(
     *,
     db: Session = Depends(get_db),
     user_id: int,
-    current_user: UserModel = Depends(get_current_active_superuser)
+    current_user: Principal = Depends(get_current_active_superuser)
 ) -> Any:
     """
     Remove um usuário do sistema.
@@ -0,0 +1,104 @@
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import wedding as wedding_crud
+from app.crud import guest as guest_crud
+from app.schemas.wedding import WeddingBundle, WeddingSnapshotResponse, WeddingGuestOverlay
+from app.db.session import get_read_db
+from app.core.responses import model_response
+from app.core.etag import make_etag, not_modified_response, set_etag
+from app.services.snapshot import wedding_snapshots
+from app.errors.base import create_not_found_error, create_validation_error, ErrorCode
+
+router = APIRouter()
+
+@router.get(
+    "/guest/{hash_link}",
+    response_model=WeddingBundle,
+    responses={
+        200: {"description": "Página do convidado recuperada com sucesso"},
+        400: {"description": "Seção desconhecida"},
+        404: {"description": "Convidado não encontrado"}
+    }
+)
+async def get_wedding_for_guest(
+    hash_link: str,
+    sections: Optional[str] = Query(
+        None,
+        description="Seções separadas por vírgula (invitation, gift_shop, challenge, timeline, schedule, menus). Padrão: todas."
+    ),
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """
+    Tudo o que a página do convidado precisa em uma única requisição: convite, loja de presentes,
+    desafio de fotos, timeline, cronograma e cardápios. Rota pública.
+    """
+    if sections:
+        requested = [section.strip() for section in sections.split(",") if section.strip()]
+        unknown = [section for section in requested if section not in wedding_crud.WEDDING_SECTIONS]
+        if unknown:
+            raise create_validation_error(
+                error_code=ErrorCode.INVALID_CONTENT,
+                message="Seções desconhecidas",
+                validation_errors={"sections": unknown}
+            )
+    else:
+        requested = list(wedding_crud.WEDDING_SECTIONS)
+
+    bundle = await wedding_crud.get_wedding_bundle(db=db, hash_link=hash_link, sections=requested)
+    if not bundle:
+        raise create_not_found_error(resource_type="Convidado", resource_id=hash_link)
+    return model_response(WeddingBundle, bundle)
+
+@router.get(
+    "/guest/{hash_link}/snapshot",
+    response_model=WeddingSnapshotResponse,
+    responses={
+        200: {"description": "Snapshot do casamento recuperado com sucesso"},
+        304: {"description": "Snapshot não mudou desde o ETag informado"},
+        404: {"description": "Convidado não encontrado"}
+    }
+)
+async def get_wedding_snapshot(
+    request: Request,
+    hash_link: str,
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """
+    Conteúdo público do casamento (convite, loja, timeline, cronograma e cardápios), igual para
+    todos os convidados. Servido a partir do snapshot pré-calculado; complemente com /overlay.
+    """
+    guest = await guest_crud.resolve_guest_hash(db=db, hash_link=hash_link)
+    if not guest:
+        raise create_not_found_error(resource_type="Convidado", resource_id=hash_link)
+
+    snapshot = await wedding_snapshots.get(db, guest.user_id)
+    etag = make_etag("wedding-snapshot", guest.user_id, snapshot.version)
+    # public: o corpo é o mesmo para todos os convidados (o CompressionMiddleware o comprime uma vez só)
+    not_modified = not_modified_response(request, etag, cache_control="public, no-cache")
+    if not_modified:
+        return not_modified
+    response = Response(content=snapshot.body, media_type="application/json")
+    set_etag(response, etag, cache_control="public, no-cache")
+    return response
+
+@router.get(
+    "/guest/{hash_link}/overlay",
+    response_model=WeddingGuestOverlay,
+    responses={
+        200: {"description": "Dados do convidado recuperados com sucesso"},
+        404: {"description": "Convidado não encontrado"}
+    }
+)
+async def get_wedding_guest_overlay(
+    hash_link: str,
+    db: AsyncSession = Depends(get_read_db)
+) -> Any:
+    """
+    Dados do convidado que complementam o snapshot: nome, confirmação de presença e compras da loja.
+    """
+    overlay = await wedding_crud.get_guest_overlay(db=db, hash_link=hash_link)
+    if not overlay:
+        raise create_not_found_error(resource_type="Convidado", resource_id=hash_link)
+    return model_response(WeddingGuestOverlay, overlay)
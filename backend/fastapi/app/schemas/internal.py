@@ -0,0 +1,60 @@
+from typing import Dict, List, Union
+from pydantic import BaseModel
+
+class HistogramBucket(BaseModel):
+    le: Union[float, str]
+    count: int
+
+class PoolWaitHistogram(BaseModel):
+    count: int
+    sum_ms: float
+    avg_ms: float
+    buckets: List[HistogramBucket]
+
+class PoolStatus(BaseModel):
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    max_overflow: int
+    timeout_seconds: float
+    checkout_timeouts: int
+    checkout_wait: PoolWaitHistogram
+
+class TTLCacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+
+class ResourceCacheStats(BaseModel):
+    hits_local: int
+    hits_shared: int
+    misses: int
+    invalidations: int
+    errors: int
+    hit_rate: float
+
+class ResourceCacheStatus(BaseModel):
+    local: TTLCacheStats
+    shared_enabled: bool
+    resources: Dict[str, ResourceCacheStats]
+
+class CacheStatus(BaseModel):
+    resources: ResourceCacheStatus
+    users: TTLCacheStats
+    guest_hashes: TTLCacheStats
+    compressed_bodies: TTLCacheStats
+    wedding_snapshots: TTLCacheStats
+
+class EventLoopStatus(BaseModel):
+    running: bool
+    samples: int
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    blocked: int
+    block_threshold_ms: float
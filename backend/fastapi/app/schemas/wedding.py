@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.schemas.invitation import GuestInvitationResponse, Invitation
+from app.schemas.gift_shop import GiftShop, GiftShopWithProducts
+from app.schemas.photo_challenge import ChallengeSummaryGuestResponse
+from app.schemas.timeline import Timeline
+from app.schemas.schedule import Schedule
+from app.schemas.menu import MenuResponse
+
+class WeddingBundle(BaseModel):
+    """
+    Tudo o que a página do convidado precisa em uma única resposta.
+    Seções não solicitadas ou ainda não cadastradas pelos noivos vêm como null.
+    """
+    invitation: Optional[GuestInvitationResponse] = None
+    gift_shop: Optional[GiftShopWithProducts] = None
+    challenge: Optional[ChallengeSummaryGuestResponse] = None
+    timeline: Optional[Timeline] = None
+    schedule: Optional[Schedule] = None
+    menus: Optional[List[MenuResponse]] = None
+
+class WeddingSnapshotContent(BaseModel):
+    """Conteúdo público do casamento, igual para todos os convidados (sem dados de convidado)."""
+    invitation: Optional[Invitation] = None
+    gift_shop: Optional[GiftShop] = None
+    timeline: Optional[Timeline] = None
+    schedule: Optional[Schedule] = None
+    menus: List[MenuResponse] = []
+
+class WeddingSnapshotResponse(WeddingSnapshotContent):
+    version: int
+    built_at: datetime
+
+class GuestOverlayGuest(BaseModel):
+    id: int
+    name: str
+    confirmed: Optional[bool] = None
+
+    class Config:
+        from_attributes = True
+
+class GuestOverlayPurchase(BaseModel):
+    id: int
+    product_id: int
+    created_at: datetime
+    paid: Optional[bool] = None
+    paid_at: Optional[datetime] = None
+    mine: bool
+
+    class Config:
+        from_attributes = True
+
+class WeddingGuestOverlay(BaseModel):
+    """Parte do convidado que complementa o snapshot: nome, confirmação e compras da loja."""
+    guest: GuestOverlayGuest
+    purchases: List[GuestOverlayPurchase] = []
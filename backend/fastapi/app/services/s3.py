@@ -1,9 +1,12 @@
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from fastapi import HTTPException, UploadFile
 import uuid
 from datetime import datetime, timezone
 from app.core.config import settings
+from app.core.metrics import observe_external
+from app.core.tracing import span
 import logging
 
 class S3Service:
@@ -13,7 +16,10 @@ class S3Service:
                 's3',
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION
+                region_name=settings.AWS_REGION,
+                # Endpoints S3 compatíveis (servidor falso, MinIO) usam endereçamento por caminho
+                endpoint_url=settings.AWS_ENDPOINT_URL or None,
+                config=Config(s3={"addressing_style": "path"}) if settings.AWS_ENDPOINT_URL else None
             )
         except ClientError as e:
             logging.error(f"Erro ao criar cliente S3: {str(e)}")
@@ -25,7 +31,8 @@ class S3Service:
         Faz o upload de um arquivo para o S3
         """
         try:
-            self.s3_client.upload_fileobj(file_input.file, self.bucket_name, object_name)
+            with span("s3 upload_file", {"s3.bucket": self.bucket_name, "s3.key": object_name}), observe_external("s3", "upload_file"):
+                self.s3_client.upload_fileobj(file_input.file, self.bucket_name, object_name)
         except ClientError as e:
             logging.error(f"Erro ao fazer upload do arquivo para o S3: {str(e)}")
             return False
@@ -37,14 +44,15 @@ class S3Service:
         Gera uma URL pré-assinada para acessar um objeto no S3
         """
         try:
-            url = self.s3_client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': self.bucket_name,
-                    'Key': object_name
-                },
-                ExpiresIn=expiration
-            )
+            with span("s3 generate_presigned_url", {"s3.bucket": self.bucket_name, "s3.key": object_name}), observe_external("s3", "generate_presigned_url"):
+                url = self.s3_client.generate_presigned_url(
+                    'get_object',
+                    Params={
+                        'Bucket': self.bucket_name,
+                        'Key': object_name
+                    },
+                    ExpiresIn=expiration
+                )
             return url
         except ClientError as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -54,13 +62,14 @@ class S3Service:
         Gera uma URL pré-assinada para upload de arquivo
         """
         try:
-            response = self.s3_client.generate_presigned_post(
-                self.bucket_name,
-                object_name,
-                Fields=None,
-                Conditions=None,
-                ExpiresIn=expiration
-            )
+            with span("s3 generate_presigned_post", {"s3.bucket": self.bucket_name, "s3.key": object_name}), observe_external("s3", "generate_presigned_post"):
+                response = self.s3_client.generate_presigned_post(
+                    self.bucket_name,
+                    object_name,
+                    Fields=None,
+                    Conditions=None,
+                    ExpiresIn=expiration
+                )
             return response
         except ClientError as e:
             raise HTTPException(status_code=500, detail=str(e))
@@ -70,10 +79,11 @@ class S3Service:
         Deleta um arquivo do S3
         """
         try:
-            self.s3_client.delete_object(
-                Bucket=self.bucket_name,
-                Key=object_name
-            )
+            with span("s3 delete_object", {"s3.bucket": self.bucket_name, "s3.key": object_name}), observe_external("s3", "delete_object"):
+                self.s3_client.delete_object(
+                    Bucket=self.bucket_name,
+                    Key=object_name
+                )
         except ClientError as e:
             raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import time
+from typing import Dict, NamedTuple
+
+import orjson
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from fastapi import Depends
+
+from app.auth.auth import get_current_principal, Principal
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.crud import invitation as invitation_crud
+from app.crud import gift_shop as gift_shop_crud
+from app.crud import timeline as timeline_crud
+from app.crud import schedule as schedule_crud
+from app.crud import menu as menu_crud
+from app.db.session import async_session_maker
+from app.models.wedding_snapshot import WeddingSnapshot
+from app.schemas.wedding import WeddingSnapshotContent
+
+logger = logging.getLogger(__name__)
+
+class RenderedSnapshot(NamedTuple):
+    version: int
+    body: bytes
+
+async def build_snapshot_content(db: AsyncSession, user_id: int) -> dict:
+    """Carrega o conteúdo público do casamento e converte para JSON (sem dados de convidados)."""
+    content = WeddingSnapshotContent.model_validate({
+        "invitation": await invitation_crud.get_invitation(db=db, user_id=user_id),
+        "gift_shop": await gift_shop_crud.get_user_gift_shop(db=db, user_id=user_id),
+        "timeline": await timeline_crud.get_user_timeline(db=db, user_id=user_id),
+        "schedule": await schedule_crud.get_schedule(db=db, user_id=user_id),
+        "menus": await menu_crud.get_user_menus(db=db, user_id=user_id),
+    }, from_attributes=True)
+    return content.model_dump(mode="json")
+
+def _render(snapshot: WeddingSnapshot) -> RenderedSnapshot:
+    body = orjson.dumps({
+        "version": snapshot.version,
+        "built_at": snapshot.built_at.isoformat(),
+        **snapshot.content,
+    })
+    return RenderedSnapshot(version=snapshot.version, body=body)
+
+class WeddingSnapshotService:
+    """
+    Snapshot versionado do conteúdo público de cada casamento (convite, loja, timeline,
+    cronograma e cardápios), guardado em wedding_snapshots e servido como bytes prontos.
+
+    As edições dos noivos agendam a reconstrução com debounce: várias alterações seguidas
+    (ex.: cadastrar 20 produtos) geram um único rebuild, `delay` segundos após a última.
+    """
+    def __init__(self, session_maker: async_sessionmaker, delay: float, cache_ttl: float):
+        self.session_maker = session_maker
+        self.delay = delay
+        self.rendered: TTLCache[RenderedSnapshot] = TTLCache(ttl_seconds=cache_ttl, max_size=1000)
+        self._deadlines: Dict[int, float] = {}
+        self._tasks: Dict[int, asyncio.Task] = {}
+        # Rebuild disparado por leitura (snapshot ainda inexistente), compartilhado entre as requisições
+        self._building: Dict[int, asyncio.Future] = {}
+
+    def schedule_rebuild(self, user_id: int) -> None:
+        self._deadlines[user_id] = time.monotonic() + self.delay
+        if user_id not in self._tasks:
+            self._tasks[user_id] = asyncio.create_task(self._debounced_rebuild(user_id))
+
+    async def _debounced_rebuild(self, user_id: int) -> None:
+        try:
+            while True:
+                wait = self._deadlines[user_id] - time.monotonic()
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            del self._deadlines[user_id]
+            await self.rebuild(user_id)
+        except Exception as e:
+            logger.error(f"Erro ao reconstruir o snapshot do casamento {user_id}: {str(e)}")
+        finally:
+            self._tasks.pop(user_id, None)
+            # Edição feita durante o rebuild: agenda outro para não perdê-la
+            if user_id in self._deadlines:
+                self._tasks[user_id] = asyncio.create_task(self._debounced_rebuild(user_id))
+
+    async def rebuild(self, user_id: int) -> RenderedSnapshot:
+        """Reconstrói o snapshot no primário, incrementando a versão."""
+        async with self.session_maker() as db:
+            content = await build_snapshot_content(db, user_id)
+            stmt = insert(WeddingSnapshot).values(user_id=user_id, version=1, content=content)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[WeddingSnapshot.user_id],
+                set_={
+                    "version": WeddingSnapshot.version + 1,
+                    "content": stmt.excluded.content,
+                    "built_at": func.now(),
+                }
+            ).returning(WeddingSnapshot)
+            result = await db.execute(stmt, execution_options={"populate_existing": True})
+            snapshot = result.scalar_one()
+            await db.commit()
+
+        rendered = _render(snapshot)
+        self.rendered.set(user_id, rendered)
+        return rendered
+
+    async def get(self, db: AsyncSession, user_id: int) -> RenderedSnapshot:
+        """Snapshot pronto para enviar; constrói na primeira leitura se ainda não existir."""
+        rendered = self.rendered.get(user_id)
+        if rendered is not None:
+            return rendered
+        result = await db.execute(select(WeddingSnapshot).where(WeddingSnapshot.user_id == user_id))
+        snapshot = result.scalar_one_or_none()
+        if snapshot is None:
+            return await self._rebuild_once(user_id)
+        rendered = _render(snapshot)
+        self.rendered.set(user_id, rendered)
+        return rendered
+
+    async def _rebuild_once(self, user_id: int) -> RenderedSnapshot:
+        """
+        Um único rebuild em andamento por casamento: convidados que abrem a página ao mesmo
+        tempo aguardam o mesmo resultado. O shield impede que uma requisição cancelada
+        (cliente desconectou) cancele o rebuild dos demais.
+        """
+        future = self._building.get(user_id)
+        if future is None:
+            future = asyncio.ensure_future(self.rebuild(user_id))
+            self._building[user_id] = future
+            future.add_done_callback(lambda _: self._building.pop(user_id, None))
+        return await asyncio.shield(future)
+
+    async def flush(self) -> None:
+        """
+        No encerramento: executa já os rebuilds pendentes em vez de descartá-los.
+        Tarefas ainda no debounce são canceladas e reconstruídas aqui; as que já estão
+        reconstruindo (sem edição posterior) são aguardadas até o fim.
+        """
+        pending = list(self._deadlines)
+        self._deadlines.clear()
+        tasks = list(self._tasks.items())
+        for user_id, task in tasks:
+            if user_id in pending:
+                task.cancel()
+        await asyncio.gather(*(task for _, task in tasks), return_exceptions=True)
+        for user_id in pending:
+            try:
+                await self.rebuild(user_id)
+            except Exception as e:
+                logger.error(f"Erro ao reconstruir o snapshot do casamento {user_id}: {str(e)}")
+
+wedding_snapshots = WeddingSnapshotService(
+    session_maker=async_session_maker,
+    delay=settings.SNAPSHOT_REBUILD_DELAY_SECONDS,
+    cache_ttl=settings.SNAPSHOT_CACHE_TTL_SECONDS
+)
+
+async def refresh_wedding_snapshot(current_user: Principal = Depends(get_current_principal)):
+    """
+    Dependência das rotas em que os noivos editam o conteúdo público: depois que a rota
+    termina sem erro, agenda a reconstrução do snapshot do casamento.
+    """
+    yield
+    wedding_snapshots.schedule_rebuild(current_user.id)
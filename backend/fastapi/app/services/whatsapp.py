@@ -4,6 +4,10 @@ import httpx
 from fastapi import HTTPException
 from pydantic import BaseModel
 
+from app.core.config import settings
+from app.core.metrics import observe_external
+from app.core.tracing import span
+
 class WhatsAppMessageRequest(BaseModel):
     chatId: str
     text: str
@@ -18,8 +22,8 @@ class WhatsAppReactionRequest(BaseModel):
     session: str = "default"
 
 class WhatsAppService:
-    def __init__(self, base_url: str = "http://waha:3000"):
-        self.base_url = base_url
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or settings.WAHA_BASE_URL
         self.client = httpx.AsyncClient(timeout=30.0)
 
     async def send_message(
@@ -62,11 +66,12 @@ class WhatsAppService:
         )
 
         try:
-            response = await self.client.post(
-                f"{self.base_url}/api/sendText",
-                json=payload.model_dump()
-            )
-            response.raise_for_status()
+            with span("whatsapp send_text", {"whatsapp.session": session}), observe_external("whatsapp", "send_text"):
+                response = await self.client.post(
+                    f"{self.base_url}/api/sendText",
+                    json=payload.model_dump()
+                )
+                response.raise_for_status()
             return response.json()
 
         except httpx.HTTPError as e:
@@ -86,11 +91,12 @@ class WhatsAppService:
         )
         
         try:
-            response = await self.client.put(
-                f"{self.base_url}/api/reaction",
-                json=payload.model_dump()
-            )
-            response.raise_for_status()
+            with span("whatsapp reaction", {"whatsapp.session": session}), observe_external("whatsapp", "reaction"):
+                response = await self.client.put(
+                    f"{self.base_url}/api/reaction",
+                    json=payload.model_dump()
+                )
+                response.raise_for_status()
         except httpx.HTTPError as e:
             raise HTTPException(
                 status_code=500,
@@ -0,0 +1,65 @@
+"""
+Orçamento de consultas por rota para os testes.
+
+Uso (no conftest.py):
+
+    pytest_plugins = ["app.testing.query_budget"]
+
+    async def test_guest_summary(client, query_budget):
+        with query_budget(4):
+            await client.get("/api/v1/photo-challenge/guest/abc/summary")
+
+O bloco falha se alguma requisição feita dentro dele (ou as chamadas diretas ao banco)
+ultrapassar o número máximo de consultas, mostrando as consultas repetidas.
+"""
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import pytest
+
+from app.db.instrumentation import (
+    QueryStats,
+    add_request_observer,
+    remove_request_observer,
+    start_query_tracking,
+    stop_query_tracking
+)
+
+
+def _describe(stats: QueryStats) -> str:
+    lines = [f"{total}x {statement}" for statement, total in stats.statements.most_common()]
+    return "\n".join(lines)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, path: Optional[str] = None) -> Iterator[List[Tuple[str, QueryStats]]]:
+    """
+    Garante que cada requisição (opcionalmente apenas as do path informado) e as consultas
+    feitas diretamente no bloco não passem de max_queries.
+    """
+    requests: List[Tuple[str, QueryStats]] = []
+
+    def observer(method: str, request_path: str, stats: QueryStats) -> None:
+        if path is None or request_path == path:
+            requests.append((f"{method} {request_path}", stats))
+
+    add_request_observer(observer)
+    direct_stats, token = start_query_tracking()
+    try:
+        yield requests
+    finally:
+        stop_query_tracking(token)
+        remove_request_observer(observer)
+
+    for label, stats in requests:
+        assert stats.count <= max_queries, (
+            f"{label} executou {stats.count} consultas (orçamento: {max_queries}):\n{_describe(stats)}"
+        )
+    assert direct_stats.count <= max_queries, (
+        f"Bloco executou {direct_stats.count} consultas (orçamento: {max_queries}):\n{_describe(direct_stats)}"
+    )
+
+
+@pytest.fixture
+def query_budget():
+    return assert_query_budget
@@ -0,0 +1,118 @@
+"""
+Benchmark das escritas no CRUD: caminho antigo (commit -> refresh -> recarga do agregado)
+contra o caminho atual (INSERT/UPDATE ... RETURNING via eager_defaults, sem recarga).
+
+Roda contra o banco configurado no .env, criando um usuário temporário que é removido no final:
+
+    cd backend/fastapi
+    python -m benchmarks.crud_writes --iterations 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import delete
+
+from app.db.base import User, Timeline, TimelineItem, Invitation  # noqa: F401 (registra todos os modelos)
+from app.db.instrumentation import start_query_tracking, stop_query_tracking
+from app.db.session import async_session_maker, engine
+from app.crud import timeline as timeline_crud, invitation as invitation_crud
+from app.schemas.timeline import TimelineItemCreate
+from app.schemas.invitation import InvitationUpdate
+
+
+# Caminho antigo, reproduzido aqui apenas para comparação
+async def legacy_create_timeline_item(db, item_in: TimelineItemCreate, timeline_id: int) -> TimelineItem:
+    db_item = TimelineItem(**item_in.model_dump(), timeline_id=timeline_id)
+    db.add(db_item)
+    await db.commit()
+    await db.refresh(db_item)
+    return await timeline_crud.get_timeline_item(db=db, item_id=db_item.id)
+
+async def legacy_update_invitation(db, invitation: Invitation, invitation_in: InvitationUpdate) -> Invitation:
+    for field, value in invitation_in.model_dump(exclude_unset=True).items():
+        setattr(invitation, field, value)
+    db.add(invitation)
+    await db.commit()
+    await db.refresh(invitation)
+    return await invitation_crud.get_invitation(db=db, user_id=invitation.user_id)
+
+
+async def measure(label: str, iterations: int, operation: Callable[[int], Awaitable[None]]) -> None:
+    latencies: List[float] = []
+    statements: List[int] = []
+    for i in range(iterations):
+        stats, token = start_query_tracking()
+        start = time.perf_counter()
+        try:
+            await operation(i)
+        finally:
+            stop_query_tracking(token)
+        latencies.append((time.perf_counter() - start) * 1000)
+        statements.append(stats.count)
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(
+        f"{label:<40} p50={statistics.median(latencies):7.2f} ms  "
+        f"p95={p95:7.2f} ms  consultas/op={statistics.mean(statements):.1f}"
+    )
+
+
+async def main(iterations: int) -> None:
+    async with async_session_maker() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", hashed_password="x", full_name="Benchmark")
+        db.add(user)
+        await db.flush()
+        timeline = Timeline(title="Benchmark", user_id=user.id, items=[])
+        invitation = Invitation(intro_text="Benchmark", user_id=user.id)
+        db.add_all([timeline, invitation])
+        await db.commit()
+        user_id, timeline_id = user.id, timeline.id
+
+    item_in = TimelineItemCreate(title="Item", text="Texto", date="2025-05-29T14:30:00")
+
+    def run_in_session(coro_factory):
+        async def operation(i: int) -> None:
+            # Sessão nova por operação, como em uma requisição
+            async with async_session_maker() as db:
+                await coro_factory(db, i)
+        return operation
+
+    async def legacy_item(db, i):
+        await legacy_create_timeline_item(db, item_in, timeline_id)
+
+    async def current_item(db, i):
+        await timeline_crud.create_timeline_item(db=db, item_in=item_in, timeline_id=timeline_id)
+
+    async def legacy_invitation(db, i):
+        invitation = await invitation_crud.get_invitation(db=db, user_id=user_id)
+        await legacy_update_invitation(db, invitation, InvitationUpdate(intro_text=f"v{i}"))
+
+    async def current_invitation(db, i):
+        invitation = await invitation_crud.get_invitation(db=db, user_id=user_id)
+        await invitation_crud.update_invitation(db=db, invitation=invitation, invitation_in=InvitationUpdate(intro_text=f"v{i}"))
+
+    try:
+        await measure("create_timeline_item (antigo)", iterations, run_in_session(legacy_item))
+        await measure("create_timeline_item (atual)", iterations, run_in_session(current_item))
+        await measure("update_invitation (antigo)", iterations, run_in_session(legacy_invitation))
+        await measure("update_invitation (atual)", iterations, run_in_session(current_invitation))
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(TimelineItem).where(TimelineItem.timeline_id == timeline_id))
+            await db.execute(delete(Timeline).where(Timeline.id == timeline_id))
+            await db.execute(delete(Invitation).where(Invitation.user_id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
+            await db.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
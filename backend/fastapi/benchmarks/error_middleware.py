@@ -0,0 +1,117 @@
+"""
+Benchmark do ErrorHandlerMiddleware: implementação antiga (BaseHTTPMiddleware) contra a atual
+(ASGI puro), medindo requisições por segundo em uma rota trivial e em uma rota que levanta erro.
+
+Chama a aplicação ASGI diretamente, sem servidor nem rede, para isolar o custo do middleware:
+
+    cd backend/fastapi
+    python -m benchmarks.error_middleware --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+import time
+from typing import Callable
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.errors.base import create_not_found_error
+from app.middleware.error_handler import ErrorHandlerMiddleware, build_error_response
+
+
+# Implementação antiga, reproduzida aqui apenas para comparação
+class LegacyErrorHandlerMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next: Callable):
+        try:
+            return await call_next(request)
+        except Exception as e:
+            return build_error_response(e)
+
+
+def build_app(middleware_class) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware_class)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.get("/error")
+    async def error():
+        raise create_not_found_error("Recurso", 1)
+
+    @app.get("/crash")
+    async def crash():
+        raise RuntimeError("falha")
+
+    return app
+
+
+async def call(app: FastAPI, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    status = 0
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        # Como um servidor real: o corpo uma vez e, depois da resposta, o desconectar
+        # (a StreamingResponse do BaseHTTPMiddleware fica ouvindo o receive até lá)
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    await app(scope, receive, send)
+    return status
+
+
+async def measure(label: str, app: FastAPI, path: str, requests: int) -> None:
+    # Aquecimento
+    for _ in range(200):
+        await call(app, path)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {requests / elapsed:10.0f} req/s  ({elapsed / requests * 1e6:6.1f} µs/req)")
+
+
+async def main(requests: int) -> None:
+    # /crash registra o traceback a cada chamada; silencia para não medir o log
+    logging.getLogger("app.middleware.error_handler").disabled = True
+    legacy = build_app(LegacyErrorHandlerMiddleware)
+    current = build_app(ErrorHandlerMiddleware)
+    for path in ("/ping", "/error", "/crash"):
+        await measure(f"GET {path} (BaseHTTPMiddleware)", legacy, path, requests)
+        await measure(f"GET {path} (ASGI puro)", current, path, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
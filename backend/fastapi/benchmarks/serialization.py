@@ -0,0 +1,141 @@
+"""
+Benchmark da serialização das respostas mais pesadas (dashboard, loja de presentes com
+produtos e compras, resumo do desafio de fotos), comparando:
+
+- stdlib: model_dump(mode="json") + json.dumps (caminho padrão do FastAPI com response_model)
+- jsonable_encoder: jsonable_encoder + json.dumps (rotas sem response_model)
+- orjson: model_dump(mode="json") + orjson (FastJSONResponse com conteúdo já convertido)
+- model_dump_json: serialização direta do pydantic-core (FastJSONResponse/model_response)
+
+Não precisa de banco; os payloads são gerados em memória:
+
+    cd backend/fastapi
+    python -m benchmarks.serialization --size 500 --iterations 200
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import FastJSONResponse
+from app.schemas.dashboard import DashboardResponse
+from app.schemas.gift_shop import GiftShopWithProducts
+from app.schemas.photo_challenge import ChallengeSummaryResponse
+
+
+def build_dashboard(size: int) -> DashboardResponse:
+    guests = [
+        {
+            "id": i,
+            "name": f"Convidado {i}",
+            "phone": f"+55119{i:08d}",
+            "confirmed": i % 2 == 0,
+            "whatsapp_invite_id": f"true_5511{i:08d}@c.us_{i:020d}",
+            "hash_link": f"{i:016x}",
+            "user_id": 1,
+        }
+        for i in range(size)
+    ]
+    return DashboardResponse.model_validate({
+        "metrics": {
+            "total_guests": size,
+            "confirmed_count": size // 2,
+            "pending_count": size - size // 2,
+            "confirmation_rate": 50.0,
+        },
+        "confirmed_guests": guests[::2],
+        "pending_guests": guests[1::2],
+    })
+
+
+def build_gift_shop(size: int) -> GiftShopWithProducts:
+    now = datetime.now(timezone.utc)
+    return GiftShopWithProducts.model_validate({
+        "id": 1,
+        "user_id": 1,
+        "name": "Lista de presentes",
+        "products": [
+            {
+                "id": i,
+                "shop_id": 1,
+                "name": f"Produto {i}",
+                "description": "Descrição do produto " * 5,
+                "price": Decimal("199.90") + i,
+                "image": f"https://example.com/produto/{i}.jpg",
+                "purchases": [
+                    {"id": i * 10 + j, "created_at": now - timedelta(days=j), "paid": j % 2 == 0, "paid_at": now}
+                    for j in range(5)
+                ],
+            }
+            for i in range(size // 5 or 1)
+        ],
+    })
+
+
+def build_challenge_summary(size: int) -> ChallengeSummaryResponse:
+    now = datetime.now(timezone.utc)
+    tasks = [
+        {
+            "id": i,
+            "challenge_id": 1,
+            "title": f"Tarefa {i}",
+            "description": "Tire uma foto com os noivos",
+            "created_at": now,
+            "completed_tasks": [
+                {"completed_at": now, "guest": {"id": j, "name": f"Convidado {j}"}, "photo_id": i * 100 + j}
+                for j in range(10)
+            ],
+        }
+        for i in range(size // 10 or 1)
+    ]
+    return ChallengeSummaryResponse.model_validate({
+        "total_tasks": len(tasks),
+        "completed_tasks": len(tasks),
+        "pending_tasks": 0,
+        "completion_percentage": 100.0,
+        "tasks": tasks,
+        "guests_participation": [{"guest_id": j, "guest_name": f"Convidado {j}", "count": 3} for j in range(10)],
+    })
+
+
+def stdlib_render(content) -> bytes:
+    # Mesmos parâmetros do starlette.responses.JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def measure(label: str, iterations: int, render: Callable[[], bytes]) -> None:
+    timings: List[float] = []
+    size = len(render())
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"  {label:<20} mediana={statistics.median(timings):7.3f} ms  ({size / 1024:.0f} KiB)")
+
+
+def main(size: int, iterations: int) -> None:
+    payloads = {
+        "DashboardResponse": build_dashboard(size),
+        "GiftShopWithProducts": build_gift_shop(size),
+        "ChallengeSummaryResponse": build_challenge_summary(size),
+    }
+    json_response = FastJSONResponse(content=None)
+    for name, model in payloads.items():
+        print(name)
+        measure("stdlib", iterations, lambda: stdlib_render(model.model_dump(mode="json")))
+        measure("jsonable_encoder", iterations, lambda: stdlib_render(jsonable_encoder(model)))
+        measure("orjson", iterations, lambda: json_response.render(model.model_dump(mode="json")))
+        measure("model_dump_json", iterations, lambda: json_response.render(model))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500, help="quantidade de convidados/itens por payload")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    main(args.size, args.iterations)
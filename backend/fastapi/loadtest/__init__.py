@@ -0,0 +1,9 @@
+"""
+Testes de carga da API com dublês locais do S3 e do WAHA.
+
+    make loadtest-up      # postgres + S3 falso + WAHA falso + API
+    make loadtest         # cenários e relatório (throughput e p50/p95/p99 por requisição)
+    make loadtest-down
+
+Veja loadtest/run.py para as opções (usuários simultâneos, duração, baseline para comparação).
+"""
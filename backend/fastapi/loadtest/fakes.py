@@ -0,0 +1,113 @@
+"""
+Servidores falsos para os testes de carga, com latência configurável:
+
+- s3: aceita PutObject e DeleteObject com endereçamento por caminho (/<bucket>/<chave>),
+  descartando o conteúdo. Uploads multipart (arquivos acima de 8 MB no boto3) não são suportados.
+- waha: responde /api/sendText e /api/reaction como a API do WAHA.
+
+Ambos expõem GET /stats com a contagem de chamadas recebidas:
+
+    cd backend/fastapi
+    python -m loadtest.fakes s3 --port 9000 --latency-ms 40
+    python -m loadtest.fakes waha --port 3000 --latency-ms 150
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+import uuid
+from collections import Counter
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+
+class Latency:
+    """Atraso simulado: valor base mais uma variação uniforme de até `jitter` (em segundos)."""
+
+    def __init__(self, base_ms: float, jitter_ms: float):
+        self.base = base_ms / 1000
+        self.jitter = jitter_ms / 1000
+
+    async def wait(self) -> None:
+        delay = self.base + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def build_s3_app(latency: Latency) -> Starlette:
+    calls: Counter = Counter()
+    received_bytes = 0
+
+    async def put_object(request: Request) -> Response:
+        nonlocal received_bytes
+        body = await request.body()
+        received_bytes += len(body)
+        calls["PutObject"] += 1
+        await latency.wait()
+        return Response(status_code=200, headers={"ETag": f'"{hashlib.md5(body).hexdigest()}"'})
+
+    async def delete_object(request: Request) -> Response:
+        calls["DeleteObject"] += 1
+        await latency.wait()
+        return Response(status_code=204)
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse({"calls": dict(calls), "received_bytes": received_bytes})
+
+    return Starlette(routes=[
+        Route("/stats", stats, methods=["GET"]),
+        Route("/{bucket}/{key:path}", put_object, methods=["PUT"]),
+        Route("/{bucket}/{key:path}", delete_object, methods=["DELETE"]),
+    ])
+
+
+def build_waha_app(latency: Latency) -> Starlette:
+    calls: Counter = Counter()
+
+    async def send_text(request: Request) -> JSONResponse:
+        payload = await request.json()
+        calls["sendText"] += 1
+        await latency.wait()
+        return JSONResponse(
+            {
+                "id": f"true_{payload.get('chatId', '')}_{uuid.uuid4().hex[:20].upper()}",
+                "timestamp": int(time.time()),
+                "body": payload.get("text", ""),
+            },
+            status_code=201
+        )
+
+    async def reaction(request: Request) -> JSONResponse:
+        await request.json()
+        calls["reaction"] += 1
+        await latency.wait()
+        return JSONResponse({})
+
+    async def stats(request: Request) -> JSONResponse:
+        return JSONResponse({"calls": dict(calls)})
+
+    return Starlette(routes=[
+        Route("/stats", stats, methods=["GET"]),
+        Route("/api/sendText", send_text, methods=["POST"]),
+        Route("/api/reaction", reaction, methods=["PUT"]),
+    ])
+
+
+APPS = {"s3": build_s3_app, "waha": build_waha_app}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=sorted(APPS))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="atraso base de cada resposta")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="variação aleatória somada ao atraso")
+    args = parser.parse_args()
+    app = APPS[args.service](Latency(args.latency_ms, args.jitter_ms))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
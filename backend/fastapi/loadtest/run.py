@@ -0,0 +1,194 @@
+"""
+Executa os cenários de carga contra a API e reporta, por cenário, o throughput e os
+percentis p50/p95/p99 de cada requisição:
+
+- rsvp_wave: convidados abrindo o convite e confirmando presença
+- photo_storm: upload de fotos durante a recepção (S3)
+- gift_shop_rush: lista de presentes e geração do PIX
+- owner_dashboard: noivos acompanhando o painel
+
+Cada usuário virtual repete o cenário sem pausa durante --duration segundos (após --warmup,
+que não entra nas estatísticas). A massa de dados é criada pela API no início da execução:
+
+    cd backend/fastapi
+    python -m loadtest.run --base-url http://localhost:8000 --scenario all --users 50 --duration 60
+    python -m loadtest.run --scenario rsvp_wave --json loadtest/results/atual.json \\
+        --baseline loadtest/results/base.json --max-regression 0.2
+
+Com --baseline, a execução termina com código 1 se o p95 de alguma requisição piorar mais
+que --max-regression em relação à execução salva.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from loadtest.scenarios import API_PREFIX, SCENARIOS, Recorder, ScenarioContext, SeedData, seed
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    # values já ordenados; percentil por posição mais próxima
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    requests = {}
+    for name, values in sorted(recorder.latencies.items()):
+        values = sorted(values)
+        requests[name] = {
+            "count": len(values),
+            "errors": recorder.errors[name],
+            "throughput": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50), 2),
+            "p95_ms": round(percentile(values, 0.95), 2),
+            "p99_ms": round(percentile(values, 0.99), 2),
+            "max_ms": round(values[-1], 2),
+            "statuses": dict(recorder.statuses[name]),
+        }
+    total = sum(item["count"] for item in requests.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "requests_total": total,
+        "throughput": round(total / elapsed, 2),
+        "errors": sum(item["errors"] for item in requests.values()),
+        "requests": requests,
+    }
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, data: SeedData, args: argparse.Namespace) -> Dict[str, Any]:
+    scenario = SCENARIOS[name]
+    recorder = Recorder(enabled=args.warmup <= 0)
+    start = time.perf_counter()
+    measured_from = start + max(args.warmup, 0)
+    deadline = measured_from + args.duration
+
+    async def user(index: int) -> None:
+        ctx = ScenarioContext(
+            client=client,
+            recorder=recorder,
+            seed=data,
+            rng=random.Random(args.random_seed + index),
+            photo_kb=args.photo_kb
+        )
+        while time.perf_counter() < deadline:
+            await scenario(ctx)
+
+    async def end_warmup() -> None:
+        await asyncio.sleep(max(args.warmup, 0))
+        recorder.enabled = True
+
+    warmup = asyncio.create_task(end_warmup())
+    await asyncio.gather(*(user(i) for i in range(args.users)))
+    warmup.cancel()
+    return summarize(recorder, time.perf_counter() - measured_from)
+
+
+def print_summary(name: str, summary: Dict[str, Any]) -> None:
+    print(
+        f"\n== {name}: {summary['requests_total']} requisições em {summary['elapsed_seconds']:.1f} s "
+        f"({summary['throughput']:.1f} req/s), {summary['errors']} erros"
+    )
+    print(f"  {'requisição':<48} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'erros':>7}")
+    for request, item in summary["requests"].items():
+        print(
+            f"  {request:<48} {item['throughput']:8.1f} {item['p50_ms']:7.1f}ms {item['p95_ms']:7.1f}ms "
+            f"{item['p99_ms']:7.1f}ms {item['errors']:7d}"
+        )
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """p95 que pioraram além do limite em relação à baseline (mesmo cenário e requisição)."""
+    regressions = []
+    for scenario, summary in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario, {}).get("requests", {})
+        for request, item in summary["requests"].items():
+            before = previous.get(request, {}).get("p95_ms")
+            if before and item["p95_ms"] > before * (1 + max_regression):
+                regressions.append(
+                    f"{scenario} {request}: p95 {before:.1f} ms -> {item['p95_ms']:.1f} ms "
+                    f"(+{(item['p95_ms'] / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+async def wait_for_api(client: httpx.AsyncClient, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            response = await client.get(f"{API_PREFIX}/openapi.json")
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"API indisponível em {client.base_url} após {timeout:.0f} s")
+        await asyncio.sleep(1)
+
+
+async def main(args: argparse.Namespace) -> int:
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users * 2)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        await wait_for_api(client, args.wait)
+        print(f"Criando a massa de dados ({args.guests} convidados, {args.products} produtos)...")
+        data = await seed(client, guests=args.guests, products=args.products, send_invitations=args.send_invitations)
+
+        results: Dict[str, Any] = {
+            "config": {
+                "base_url": args.base_url,
+                "users": args.users,
+                "duration": args.duration,
+                "guests": args.guests,
+                "products": args.products,
+                "photo_kb": args.photo_kb,
+            },
+            "scenarios": {},
+        }
+        for name in names:
+            summary = await run_scenario(name, client, data, args)
+            results["scenarios"][name] = summary
+            print_summary(name, summary)
+
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"\nResultados salvos em {path}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        if regressions:
+            print(f"\nRegressões de p95 acima de {args.max_regression * 100:.0f}%:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nSem regressões de p95 em relação à baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--users", type=int, default=50, help="usuários virtuais simultâneos")
+    parser.add_argument("--duration", type=float, default=60, help="segundos medidos por cenário")
+    parser.add_argument("--warmup", type=float, default=5, help="segundos iniciais descartados")
+    parser.add_argument("--guests", type=int, default=300)
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--photo-kb", type=int, default=256, help="tamanho das fotos enviadas")
+    parser.add_argument("--send-invitations", action="store_true", help="dispara os convites pelo WAHA na preparação")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--wait", type=float, default=60, help="espera máxima pela API no início")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--json", help="arquivo para salvar os resultados")
+    parser.add_argument("--baseline", help="resultados anteriores (--json) para comparar o p95")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,207 @@
+"""
+Massa de dados e cenários dos testes de carga.
+
+Cada cenário é uma função assíncrona que executa uma iteração (o que um usuário faz em uma
+visita) e registra cada requisição com o nome da rota, para os percentis por requisição.
+"""
+import asyncio
+import os
+import random
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+API_PREFIX = "/api/v1"
+
+
+@dataclass
+class Recorder:
+    """Latências (ms) e status por nome de requisição ("GET /wedding/guest/{hash}")."""
+    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    statuses: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    enabled: bool = True
+
+    def record(self, name: str, elapsed_ms: float, status: Optional[int]) -> None:
+        if not self.enabled:
+            return
+        self.latencies[name].append(elapsed_ms)
+        self.statuses[name][str(status) if status is not None else "falha"] += 1
+        if status is None or status >= 400:
+            self.errors[name] += 1
+
+
+@dataclass
+class SeedData:
+    """Casamento criado para o teste: token do noivo, links dos convidados e produtos da loja."""
+    token: str
+    guest_hashes: List[str]
+    product_ids: List[int]
+
+    @property
+    def auth(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+
+async def timed(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    name: str,
+    method: str,
+    url: str,
+    **kwargs
+) -> Optional[httpx.Response]:
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, f"{API_PREFIX}{url}", **kwargs)
+    except httpx.HTTPError:
+        recorder.record(name, (time.perf_counter() - start) * 1000, None)
+        return None
+    recorder.record(name, (time.perf_counter() - start) * 1000, response.status_code)
+    return response
+
+
+def _check(response: httpx.Response, action: str) -> httpx.Response:
+    if response.status_code >= 400:
+        raise RuntimeError(f"Falha ao {action}: HTTP {response.status_code} {response.text[:300]}")
+    return response
+
+
+async def seed(
+    client: httpx.AsyncClient,
+    guests: int,
+    products: int,
+    send_invitations: bool = False,
+    concurrency: int = 20
+) -> SeedData:
+    """
+    Cria pela própria API um noivo novo (email único por execução), a configuração com PIX,
+    a loja com produtos e os convidados. Com send_invitations, dispara os convites pelo
+    WAHA (falso), exercitando o envio sequencial de mensagens.
+    """
+    email = f"loadtest-{uuid.uuid4().hex[:12]}@example.com"
+    password = "loadtest-" + uuid.uuid4().hex
+    _check(await client.post(f"{API_PREFIX}/auth/register", json={
+        "email": email,
+        "password": password,
+        "full_name": "Noivos Loadtest",
+    }), "registrar o noivo")
+    login = _check(await client.post(
+        f"{API_PREFIX}/auth/login/access-token",
+        data={"username": email, "password": password}
+    ), "autenticar o noivo")
+    data = SeedData(token=login.json()["access_token"], guest_hashes=[], product_ids=[])
+
+    _check(await client.post(f"{API_PREFIX}/configuration/configuration/", headers=data.auth, json={
+        "pix_key": "loadtest@example.com",
+        "pix_city": "SAO PAULO",
+        "spouse_name_1": "Ana",
+        "spouse_name_2": "Bruno",
+    }), "criar a configuração")
+    _check(
+        await client.post(f"{API_PREFIX}/gift-shop/", headers=data.auth, json={"name": "Lista de presentes"}),
+        "criar a loja"
+    )
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create_product(index: int) -> None:
+        async with semaphore:
+            response = _check(await client.post(f"{API_PREFIX}/gift-shop/me/products", headers=data.auth, json={
+                "name": f"Presente {index}",
+                "description": "Presente criado pelo teste de carga",
+                "price": f"{random.randint(50, 2000)}.00",
+            }), "criar um produto")
+            data.product_ids.append(response.json()["id"])
+
+    async def create_guest(index: int) -> None:
+        async with semaphore:
+            response = _check(await client.post(f"{API_PREFIX}/guests/", headers=data.auth, json={
+                "name": f"Convidado {index}",
+                "phone": f"+55119{index:08d}",
+            }), "criar um convidado")
+            data.guest_hashes.append(response.json()["hash_link"])
+
+    await asyncio.gather(*(create_product(i) for i in range(products)))
+    await asyncio.gather(*(create_guest(i) for i in range(guests)))
+
+    if send_invitations:
+        _check(await client.post(
+            f"{API_PREFIX}/guests/send_invitation_all_guests_not_confirmed",
+            headers=data.auth,
+            timeout=None
+        ), "enviar os convites")
+    return data
+
+
+# Conteúdo das fotos enviadas no cenário de upload (gerado uma vez por tamanho)
+_photo_cache: Dict[int, bytes] = {}
+
+
+def photo_bytes(size_kb: int) -> bytes:
+    if size_kb not in _photo_cache:
+        # Cabeçalho JPEG seguido de bytes aleatórios: o servidor só repassa o arquivo ao S3
+        _photo_cache[size_kb] = b"\xff\xd8\xff\xe0" + os.urandom(size_kb * 1024)
+    return _photo_cache[size_kb]
+
+
+@dataclass
+class ScenarioContext:
+    client: httpx.AsyncClient
+    recorder: Recorder
+    seed: SeedData
+    rng: random.Random
+    photo_kb: int = 256
+
+
+async def rsvp_wave(ctx: ScenarioContext) -> None:
+    """Convidado abre o link do convite (página completa) e confirma presença."""
+    guest_hash = ctx.rng.choice(ctx.seed.guest_hashes)
+    await timed(ctx.client, ctx.recorder, "GET /wedding/guest/{hash}", "GET", f"/wedding/guest/{guest_hash}")
+    await timed(ctx.client, ctx.recorder, "POST /guests/confirm/{hash}", "POST", f"/guests/confirm/{guest_hash}")
+
+
+async def photo_storm(ctx: ScenarioContext) -> None:
+    """Durante a recepção, convidados enviam fotos e abrem o próprio álbum."""
+    guest_hash = ctx.rng.choice(ctx.seed.guest_hashes)
+    await timed(
+        ctx.client, ctx.recorder, "POST /photos/guests/{hash}/photos/", "POST",
+        f"/photos/guests/{guest_hash}/photos/",
+        files={"file": (f"foto-{uuid.uuid4().hex[:8]}.jpg", photo_bytes(ctx.photo_kb), "image/jpeg")}
+    )
+    await timed(
+        ctx.client, ctx.recorder, "GET /photos/guests/{hash}/albums/", "GET",
+        f"/photos/guests/{guest_hash}/albums/"
+    )
+
+
+async def gift_shop_rush(ctx: ScenarioContext) -> None:
+    """Convidados abrem a lista de presentes e geram o PIX de um presente."""
+    guest_hash = ctx.rng.choice(ctx.seed.guest_hashes)
+    await timed(ctx.client, ctx.recorder, "GET /gift-shop/guest/{hash}", "GET", f"/gift-shop/guest/{guest_hash}")
+    product_id = ctx.rng.choice(ctx.seed.product_ids)
+    await timed(
+        ctx.client, ctx.recorder, "GET /gift-shop/purchase/{product}/guest/{hash}", "GET",
+        f"/gift-shop/purchase/{product_id}/guest/{guest_hash}"
+    )
+
+
+async def owner_dashboard(ctx: ScenarioContext) -> None:
+    """Noivos acompanhando as confirmações no painel."""
+    auth = ctx.seed.auth
+    await timed(ctx.client, ctx.recorder, "GET /dashboard/", "GET", "/dashboard/", headers=auth)
+    await timed(ctx.client, ctx.recorder, "GET /guests/me", "GET", "/guests/me", headers=auth)
+    await timed(ctx.client, ctx.recorder, "GET /guests/statistics/me", "GET", "/guests/statistics/me", headers=auth)
+    await timed(ctx.client, ctx.recorder, "GET /gift-shop/me", "GET", "/gift-shop/me", headers=auth)
+
+
+SCENARIOS: Dict[str, Callable[[ScenarioContext], Awaitable[None]]] = {
+    "rsvp_wave": rsvp_wave,
+    "photo_storm": photo_storm,
+    "gift_shop_rush": gift_shop_rush,
+    "owner_dashboard": owner_dashboard,
+}
@@ -52,34 +52,64 @@
 # # Inclui as rotas da API
 # app.include_router(api_router, prefix=settings.API_V1_STR) 
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.responses import FastJSONResponse
 from app.middleware.error_handler import ErrorHandlerMiddleware, register_error_handlers
+from app.middleware.query_instrumentation import QueryInstrumentationMiddleware
+from app.middleware.compression import CompressionMiddleware, compressed_body_cache
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.tracing import TracingMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.core.profiling import profiling_available
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import CacheCollector, EventLoopCollector, PoolCollector, metrics_enabled, metrics_endpoint, register_collector
+from app.core.resource_cache import resource_cache
+from app.core.tracing import setup_tracing, shutdown_tracing
 from app.db.init_db import init_db
-from app.db.session import async_session_maker
+from app.db.session import async_session_maker, engine, read_engine
+from app.auth.user_cache import user_cache
+from app.crud.guest import guest_ref_cache
+from app.auth.auth import shutdown_password_pool
+from app.core.redis import close_redis
+from app.auth.revocation import revoked_tokens, run_revocation_sync
+from app.services.snapshot import wedding_snapshots
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     Gerenciador de contexto do ciclo de vida da aplicação
     """
+    revocation_sync = None
     try:
         # Código executado na inicialização
         async with async_session_maker() as session:
             await init_db(session)
+            await revoked_tokens.sync(session)
+        revocation_sync = asyncio.create_task(run_revocation_sync(async_session_maker))
+        if settings.LOOP_MONITOR_ENABLED:
+            loop_monitor.start()
         yield
     finally:
-        # Código executado no encerramento (se necessário)
-        pass
+        # Código executado no encerramento
+        if revocation_sync:
+            revocation_sync.cancel()
+        await loop_monitor.stop()
+        await wedding_snapshots.flush()
+        shutdown_password_pool()
+        await close_redis()
+        shutdown_tracing()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -92,11 +122,47 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count", "Server-Timing", "X-Trace-Id", "X-Profiled-Status"],
     )
 
 # Adiciona o middleware de tratamento de erros
 app.add_middleware(ErrorHandlerMiddleware)
 
+# Contagem de consultas por requisição (Server-Timing)
+if settings.QUERY_INSTRUMENTATION_ENABLED:
+    app.add_middleware(QueryInstrumentationMiddleware)
+
+# Profiling de uma requisição com o header X-Profile (apenas superusuários)
+if profiling_available():
+    app.add_middleware(ProfilingMiddleware)
+
+# Compressão gzip/brotli; adicionado por último para ser o mais externo e comprimir também os erros
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Tracing OpenTelemetry: span raiz por requisição e trace ID no header X-Trace-Id
+setup_tracing()
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Métricas Prometheus por rota; o mais externo, para medir o tempo total e o tamanho já comprimido
+if metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    register_collector(PoolCollector(engine.pool, "primary"))
+    if read_engine is not None:
+        register_collector(PoolCollector(read_engine.pool, "replica"))
+    register_collector(CacheCollector(
+        {
+            "users": user_cache.stats,
+            "guest_refs": guest_ref_cache.stats,
+            "compressed_bodies": compressed_body_cache.stats,
+            "wedding_snapshots": wedding_snapshots.rendered.stats,
+        },
+        resource_cache.stats
+    ))
+    register_collector(EventLoopCollector(loop_monitor.stats))
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 # Registra os handlers globais de erro
 register_error_handlers(app)
 
@@ -0,0 +1,81 @@
+"""
+Configuração dos testes.
+
+As variáveis obrigatórias do Settings recebem valores de teste quando não definidas; os
+testes que usam o banco apontam para POSTGRES_* (por padrão o banco casei_test local, já
+migrado com `alembic upgrade head`) e são pulados se ele não estiver acessível. Cada teste
+cria o seu próprio noivo (email único), então o banco pode ser reaproveitado entre execuções.
+"""
+import os
+import uuid
+
+import pytest
+
+_TEST_ENV = {
+    "SECRET_KEY": "test-secret-key",
+    "VERSION": "test",
+    "POSTGRES_SERVER": "localhost",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "",
+    "POSTGRES_DB": "casei_test",
+    "FIRST_SUPERUSER": "admin@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "test-password",
+}
+for _key, _value in _TEST_ENV.items():
+    os.environ.setdefault(_key, _value)
+
+pytest_plugins = ["app.testing.query_budget"]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    from app.db.session import async_session_maker, engine
+
+    try:
+        async with engine.connect():
+            pass
+    except (OSError, ConnectionError) as exc:
+        pytest.skip(f"Banco de testes indisponível: {exc}")
+
+    async with async_session_maker() as session:
+        yield session
+    # Cada teste roda em um event loop novo; as conexões do pool não podem ser reaproveitadas
+    await engine.dispose()
+
+
+@pytest.fixture
+async def owner(db):
+    from app.auth.auth import get_password_hash
+    from app.models.user import User
+
+    user = User(
+        email=f"test-{uuid.uuid4().hex[:12]}@example.com",
+        hashed_password=await get_password_hash("test-password"),
+        full_name="Noivos Teste",
+        is_active=True,
+        is_superuser=False,
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(owner):
+    from app.auth.auth import create_user_access_token
+
+    return {"Authorization": f"Bearer {create_user_access_token(owner)}"}
+
+
+@pytest.fixture
+async def client(db):
+    import httpx
+    from main import app
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as http_client:
+        yield http_client
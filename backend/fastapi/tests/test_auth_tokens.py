@@ -0,0 +1,90 @@
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.auth import tokens
+from app.auth.auth import create_access_token, create_user_access_token
+
+LOGIN_URL = "/api/v1/auth/login/access-token"
+
+
+@contextmanager
+def issued_earlier():
+    """Tokens emitidos dentro do bloco têm iat de alguns segundos atrás."""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(tokens, "time", SimpleNamespace(time=lambda: time.time() - 5))
+        yield
+
+
+@pytest.mark.anyio
+async def test_password_change_revokes_existing_sessions(client, owner):
+    with issued_earlier():
+        login = await client.post(LOGIN_URL, data={"username": owner.email, "password": "test-password"})
+    assert login.status_code == 200, login.text
+    session = login.json()
+    headers = {"Authorization": f"Bearer {session['access_token']}"}
+
+    response = await client.post(
+        "/api/v1/auth/reset-password-logged-user/",
+        json={"current_password": "test-password", "new_password": "new-password"},
+        headers=headers
+    )
+    assert response.status_code == 200, response.text
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+    refresh = await client.post("/api/v1/auth/refresh-token", json={"refresh_token": session["refresh_token"]})
+    assert refresh.status_code == 401
+
+    # Login logo após a troca continua valendo
+    login = await client.post(LOGIN_URL, data={"username": owner.email, "password": "new-password"})
+    assert login.status_code == 200, login.text
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_profile_password_update_revokes_existing_sessions(client, owner):
+    with issued_earlier():
+        login = await client.post(LOGIN_URL, data={"username": owner.email, "password": "test-password"})
+    assert login.status_code == 200, login.text
+    session = login.json()
+    headers = {"Authorization": f"Bearer {session['access_token']}"}
+
+    response = await client.put("/api/v1/users/me", json={"password": "new-password"}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+    refresh = await client.post("/api/v1/auth/refresh-token", json={"refresh_token": session["refresh_token"]})
+    assert refresh.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_password_reset_token_works_once(client, owner):
+    with issued_earlier():
+        token = create_access_token(data={"sub": owner.email, "typ": "password_reset"})
+
+    first = await client.post("/api/v1/auth/reset-password/", json={"token": token, "new_password": "new-password"})
+    second = await client.post("/api/v1/auth/reset-password/", json={"token": token, "new_password": "other-password"})
+
+    assert first.status_code == 200, first.text
+    assert second.status_code == 401
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("token_type", [None, "email_confirmation", "password_reset"])
+async def test_current_user_requires_access_token(client, owner, token_type):
+    data = {"sub": owner.email}
+    if token_type:
+        data["typ"] = token_type
+    headers = {"Authorization": f"Bearer {create_access_token(data=data)}"}
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.anyio
+async def test_current_user_accepts_session_token(client, owner):
+    headers = {"Authorization": f"Bearer {create_user_access_token(owner)}"}
+
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
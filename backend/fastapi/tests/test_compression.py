@@ -0,0 +1,45 @@
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.middleware.compression import CompressionMiddleware, compressed_body_cache
+
+BODY = b'{"nome": "convidado"}' * 200
+
+
+async def guest_data(request):
+    return Response(content=BODY, media_type="application/json", headers={"Cache-Control": "no-cache"})
+
+
+async def shared_data(request):
+    return Response(content=BODY, media_type="application/json", headers={"Cache-Control": "public, no-cache"})
+
+
+@pytest.fixture
+def client():
+    compressed_body_cache.clear()
+    app = Starlette(routes=[Route("/guest", guest_data), Route("/shared", shared_data)])
+    app.add_middleware(CompressionMiddleware)
+    return httpx.AsyncClient(app=app, base_url="http://test", headers={"Accept-Encoding": "gzip"})
+
+
+@pytest.mark.anyio
+async def test_private_responses_are_not_cached(client):
+    async with client:
+        response = await client.get("/guest")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+    assert len(compressed_body_cache) == 0
+
+
+@pytest.mark.anyio
+async def test_public_responses_are_compressed_once(client):
+    async with client:
+        first = await client.get("/shared")
+        second = await client.get("/shared")
+
+    assert first.content == second.content == BODY
+    assert len(compressed_body_cache) == 1
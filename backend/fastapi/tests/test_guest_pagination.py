@@ -0,0 +1,46 @@
+import uuid
+
+import pytest
+
+from app.models.guest import Guest
+
+# Nomes cujo lower() do Postgres (collation C) difere do str.lower() do Python
+NAMES = ["Álvaro", "alice", "Bruno", "Éva", "zeca", "ÚRSULA", "Ana", "beatriz"]
+
+
+@pytest.fixture
+async def guests(db, owner):
+    items = [
+        Guest(name=name, phone=f"+5511900000{index:03d}", hash_link=uuid.uuid4().hex, user_id=owner.id)
+        for index, name in enumerate(NAMES)
+    ]
+    db.add_all(items)
+    await db.commit()
+    return items
+
+
+@pytest.mark.anyio
+async def test_cursor_pages_cover_every_guest_once(client, auth_headers, guests):
+    seen = []
+    response = await client.get("/api/v1/guests/me", params={"limit": 3}, headers=auth_headers)
+    while True:
+        assert response.status_code == 200, response.text
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        response = await client.get(
+            "/api/v1/guests/me", params={"limit": 3, "cursor": cursor}, headers=auth_headers
+        )
+
+    assert sorted(seen) == sorted(guest.id for guest in guests)
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.anyio
+async def test_limit_above_maximum_is_clamped(client, auth_headers, guests):
+    response = await client.get("/api/v1/guests/me", params={"limit": 10000}, headers=auth_headers)
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == len(NAMES)
+    assert response.headers["X-Total-Count"] == str(len(NAMES))
@@ -0,0 +1,10 @@
+import pytest
+
+from app.crud import guest as guest_crud
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("query", [" ", "   ", "\t\n"])
+async def test_blank_query_returns_no_guests_without_querying(query):
+    # Sem sessão: o termo em branco deve ser resolvido antes de qualquer consulta
+    assert await guest_crud.search_guests(db=None, user_id=1, query=query) == []
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_main_imports_in_fresh_interpreter():
+    # Processo novo: a ordem de importação dos módulos é a mesma da inicialização do uvicorn
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.auth import throttle
+from app.auth.throttle import LoginThrottle, client_ip
+from app.errors.base import RateLimitError
+
+
+def make_throttle(max_failures_per_account=3, free_failures=10):
+    return LoginThrottle(
+        window=900,
+        max_failures_per_account=max_failures_per_account,
+        max_failures_per_ip=100,
+        free_failures=free_failures,
+        delay_base=1.0,
+        max_delay=60,
+    )
+
+
+def make_request(peer="10.0.0.1", forwarded=None):
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded or []]
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.mark.anyio
+async def test_concurrent_attempts_are_counted_before_password_check():
+    limiter = make_throttle(max_failures_per_account=3)
+
+    async def attempt():
+        try:
+            await limiter.check("203.0.113.7", "noivos@example.com")
+            # Simula o bcrypt: as tentativas simultâneas ficam todas em andamento
+            await asyncio.sleep(0.01)
+            return True
+        except RateLimitError:
+            return False
+
+    results = await asyncio.gather(*(attempt() for _ in range(10)))
+
+    assert results.count(True) == 3
+
+
+@pytest.mark.anyio
+async def test_success_clears_the_account_and_releases_the_ip_attempt():
+    limiter = make_throttle(max_failures_per_account=2)
+    await limiter.check("203.0.113.7", "noivos@example.com")
+    attempt = await limiter.check("203.0.113.7", "noivos@example.com")
+
+    await limiter.register_success(attempt)
+
+    # Conta zerada: duas novas tentativas passam; no IP sobra só a primeira (falha)
+    await limiter.check("203.0.113.7", "noivos@example.com")
+    await limiter.check("203.0.113.7", "noivos@example.com")
+    assert len(await limiter.memory_store.reserve("ip:203.0.113.7", 900, 0, "sonda")) == 3
+
+
+@pytest.mark.anyio
+async def test_rejected_attempt_does_not_count():
+    limiter = make_throttle(max_failures_per_account=1)
+    await limiter.check("203.0.113.7", "noivos@example.com")
+
+    with pytest.raises(RateLimitError):
+        await limiter.check("203.0.113.8", "noivos@example.com")
+
+    # A tentativa rejeitada foi desfeita no IP que a fez
+    assert await limiter.memory_store.reserve("ip:203.0.113.8", 900, 0, "sonda") == []
+
+
+def test_client_ip_uses_the_entry_added_by_the_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(throttle.settings, "TRUSTED_PROXY_COUNT", 1)
+
+    # O cliente pode forjar entradas à esquerda; vale a adicionada pelo proxy
+    assert client_ip(make_request(forwarded=["1.2.3.4, 198.51.100.9"])) == "198.51.100.9"
+    assert client_ip(make_request(forwarded=["1.2.3.4", "198.51.100.9"])) == "198.51.100.9"
+    assert client_ip(make_request()) == "10.0.0.1"
+
+
+def test_client_ip_ignores_forwarded_header_without_trusted_proxies(monkeypatch):
+    monkeypatch.setattr(throttle.settings, "TRUSTED_PROXY_COUNT", 0)
+
+    assert client_ip(make_request(forwarded=["198.51.100.9"])) == "10.0.0.1"
+
+
+def test_forwarded_header_is_ignored_by_default():
+    from app.core.config import Settings
+
+    # Sem proxy configurado, um X-Forwarded-For novo a cada tentativa não gera um "IP" novo
+    assert Settings.model_fields["TRUSTED_PROXY_COUNT"].default == 0
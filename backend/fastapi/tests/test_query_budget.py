@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+
+from app.db.instrumentation import (
+    REQUEST_STATS_STATE_KEY,
+    add_request_observer,
+    remove_request_observer,
+    start_query_tracking,
+    stop_query_tracking
+)
+from app.middleware.query_instrumentation import QueryInstrumentationMiddleware
+from app.models.guest import Guest
+
+
+@pytest.fixture
+async def guest(db, owner):
+    item = Guest(name="Convidado Orçamento", phone="+5511912345678", hash_link=uuid.uuid4().hex, user_id=owner.id)
+    db.add(item)
+    await db.commit()
+    return item
+
+
+@pytest.mark.anyio
+async def test_guest_read_stays_within_budget(client, auth_headers, guest, query_budget):
+    path = f"/api/v1/guests/{guest.id}"
+    with query_budget(1, path=path) as requests:
+        response = await client.get(path, headers=auth_headers)
+
+    assert response.status_code == 200, response.text
+    # O middleware notificou a requisição: o orçamento foi de fato conferido
+    assert [label for label, _ in requests] == [f"GET {path}"]
+    assert requests[0][1].count == 1
+
+
+@pytest.mark.anyio
+async def test_budget_failure_lists_the_queries(client, auth_headers, guest, query_budget):
+    # Primeira página: listagem + contagem (X-Total-Count)
+    with pytest.raises(AssertionError, match=r"executou 2 consultas \(orçamento: 1\)"):
+        with query_budget(1, path="/api/v1/guests/me"):
+            await client.get("/api/v1/guests/me", headers=auth_headers)
+
+
+
+async def _run_instrumented(scope):
+    """Executa uma requisição mínima pelo QueryInstrumentationMiddleware e devolve as estatísticas notificadas."""
+    reported = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    def observer(method, path, stats):
+        reported.append(stats)
+
+    add_request_observer(observer)
+    try:
+        await QueryInstrumentationMiddleware(app)(scope, None, send)
+    finally:
+        remove_request_observer(observer)
+    return reported[0]
+
+
+@pytest.mark.anyio
+async def test_request_does_not_reuse_unrelated_stats():
+    outer, token = start_query_tracking()
+    try:
+        stats = await _run_instrumented({"type": "http", "method": "GET", "path": "/"})
+    finally:
+        stop_query_tracking(token)
+
+    # Estatísticas abertas fora da requisição (ex.: um bloco de orçamento) não são reaproveitadas
+    assert stats is not outer
+
+
+@pytest.mark.anyio
+async def test_request_reuses_stats_opened_by_metrics():
+    opened, token = start_query_tracking()
+    try:
+        scope = {"type": "http", "method": "GET", "path": "/", "state": {REQUEST_STATS_STATE_KEY: opened}}
+        stats = await _run_instrumented(scope)
+    finally:
+        stop_query_tracking(token)
+
+    assert stats is opened
@@ -0,0 +1,58 @@
+from typing import Dict
+
+import pytest
+
+from app.core import resource_cache as resource_cache_module
+from app.core.resource_cache import ResourceCache
+
+PRIMARY = object()
+REPLICA = object()
+
+
+@pytest.fixture
+def resource(monkeypatch):
+    monkeypatch.setattr(resource_cache_module, "get_redis", lambda: None)
+    monkeypatch.setattr(resource_cache_module, "is_replica_session", lambda db: db is REPLICA)
+    cache = ResourceCache(ttl_seconds=60, max_size=100)
+    return cache.register("test", Dict[str, int])
+
+
+def loader_returning(value):
+    calls = []
+
+    async def load():
+        calls.append(value)
+        return value
+    return load, calls
+
+
+@pytest.mark.anyio
+async def test_primary_reads_fill_the_cache(resource):
+    load, calls = loader_returning({"version": 1})
+
+    assert await resource.get_or_load(PRIMARY, 1, load) == {"version": 1}
+    assert await resource.get_or_load(PRIMARY, 1, load) == {"version": 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_replica_reads_do_not_fill_the_cache(resource):
+    stale, _ = loader_returning({"version": 1})
+    fresh, _ = loader_returning({"version": 2})
+
+    assert await resource.get_or_load(REPLICA, 1, stale) == {"version": 1}
+    assert await resource.get_or_load(PRIMARY, 1, fresh) == {"version": 2}
+
+
+@pytest.mark.anyio
+async def test_invalidation_during_load_discards_the_result(resource):
+    async def load_racing_with_write():
+        value = {"version": 1}
+        # Escrita commitada e invalidada enquanto a leitura antiga ainda estava em andamento
+        await resource.invalidate(1)
+        return value
+
+    fresh, _ = loader_returning({"version": 2})
+
+    assert await resource.get_or_load(PRIMARY, 1, load_racing_with_write) == {"version": 1}
+    assert await resource.get_or_load(PRIMARY, 1, fresh) == {"version": 2}
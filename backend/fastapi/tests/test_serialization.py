@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.responses import model_response
+from app.schemas.timeline import Timeline
+from app.schemas.wedding import WeddingBundle, WeddingSnapshotContent
+
+TIMELINE = {
+    "id": 1,
+    "user_id": 1,
+    "title": "Nossa história até aqui",
+    "items": [
+        {"id": 1, "timeline_id": 1, "title": "Sem fuso", "text": "a", "date": datetime(2024, 5, 1, 10, 0)},
+        {
+            "id": 2, "timeline_id": 1, "title": "UTC", "text": "b",
+            "date": datetime(2024, 5, 1, 10, 0, 0, 123456, tzinfo=timezone.utc),
+        },
+        {
+            "id": 3, "timeline_id": 1, "title": "Brasília", "text": "c",
+            "date": datetime(2024, 5, 1, 10, 0, tzinfo=timezone(timedelta(hours=-3))),
+        },
+    ],
+}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    # Caminho anterior: response_model=Timeline com a resposta JSON padrão do FastAPI
+    @app.get("/timeline", response_model=Timeline, response_class=JSONResponse)
+    def timeline():
+        return TIMELINE
+
+    @app.get("/wedding")
+    def wedding():
+        return model_response(WeddingBundle, {"timeline": TIMELINE})
+
+    return TestClient(app)
+
+
+def test_timeline_dates_in_wedding_bundle_match_timeline_route(client):
+    # Timeline usa json_encoders (isoformat: "+00:00", não "Z"); o formato não pode mudar no bundle
+    previous = client.get("/timeline").json()
+
+    assert client.get("/wedding").json()["timeline"] == previous
+    assert [item["date"] for item in previous["items"]] == [
+        "2024-05-01T10:00:00",
+        "2024-05-01T10:00:00.123456+00:00",
+        "2024-05-01T10:00:00-03:00",
+    ]
+
+
+def test_timeline_dates_in_snapshot_match_timeline_route(client):
+    content = WeddingSnapshotContent.model_validate({"timeline": TIMELINE})
+
+    assert content.model_dump(mode="json")["timeline"] == client.get("/timeline").json()
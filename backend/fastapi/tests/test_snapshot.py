@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.services.snapshot import RenderedSnapshot, WeddingSnapshotService
+
+
+class RecordingSnapshotService(WeddingSnapshotService):
+    """Rebuild sem banco que registra as chamadas e demora `duration` segundos."""
+    def __init__(self, delay=60.0, duration=0.05):
+        super().__init__(session_maker=None, delay=delay, cache_ttl=60)
+        self.duration = duration
+        self.started = asyncio.Event()
+        self.completed = []
+
+    async def rebuild(self, user_id):
+        self.started.set()
+        await asyncio.sleep(self.duration)
+        self.completed.append(user_id)
+        return RenderedSnapshot(version=len(self.completed), body=b"{}")
+
+
+class EmptyResult:
+    def scalar_one_or_none(self):
+        return None
+
+
+class NoSnapshotSession:
+    async def execute(self, statement):
+        return EmptyResult()
+
+
+@pytest.mark.anyio
+async def test_concurrent_reads_share_one_rebuild():
+    service = RecordingSnapshotService()
+
+    results = await asyncio.gather(*(service.get(NoSnapshotSession(), 7) for _ in range(10)))
+
+    assert service.completed == [7]
+    assert {result.version for result in results} == {1}
+
+
+@pytest.mark.anyio
+async def test_flush_waits_for_rebuild_in_progress():
+    service = RecordingSnapshotService(delay=0)
+    service.schedule_rebuild(7)
+    await service.started.wait()
+
+    await service.flush()
+
+    assert service.completed == [7]
+
+
+@pytest.mark.anyio
+async def test_flush_runs_debounced_rebuilds_immediately():
+    service = RecordingSnapshotService(delay=60)
+    service.schedule_rebuild(7)
+    service.schedule_rebuild(8)
+
+    await asyncio.wait_for(service.flush(), timeout=5)
+
+    assert sorted(service.completed) == [7, 8]
+    assert not service._tasks